@@ -0,0 +1,59 @@
+# benchmarks/bench_chunked.py
+# Бэктест блоками по времени против прогона по всей истории: время и пиковая память (tracemalloc)
+#
+# Запуск: python -m benchmarks.bench_chunked
+
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from core.chunked import run_chunked
+from core.indicator_cache import IndicatorCache
+from strategies.sma import SmaCrossoverStrategy
+
+N_BARS = 200_000
+N_SYMBOLS = 100
+CHUNK_BARS = 20_000
+PARAMS = {"fast_window": 50, "slow_window": 200}
+
+
+def make_data(rng):
+    dates = pd.date_range("2024-01-01", periods=N_BARS, freq="1min", name="open_time")
+    symbols = pd.Index([f"SYM{k}BTC" for k in range(N_SYMBOLS)], name="symbol")
+    close = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 1e-3, (N_BARS, N_SYMBOLS)), axis=0)), index=dates, columns=symbols)
+    return pd.concat({"close": close}, axis=1, names=["field"])
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def in_memory(data):
+    strategy = SmaCrossoverStrategy(data, indicators=IndicatorCache(), engine="native", **PARAMS)
+    strategy.run_backtest()
+    return strategy.portfolio
+
+
+def main():
+    data = make_data(np.random.default_rng(0))
+    # Прогрев numba, чтобы компиляция не попала в замер
+    run_chunked(SmaCrossoverStrategy, data.iloc[:5000], 1000, **PARAMS)
+
+    full, t_full, mem_full = measure(lambda: in_memory(data))
+    chunked, t_chunked, mem_chunked = measure(lambda: run_chunked(SmaCrossoverStrategy, data, CHUNK_BARS, **PARAMS))
+
+    same = np.allclose(full.value(), chunked.value(), rtol=1e-12) and len(full.trades.records_readable) == len(chunked.trades.records_readable)
+    print(f"📦 Данные: {N_BARS} баров × {N_SYMBOLS} символов ({data.memory_usage().sum() / 2**20:.0f} МБ)")
+    print(f"🧠 Вся история: {t_full:.2f} с, пик памяти {mem_full:.0f} МБ")
+    print(f"🧱 Блоки по {CHUNK_BARS}: {t_chunked:.2f} с, пик памяти {mem_chunked:.0f} МБ")
+    print(f"✅ Результаты совпадают: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# benchmarks/bench_engine.py
+# vbt.Portfolio.from_signals против core.simulator: время импорта, симуляции и память результата
+#
+# Запуск: python -m benchmarks.bench_engine
+
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from core.portfolio import PORTFOLIO_KWARGS
+from benchmarks.bench_rsi import make_close, N_BARS, N_SYMBOLS
+
+
+def import_time(module):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    return time.perf_counter() - start
+
+
+def run(simulate, price, entries, exits):
+    """
+    Симуляция + value(), stats() и сделки — всё, чем пользуются main и core.parallel.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    pf = simulate(price, entries, exits, size=0.01, **PORTFOLIO_KWARGS)
+    pf.value(), pf.stats(), pf.trades.records_readable
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, pf
+
+
+def main():
+    import vectorbt as vbt
+    from core.simulator import simulate_from_signals
+
+    price = make_close()
+    rng = np.random.default_rng(0)
+    entries = pd.DataFrame(rng.random(price.shape) < 0.002, index=price.index, columns=price.columns)
+    exits = pd.DataFrame(rng.random(price.shape) < 0.002, index=price.index, columns=price.columns)
+    print(f"📐 Матрица цен: {N_BARS} баров × {N_SYMBOLS} символов")
+
+    print(f"📦 import vectorbt: {import_time('vectorbt'):.2f} с, import core.simulator: {import_time('core.simulator'):.2f} с")
+
+    run(simulate_from_signals, price.iloc[:10], entries.iloc[:10], exits.iloc[:10])  # компиляция ядра
+    t_vbt, mem_vbt, pf = run(vbt.Portfolio.from_signals, price, entries, exits)
+    t_nat, mem_nat, result = run(simulate_from_signals, price, entries, exits)
+    np.testing.assert_allclose(result.value(), pf.value(), rtol=1e-9)
+
+    print(f"🐢 vectorbt: {t_vbt:.2f} с, пик памяти {mem_vbt / 2 ** 20:.0f} МБ")
+    print(f"🚀 native:   {t_nat:.2f} с, пик памяти {mem_nat / 2 ** 20:.0f} МБ")
+    print(f"⚡ Ускорение: x{t_vbt / t_nat:.1f}")
+
+
+if __name__ == "__main__":
+    main()
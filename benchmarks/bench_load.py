@@ -0,0 +1,91 @@
+# benchmarks/bench_load.py
+# Полное чтение хранилища против чтения 5 символов за неделю с фильтрами pyarrow
+#
+# Запуск: python -m benchmarks.bench_load
+
+import os
+import tempfile
+import time
+import zipfile
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+from core.data_loader_bd_vision import KLINE_COLUMNS, archive_name, write_symbol_month
+from main import load_data
+
+N_SYMBOLS = 100
+MONTH = "2025-02"
+
+
+def make_store(directory, n_symbols=N_SYMBOLS, month=MONTH, seed=0):
+    """
+    Хранилище через тот же путь, что и загрузчик: zip-архив Binance на символ и write_symbol_month.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(month, periods=28 * 1440, freq="1min")
+    open_ms = dates.to_numpy(dtype="datetime64[ms]").astype("int64")
+    with tempfile.TemporaryDirectory() as archive_dir:
+        for i in range(n_symbols):
+            close = np.exp(np.cumsum(rng.normal(0, 1e-3, len(dates))))
+            klines = pd.DataFrame(0, index=range(len(dates)), columns=KLINE_COLUMNS)
+            for column in ("open", "high", "low", "close"):
+                klines[column] = close
+            klines["volume"] = rng.exponential(1000, len(dates))
+            klines["open_time"] = open_ms
+            klines["close_time"] = open_ms + 59_999
+
+            symbol = f"SYM{i}BTC"
+            name = archive_name(symbol, "1m", month)
+            zip_path = os.path.join(archive_dir, name)
+            with zipfile.ZipFile(zip_path, "w") as zf:
+                zf.writestr(name.replace(".zip", ".csv"), klines.to_csv(header=False, index=False))
+            write_symbol_month([zip_path], symbol, "1m", month, directory)
+
+
+def touched_bytes(directory, symbols=None, start=None, end=None):
+    """
+    Сколько байт row group pyarrow откроет при заданном фильтре.
+    """
+    dataset = ds.dataset(directory, format="parquet", partitioning="hive")
+    partitions = ds.field("interval") == "1m"
+    if symbols is not None:
+        partitions &= ds.field("symbol").isin(symbols)
+
+    # Фильтр по времени проверяется по статистике row group внутри файла
+    rows = ds.scalar(True)
+    if start is not None:
+        rows &= ds.field("open_time") >= pd.Timestamp(start)
+    if end is not None:
+        rows &= ds.field("open_time") < pd.Timestamp(end)
+
+    total = 0
+    for fragment in dataset.get_fragments(filter=partitions):
+        for row_group in fragment.split_by_row_group(filter=rows):
+            total += sum(rg.total_byte_size for rg in row_group.row_groups)
+    return total
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        make_store(directory)
+        symbols = [f"SYM{i}BTC" for i in range(5)]
+        week = dict(start="2025-02-10", end="2025-02-17")
+
+        start = time.perf_counter()
+        full = load_data(directory)
+        t_full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        part = load_data(directory, symbols=symbols, columns=["close", "volume"], **week)
+        t_part = time.perf_counter() - start
+
+        full_bytes = touched_bytes(directory)
+        part_bytes = touched_bytes(directory, symbols, **week)
+
+        print(f"📦 Всё хранилище: {len(full)} строк за {t_full:.3f} с, {full_bytes / 1e6:.1f} МБ row group")
+        print(f"🎯 5 символов × неделя: {len(part)} строк за {t_part:.3f} с, {part_bytes / 1e6:.2f} МБ row group")
+        print(f"⚡ Прочитано {part_bytes / full_bytes:.2%} байт, ускорение x{t_full / t_part:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_report.py
+# Время сборки отчёта: с нуля, повторно без изменений и после изменения одной стратегии
+#
+# Запуск: python -m benchmarks.bench_report
+# Без kaleido экспорт PNG падает сразу и не попадает в замер — цифры будут занижены для холодной сборки.
+
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from core.metrics import PLOTLYJS_NAME, build_report
+
+STRATEGIES = ["sma", "rsi", "vwap"]
+N_BARS = 200_000
+
+
+def write_results(results_dir, rng):
+    os.makedirs(os.path.join(results_dir, "cash"), exist_ok=True)
+    index = pd.date_range("2025-02-01", periods=N_BARS, freq="1min")
+    for strat in STRATEGIES:
+        pd.Series({"Total Return [%]": rng.normal(), "Win Rate [%]": 50.0, "Max Drawdown [%]": 3.0}).to_csv(
+            os.path.join(results_dir, f"{strat}_stats.csv")
+        )
+        write_cash(results_dir, strat, index, rng)
+
+
+def write_cash(results_dir, strat, index, rng):
+    value = 10_000 * np.exp(np.cumsum(rng.normal(0, 1e-4, len(index))))
+    pd.Series(value, index=index, name="group").to_csv(os.path.join(results_dir, "cash", f"{strat}_cash.csv"))
+
+
+def timed(**kwargs):
+    start = time.perf_counter()
+    build_report(STRATEGIES, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    rng = np.random.default_rng(0)
+    results_dir = tempfile.mkdtemp(prefix="bench_report_")
+    try:
+        write_results(results_dir, rng)
+        cold = timed(results_dir=results_dir)
+        warm = timed(results_dir=results_dir)
+        write_cash(results_dir, "rsi", pd.date_range("2025-02-01", periods=N_BARS, freq="1min"), rng)
+        one = timed(results_dir=results_dir)
+        parallel = timed(results_dir=results_dir, workers=os.cpu_count(), force=True)
+
+        print(f"🧊 С нуля: {cold:.2f} с")
+        print(f"♻️ Без изменений: {warm:.2f} с")
+        print(f"✏️ Изменилась одна стратегия: {one:.2f} с ({one / cold:.0%} от полной сборки)")
+        print(f"⚡ С нуля в {os.cpu_count()} процессах: {parallel:.2f} с")
+        print(f"📄 report.html: {os.path.getsize(os.path.join(results_dir, 'report.html')) / 2**20:.2f} МБ"
+              f" (+ {PLOTLYJS_NAME} {os.path.getsize(os.path.join(results_dir, PLOTLYJS_NAME)) / 2**20:.2f} МБ)")
+    finally:
+        shutil.rmtree(results_dir)
+
+
+if __name__ == "__main__":
+    main()
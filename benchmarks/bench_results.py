@@ -0,0 +1,56 @@
+# benchmarks/bench_results.py
+# Запись и чтение результатов бэктеста: CSV против Parquet (core.results_store)
+#
+# Запуск: python -m benchmarks.bench_results
+
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from core.results_store import read_trades, read_value, write_trades, write_value
+
+N_BARS = 500_000
+N_TRADES = 20_000
+
+
+def make_results(rng):
+    index = pd.date_range("2025-02-01", periods=N_BARS, freq="1min")
+    value = pd.Series(10_000 * np.exp(np.cumsum(rng.normal(0, 1e-4, N_BARS))), index=index, name="group")
+    entry = np.sort(rng.integers(0, N_BARS - 100, N_TRADES))
+    symbols = np.array([f"SYM{k}BTC" for k in range(300)])
+    trades = pd.DataFrame({
+        "Exit Trade Id": np.arange(N_TRADES),
+        "Column": symbols[rng.integers(0, len(symbols), N_TRADES)],
+        "Size": rng.random(N_TRADES),
+        "Entry Timestamp": index[entry],
+        "Avg Entry Price": rng.random(N_TRADES),
+        "Exit Timestamp": index[entry + 50],
+        "Avg Exit Price": rng.random(N_TRADES),
+        "PnL": rng.normal(size=N_TRADES),
+        "Return": rng.normal(size=N_TRADES),
+        "Direction": "Long",
+        "Status": "Closed",
+    })
+    return value, trades
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    value, trades = make_results(np.random.default_rng(0))
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ("csv", "parquet"):
+            t_write_value, [value_path] = timed(write_value, value, "bench", tmp, formats=(fmt,))
+            t_write_trades, [trades_path] = timed(write_trades, trades, "bench", tmp, formats=(fmt,))
+            t_read_value, _ = timed(read_value, value_path)
+            t_read_trades, _ = timed(read_trades, trades_path)
+            print(f"💾 {fmt:8s} запись {t_write_value + t_write_trades:.2f} с, чтение {t_read_value + t_read_trades:.2f} с "
+                  f"({N_BARS} баров стоимости, {N_TRADES} сделок)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_robustness.py
+# Бутстреп 20k сделок: пачки выборок NumPy + ядро numba против цикла по итерациям на NumPy
+#
+# Запуск: python -m benchmarks.bench_robustness
+
+import os
+import time
+import numpy as np
+from core.robustness import N_ITER, resample
+
+N_TRADES = 20_000
+INIT_CASH = 10_000
+# Цикл по итерациям меряем на части итераций и пересчитываем на все
+N_LOOPED = 200
+
+
+def looped(pnl, n, seed=0):
+    """
+    Наивный вариант: одна траектория за итерацию, кривая капитала и пики — массивами NumPy.
+    """
+    rng = np.random.default_rng(seed)
+    out = np.empty((n, 2))
+    for i in range(n):
+        equity = INIT_CASH + np.cumsum(pnl[rng.integers(0, len(pnl), len(pnl))])
+        peak = np.maximum(np.maximum.accumulate(equity), INIT_CASH)
+        out[i] = (equity[-1] / INIT_CASH - 1) * 100, np.max(1 - equity / peak) * 100
+    return out
+
+
+def main():
+    pnl = np.random.default_rng(0).normal(0.1, 5, N_TRADES)
+
+    start = time.perf_counter()
+    looped(pnl, N_LOOPED)
+    loop_time = (time.perf_counter() - start) * N_ITER / N_LOOPED
+
+    print(f"🎲 {N_ITER} итераций × {N_TRADES} сделок")
+    print(f"🐢 цикл по итерациям (оценка): {loop_time:.1f} с")
+    for method in ("trades", "shuffle"):
+        start = time.perf_counter()
+        resample(method, pnl, N_ITER, INIT_CASH)
+        print(f"⚡ пачки NumPy + numba, {method}: {time.perf_counter() - start:.1f} с")
+
+    workers = os.cpu_count() or 1
+    if workers > 1:
+        start = time.perf_counter()
+        resample("trades", pnl, N_ITER, INIT_CASH, workers=workers)
+        print(f"🧵 пачки NumPy + numba, trades, {workers} процессов: {time.perf_counter() - start:.1f} с")
+
+
+if __name__ == "__main__":
+    main()
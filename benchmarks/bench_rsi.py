@@ -0,0 +1,67 @@
+# benchmarks/bench_rsi.py
+# Сравнение поколоночного расчёта RSI + BB через ta с векторизованным (core.indicators)
+#
+# Запуск: python -m benchmarks.bench_rsi
+
+import time
+import numpy as np
+import pandas as pd
+from ta.momentum import RSIIndicator
+from ta.volatility import BollingerBands
+from core.indicators import rsi, bollinger_bands
+
+N_BARS = 40_000
+N_SYMBOLS = 100
+
+
+def make_close(n_bars=N_BARS, n_symbols=N_SYMBOLS, seed=42):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2025-02-01", periods=n_bars, freq="1min", name="open_time")
+    columns = pd.Index([f"SYM{i}BTC" for i in range(n_symbols)], name="symbol")
+    returns = rng.normal(0, 1e-3, size=(n_bars, n_symbols))
+    return pd.DataFrame(np.exp(np.cumsum(returns, axis=0)), index=index, columns=columns)
+
+
+def per_symbol(close, rsi_period=14, bb_period=20, bb_std=2):
+    entries = pd.DataFrame(False, index=close.index, columns=close.columns)
+    exits = pd.DataFrame(False, index=close.index, columns=close.columns)
+    for symbol in close.columns:
+        rsi_values = RSIIndicator(close=close[symbol], window=rsi_period).rsi()
+        bb = BollingerBands(close=close[symbol], window=bb_period, window_dev=bb_std)
+        entries[symbol] = (rsi_values < 30) & (close[symbol] < bb.bollinger_lband())
+        exits[symbol] = (rsi_values > 70) & (close[symbol] > bb.bollinger_hband())
+    return entries, exits
+
+
+def vectorized(close, rsi_period=14, bb_period=20, bb_std=2):
+    rsi_values = rsi(close, window=rsi_period)
+    _, hband, lband = bollinger_bands(close, window=bb_period, window_dev=bb_std)
+    return (rsi_values < 30) & (close < lband), (rsi_values > 70) & (close > hband)
+
+
+def timeit(func, *args, repeat=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    close = make_close()
+    print(f"📐 Матрица цен: {close.shape[0]} баров × {close.shape[1]} символов")
+
+    t_loop, (entries_loop, exits_loop) = timeit(per_symbol, close)
+    t_vec, (entries_vec, exits_vec) = timeit(vectorized, close)
+
+    assert entries_loop.equals(entries_vec) and exits_loop.equals(exits_vec), "Сигналы не совпадают!"
+
+    print(f"🐢 ta по символам:   {t_loop:.3f} с")
+    print(f"🚀 векторизованно:   {t_vec:.3f} с")
+    print(f"⚡ Ускорение: x{t_loop / t_vec:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# benchmarks/bench_schema.py
+# Память свечей в схеме по умолчанию pandas против компактной схемы хранения
+#
+# Запуск: python -m benchmarks.bench_schema
+
+import numpy as np
+import pandas as pd
+from core.data_loader_bd_vision import apply_schema, memory_report
+
+N_BARS = 40_000
+N_SYMBOLS = 100
+
+
+def make_raw(n_bars=N_BARS, n_symbols=N_SYMBOLS, seed=0):
+    """
+    Свечи в том виде, в котором их давал разбор CSV до компактной схемы.
+    """
+    rng = np.random.default_rng(seed)
+    open_time = pd.date_range("2025-02-01", periods=n_bars, freq="1min")
+    frames = []
+    for i in range(n_symbols):
+        close = np.exp(np.cumsum(rng.normal(0, 1e-3, n_bars))) * 1e-5
+        volume = rng.exponential(1000, n_bars)
+        frames.append(pd.DataFrame({
+            "open_time": open_time, "open": close, "high": close, "low": close, "close": close,
+            "volume": volume, "close_time": open_time + pd.Timedelta(seconds=59.999),
+            "quote_asset_volume": volume * close, "number_of_trades": rng.integers(0, 500, n_bars),
+            "taker_buy_base_asset_volume": volume / 2, "taker_buy_quote_asset_volume": volume * close / 2,
+            "symbol": f"SYM{i}BTC"
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    raw = make_raw()
+    compact = apply_schema(raw)
+    report = memory_report(raw, compact)
+    print(f"📐 {len(raw)} строк ({N_SYMBOLS} пар × {N_BARS} баров)")
+    print(report.round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_startup.py
+# Время старта CLI: --help, первая строка вывода и импорт модулей каждой подкоманды
+#
+# Запуск: python -m benchmarks.bench_startup
+
+import subprocess
+import sys
+import time
+
+# Подкоманда -> (аргументы для замера первой строки, модуль, который она импортирует)
+COMMANDS = {
+    "download": (["--symbols", "NOPEBTC"], "core.data_loader_bd_vision"),
+    "backtest": (["--workers", "1"], "main"),
+    "sweep": ([], "main"),
+    "report": (["--results-dir", "results/_bench_startup"], "core.metrics"),
+}
+
+
+def run_time(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def first_output_time(args):
+    """
+    Время от запуска процесса до первой строки в stdout; процесс затем останавливается.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, *args], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    process.stdout.readline()
+    elapsed = time.perf_counter() - start
+    process.kill()
+    process.wait()
+    return elapsed
+
+
+def main():
+    print(f"🐍 Пустой интерпретатор: {run_time(['-c', 'pass']):.2f} с")
+    print(f"📦 import vectorbt: {run_time(['-c', 'import vectorbt']):.2f} с (раньше платили при любом запуске)")
+
+    for command, (args, module) in COMMANDS.items():
+        t_help = run_time(["cli.py", command, "--help"])
+        t_first = first_output_time(["cli.py", command, *args])
+        t_import = run_time(["-c", f"import {module}"])
+        print(f"⏱️ {command:8s} --help {t_help:.2f} с, первая строка {t_first:.2f} с, import {module} {t_import:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# benchmarks/bench_stops.py
+# Стопы (TP / SL / трейлинг): старый цикл по .iloc против ядра numba по всей матрице
+#
+# Запуск: python -m benchmarks.bench_stops
+
+import numpy as np
+import pandas as pd
+from core.stops import apply_stops
+from benchmarks.bench_rsi import make_close, timeit, N_BARS, N_SYMBOLS
+
+TP_PCT = 0.05
+SL_PCT = 0.02
+TRAILING_PCT = 0.03
+
+
+def iloc_loop(close, entries, exits):
+    """
+    Цикл из старой SmaCrossoverStrategy (по одной колонке, доступ через .iloc).
+    """
+    exits = exits.copy()
+    in_position = False
+    entry_price = 0
+    trailing_stop = 0
+    for i in range(1, len(close)):
+        if entries.iloc[i]:
+            in_position = True
+            entry_price = close.iloc[i]
+            trailing_stop = entry_price * (1 - TRAILING_PCT)
+            continue
+        if in_position:
+            price = close.iloc[i]
+            trailing_stop = max(trailing_stop, price * (1 - TRAILING_PCT))
+            if price >= entry_price * (1 + TP_PCT) or price <= entry_price * (1 - SL_PCT) or price <= trailing_stop:
+                exits.iloc[i] = True
+                in_position = False
+    return exits
+
+
+def main():
+    close = make_close()
+    rng = np.random.default_rng(0)
+    entries = pd.DataFrame(rng.random(close.shape) < 0.001, index=close.index, columns=close.columns)
+    exits = pd.DataFrame(False, index=close.index, columns=close.columns)
+    print(f"📐 Матрица цен: {N_BARS} баров × {N_SYMBOLS} символов")
+
+    # Первый вызов компилирует ядро (или берёт его из кеша numba)
+    t_compile, _ = timeit(apply_stops, close, entries, exits, TP_PCT, SL_PCT, TRAILING_PCT)
+
+    symbol = close.columns[0]
+    t_loop, _ = timeit(iloc_loop, close[symbol], entries[symbol], exits[symbol])
+    t_numba, result = timeit(apply_stops, close, entries, exits, TP_PCT, SL_PCT, TRAILING_PCT)
+
+    print(f"🐢 цикл .iloc: {t_loop:.3f} с на символ, ~{t_loop * N_SYMBOLS:.1f} с на все")
+    print(f"🚀 numba: {t_numba:.4f} с на все символы (первый вызов {t_compile:.2f} с)")
+    print(f"⚡ Ускорение: x{t_loop * N_SYMBOLS / t_numba:.0f}, выходов по стопам: {int(result.sum().sum())}")
+
+
+if __name__ == "__main__":
+    main()
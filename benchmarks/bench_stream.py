@@ -0,0 +1,50 @@
+# benchmarks/bench_stream.py
+# Цена одного нового бара: инкрементальный step() против пересчёта generate_signals по истории
+#
+# Запуск: python -m benchmarks.bench_stream
+
+import time
+import numpy as np
+import pandas as pd
+from core.indicator_cache import IndicatorCache
+from core.streaming import replay_signals
+from strategies import STRATEGIES
+from benchmarks.bench_rsi import make_close
+from benchmarks.bench_vwap import make_volume
+
+N_BARS = 5_000
+N_SYMBOLS = 100
+HISTORY = 1_440
+
+
+def main():
+    close = make_close(N_BARS, N_SYMBOLS)
+    volume = make_volume(N_BARS, N_SYMBOLS)
+    df = pd.concat({"close": close, "volume": volume}, axis=1, names=["field"])
+    print(f"📐 {N_BARS} баров × {N_SYMBOLS} символов")
+
+    for strategy_class in STRATEGIES:
+        strategy = strategy_class(df, indicators=IndicatorCache())
+
+        start = time.perf_counter()
+        stream_entries, stream_exits = replay_signals(strategy, df)
+        t_stream = (time.perf_counter() - start) / N_BARS
+
+        entries, exits = strategy.generate_signals()
+        assert stream_entries.equals(entries.fillna(False).astype(bool))
+        assert stream_exits.equals(exits.fillna(False).astype(bool))
+
+        # Без инкрементального режима на каждый бар пришлось бы пересчитывать сутки истории
+        window = df.iloc[-HISTORY:]
+        start = time.perf_counter()
+        for _ in range(10):
+            strategy_class(window, indicators=IndicatorCache()).generate_signals()
+        t_batch = (time.perf_counter() - start) / 10
+
+        print(f"⏱️ {strategy_class.name}: step {t_stream * 1e6:.0f} мкс/бар "
+              f"({t_stream * 1e6 / N_SYMBOLS:.2f} мкс на символ), пересчёт {t_batch * 1e3:.1f} мс/бар, "
+              f"x{t_batch / t_stream:.0f}")
+
+
+if __name__ == "__main__":
+    main()
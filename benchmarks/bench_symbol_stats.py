@@ -0,0 +1,47 @@
+# benchmarks/bench_symbol_stats.py
+# Метрики по символам: один проход core.symbol_stats против pf.stats(column=...) на каждую пару
+#
+# Запуск: python -m benchmarks.bench_symbol_stats
+
+import time
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from core.portfolio import PORTFOLIO_KWARGS
+from core.symbol_stats import symbol_stats
+
+N_BARS = 100_000
+N_SYMBOLS = 100
+# pf.stats(column=...) меряем на нескольких парах и пересчитываем на все
+N_SAMPLED = 3
+
+
+def make_portfolio(rng):
+    dates = pd.date_range("2025-02-01", periods=N_BARS, freq="1min")
+    symbols = [f"SYM{k}BTC" for k in range(N_SYMBOLS)]
+    close = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 1e-3, (N_BARS, N_SYMBOLS)), axis=0)), index=dates, columns=symbols)
+    entries = pd.DataFrame(rng.random(close.shape) < 0.002, index=dates, columns=symbols)
+    exits = pd.DataFrame(rng.random(close.shape) < 0.002, index=dates, columns=symbols)
+    return close, vbt.Portfolio.from_signals(close, entries, exits, size=0.01, **PORTFOLIO_KWARGS)
+
+
+def main():
+    close, pf = make_portfolio(np.random.default_rng(0))
+    trades = pf.trades.records_readable
+
+    start = time.perf_counter()
+    table = symbol_stats(close, trades)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for symbol in close.columns[:N_SAMPLED]:
+        pf.stats(column=symbol, group_by=False)
+    per_column = (time.perf_counter() - start) / N_SAMPLED
+
+    print(f"⚡ symbol_stats: {vectorized:.2f} с на {N_SYMBOLS} пар ({len(trades)} сделок, {N_BARS} баров)")
+    print(f"🐢 pf.stats(column=...): {per_column:.2f} с на пару, ~{per_column * N_SYMBOLS:.1f} с на все")
+    print(table.sort_values("Total Return [%]", ascending=False).head(5).round(2))
+
+
+if __name__ == "__main__":
+    main()
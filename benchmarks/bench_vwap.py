@@ -0,0 +1,47 @@
+# benchmarks/bench_vwap.py
+# Сравнение поколоночного VWAP (groupby по каждому символу) с матричным (core.indicators.vwap)
+#
+# Запуск: python -m benchmarks.bench_vwap
+
+import numpy as np
+import pandas as pd
+from core.indicators import vwap
+from benchmarks.bench_rsi import make_close, timeit, N_BARS, N_SYMBOLS
+
+
+def make_volume(n_bars=N_BARS, n_symbols=N_SYMBOLS, seed=7):
+    rng = np.random.default_rng(seed)
+    close = make_close(n_bars, n_symbols)
+    return pd.DataFrame(rng.exponential(1000, size=close.shape), index=close.index, columns=close.columns)
+
+
+def per_symbol(close, volume):
+    result = pd.DataFrame(np.nan, index=close.index, columns=close.columns)
+    for symbol in close.columns:
+        day_index = close[symbol].index.normalize()
+        cum_vol_price = (close[symbol] * volume[symbol]).groupby(day_index).cumsum()
+        cum_vol = volume[symbol].groupby(day_index).cumsum()
+        result[symbol] = cum_vol_price / cum_vol
+    return result
+
+
+def main():
+    close = make_close()
+    volume = make_volume()
+    print(f"📐 Матрица цен: {close.shape[0]} баров × {close.shape[1]} символов")
+
+    t_loop, expected = timeit(per_symbol, close, volume)
+    t_vec, result = timeit(vwap, close, volume)
+    np.testing.assert_allclose(result, expected)
+
+    print(f"🐢 groupby по символам: {t_loop:.3f} с")
+    print(f"🚀 матричный VWAP:      {t_vec:.3f} с")
+    print(f"⚡ Ускорение: x{t_loop / t_vec:.1f}")
+
+    for anchor in ("08:00", 60):
+        t_anchor, _ = timeit(vwap, close, volume, anchor)
+        print(f"🕗 anchor={anchor!r}: {t_anchor:.3f} с")
+
+
+if __name__ == "__main__":
+    main()
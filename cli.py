@@ -0,0 +1,129 @@
+# cli.py
+# Точка входа с подкомандами: download, backtest, sweep, walkforward, robustness, report
+#
+# Тяжёлые модули (pandas, vectorbt, plotly, numba) импортируются внутри подкоманд,
+# поэтому --help и ошибки аргументов отвечают сразу.
+#
+# Запуск: python cli.py backtest --workers 1 --engine native
+
+import argparse
+import sys
+
+
+def cmd_download(args):
+    print(f"⬇️ Загрузка свечей {', '.join(args.intervals)} с {args.start}...", flush=True)
+    from core.data_loader_bd_vision import download_btc_data, setup_logging
+
+    setup_logging()
+    download_btc_data(start=args.start, end=args.end, intervals=tuple(args.intervals), symbols=args.symbols,
+                      store_dir=args.store_dir, base_url=args.base_url)
+
+
+def cmd_backtest(args):
+    print(f"🚀 Бэктест (движок {args.engine})...", flush=True)
+    from main import main
+
+    formats = ("parquet", "csv") if args.csv else ("parquet",)
+    main(workers=args.workers or None, symbol_chunks=args.symbol_chunks, engine=args.engine, formats=formats,
+         chunk_bars=args.chunk_bars, cache=not args.no_cache)
+
+
+def cmd_sweep(args):
+    print("🔁 Перебор параметров...", flush=True)
+    from main import load_wide_data, run_sweeps
+
+    run_sweeps(load_wide_data())
+
+
+def cmd_walkforward(args):
+    print("🧭 Walk-forward оптимизация...", flush=True)
+    from main import load_wide_data, run_walk_forwards
+
+    run_walk_forwards(load_wide_data(), train_bars=args.train_bars, test_bars=args.test_bars, anchored=args.anchored,
+                      workers=args.workers)
+
+
+def cmd_robustness(args):
+    print(f"🎲 Анализ устойчивости ({args.iterations} итераций)...", flush=True)
+    from core.robustness import run_robustness
+
+    run_robustness(results_dir=args.results_dir, n_iter=args.iterations, block_bars=args.block_bars, seed=args.seed,
+                   workers=args.workers)
+
+
+def cmd_report(args):
+    print("📊 Сборка отчёта...", flush=True)
+    from core.metrics import build_report
+
+    build_report(results_dir=args.results_dir, open_browser=args.open, workers=args.workers, force=args.force,
+                 max_points=args.max_points)
+
+
+def build_parser():
+    """
+    Returns:
+        argparse.ArgumentParser: Парсер с подкомандами download, backtest, sweep, walkforward, robustness, report.
+    """
+    # Значения по умолчанию повторяют константы модулей, чтобы не импортировать их ради --help
+    parser = argparse.ArgumentParser(prog="cli.py", description="Бэктестер торговых стратегий")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    download = commands.add_parser("download", help="загрузить историю с data.binance.vision")
+    download.add_argument("--start", default="2025-02", help="первый месяц (YYYY-MM)")
+    download.add_argument("--end", default=None, help="последний месяц (по умолчанию — текущий)")
+    download.add_argument("--intervals", nargs="+", default=["1m"], help="интервалы свечей")
+    download.add_argument("--symbols", nargs="+", default=None, help="только эти пары (по умолчанию — все BTC-пары)")
+    download.add_argument("--store-dir", default="data/historic",
+                          help="корень хранилища Parquet (тот же, что читает backtest — main.DATA_PATH)")
+    download.add_argument("--base-url", default="https://data.binance.vision/data/spot", help="корень data.binance.vision")
+    download.set_defaults(func=cmd_download)
+
+    backtest = commands.add_parser("backtest", help="прогнать все стратегии")
+    backtest.add_argument("--workers", type=int, default=1,
+                          help="число процессов (по умолчанию 1 — последовательно; 0 — по числу ядер)")
+    backtest.add_argument("--symbol-chunks", type=int, default=1,
+                          help="на сколько блоков делить символы (каждый блок торгует своей долей капитала)")
+    backtest.add_argument("--engine", choices=["vbt", "native"], default="vbt", help="движок симуляции")
+    backtest.add_argument("--csv", action="store_true", help="дополнительно сохранить результаты в CSV")
+    backtest.add_argument("--chunk-bars", type=int, default=None,
+                          help="считать блоками по N баров (движок native) — для многолетней истории")
+    backtest.add_argument("--no-cache", action="store_true",
+                          help="не брать прогоны из кеша (data/runs), пересчитать все стратегии")
+    backtest.set_defaults(func=cmd_backtest)
+
+    sweep = commands.add_parser("sweep", help="перебрать сетки параметров (main.SWEEP_GRIDS)")
+    sweep.set_defaults(func=cmd_sweep)
+
+    walkforward = commands.add_parser("walkforward", help="walk-forward оптимизация по сеткам main.SWEEP_GRIDS")
+    walkforward.add_argument("--train-bars", type=int, default=43_200, help="баров в обучающем окне")
+    walkforward.add_argument("--test-bars", type=int, default=10_080, help="баров в тестовом окне")
+    walkforward.add_argument("--anchored", action="store_true", help="расширяющееся обучающее окно вместо скользящего")
+    walkforward.add_argument("--workers", type=int, default=None, help="число процессов для фолдов")
+    walkforward.set_defaults(func=cmd_walkforward)
+
+    robustness = commands.add_parser("robustness", help="бутстреп сделок и доходностей по results/")
+    robustness.add_argument("--results-dir", default="results", help="папка результатов")
+    robustness.add_argument("--iterations", type=int, default=10_000, help="итераций на метод")
+    robustness.add_argument("--block-bars", type=int, default=1440, help="длина блока поминутных доходностей")
+    robustness.add_argument("--seed", type=int, default=0, help="зерно генератора")
+    robustness.add_argument("--workers", type=int, default=1, help="число процессов")
+    robustness.set_defaults(func=cmd_robustness)
+
+    report = commands.add_parser("report", help="собрать HTML-отчёт по results/")
+    report.add_argument("--results-dir", default="results", help="папка результатов")
+    report.add_argument("--open", action="store_true", help="открыть отчёт в браузере")
+    report.add_argument("--workers", type=int, default=1, help="число процессов для сборки фигур")
+    report.add_argument("--force", action="store_true", help="пересобрать все фигуры, не глядя на манифест")
+    report.add_argument("--max-points", type=int, default=2000, help="точек на кривой капитала")
+    report.set_defaults(func=cmd_report)
+
+    return parser
+
+
+def cli(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    cli(sys.argv[1:])
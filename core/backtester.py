@@ -48,37 +48,53 @@ def plot_equity(pf, filename):
 # backtester.py (обновлён под мультиформат)
 import os
 import pandas as pd
-import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-import vectorbt as vbt
+from core.results_store import DEFAULT_FORMATS, write_value
+from core.wide_cache import to_wide
 
-import os
 
-def run_multi_strategy(strategy_class, df, position_size=0.01):
+def run_multi_strategy(strategy_class, df, position_size=0.01, engine=None, formats=DEFAULT_FORMATS):
     """
     Запускает стратегию на мультиформатных данных и возвращает vbt.Portfolio.
 
     Аргументы:
         strategy_class: класс стратегии (должен быть подклассом StrategyBase)
-        df: DataFrame с индексом (open_time, symbol)
+        df: DataFrame с индексом (open_time, symbol) или уже широкий DataFrame (field, symbol)
         position_size: размер позиции в долях (по умолчанию 1%)
+        engine: движок симуляции ("vbt" или "native"; None — движок стратегии по умолчанию)
+        formats: форматы сохранения стоимости портфеля (core.results_store.RESULT_FORMATS)
 
     Возвращает:
         vbt.Portfolio
     """
     import os
 
-    # Преобразуем строки в MultiIndex-колонки (field, symbol)
-    df_wide = df.unstack('symbol')
+    # Преобразуем строки в MultiIndex-колонки (field, symbol); широкие данные (из кеша) берём как есть
+    df_wide = to_wide(df)
 
     # Инициализация стратегии
-    strategy = strategy_class(df_wide, position_size=position_size)
+    options = {} if engine is None else {"engine": engine}
+    strategy = strategy_class(df_wide, position_size=position_size, **options)
     strategy.run_backtest()
 
     # Получаем объект портфеля
     pf = strategy.portfolio
 
-    # Определяем имя стратегии
+    # === Сохраняем стоимость портфеля (value), а не просто кэш
+    save_value(pf.value(), strategy_short_name(strategy_class), formats)
+
+    return pf
+
+
+def strategy_short_name(strategy_class):
+    """
+    Определяет короткое имя стратегии для имён файлов (sma, rsi, vwap).
+
+    Args:
+        strategy_class: класс стратегии или фабрика
+
+    Returns:
+        str: короткое имя
+    """
     strategy_name_map = {
         "smacrossoverstrategy": "sma",
         "rsibbstrategy": "rsi",
@@ -86,14 +102,19 @@ def run_multi_strategy(strategy_class, df, position_size=0.01):
     }
 
     class_name = strategy_class.__name__.lower()
-    strat_name = strategy_name_map.get(class_name, class_name)
+    return strategy_name_map.get(class_name, class_name)
 
-    # === Сохраняем стоимость портфеля (value), а не просто кэш
-    value_df = pf.value()
-    os.makedirs("results/cash", exist_ok=True)
-    value_df.to_csv(f"results/cash/{strat_name}_cash.csv")
 
-    return pf
+def save_value(value_df, strat_name, formats=DEFAULT_FORMATS):
+    """
+    Сохраняет стоимость портфеля в results/cash/{strat_name}_cash.parquet (и .csv, если запрошен).
+
+    Args:
+        value_df (pd.Series | pd.DataFrame): стоимость портфеля во времени
+        strat_name (str): короткое имя стратегии
+        formats (tuple): форматы записи ("parquet", "csv")
+    """
+    write_value(value_df, strat_name, formats=formats)
 
 
 
@@ -103,6 +124,8 @@ def save_results(stats_df, filename):
 
 
 def plot_equity(pf, filename):
+    import plotly.graph_objects as go
+
     equity = pf.asset_value()
     fig = go.Figure()
 
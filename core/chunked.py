@@ -0,0 +1,133 @@
+# core/chunked.py
+# Бэктест блоками по времени: в памяти одновременно только окно из chunk_bars баров (плюс прогрев индикаторов)
+#
+# Сигналы считаются на окне с прогревом (StrategyBase.warmup_start), а состояние стопов,
+# сдвига сигналов и портфеля (кеш, позиции, открытые сделки) переносится через границу блока,
+# поэтому результат совпадает с обычным прогоном движком "native".
+
+import numpy as np
+import pandas as pd
+from core.indicator_cache import IndicatorCache
+from core.parallel import PortfolioResult, merge_stats
+from core.portfolio import PORTFOLIO_KWARGS
+from core.simulator import new_state, simulate_chunk_nb, trade_fields, trades_readable
+from core.stops import apply_stops, new_stop_state
+
+# 30 дней минутных баров
+CHUNK_BARS = 43_200
+
+
+def iter_chunks(n_rows, chunk_bars=CHUNK_BARS):
+    """
+    Yields:
+        Tuple[int, int]: Границы блока [start, stop).
+    """
+    for start in range(0, n_rows, chunk_bars):
+        yield start, min(start + chunk_bars, n_rows)
+
+
+class ValueWriter:
+    """
+    Дописывает стоимость портфеля в Parquet блок за блоком (тот же формат, что core.results_store.write_value).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._writer = None
+
+    def write(self, value):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(value.to_frame())
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run_chunked(strategy_class, data, chunk_bars=CHUNK_BARS, position_size=0.01, value_path=None, **params):
+    """
+    Прогоняет стратегию по истории блоками по chunk_bars баров.
+
+    Пиковая память ограничена окном блока (данные, индикаторы, сигналы) и одним числом
+    на бар для стоимости портфеля. Симуляция — ядро core.simulator с состоянием между блоками.
+    Окно блока с прогревом берётся срезом data внутри цикла, вся история целиком не читается:
+    для данных из кеша широких матриц (load_wide_data) это view на memmap.
+
+    Args:
+        strategy_class: Класс стратегии (подкласс StrategyBase).
+        data (pd.DataFrame): Широкие данные (field, symbol), например memmap из load_wide_data.
+        chunk_bars (int): Баров в блоке.
+        position_size (float): Размер позиции в долях.
+        value_path (str, optional): Parquet-файл, куда стоимость портфеля пишется по мере расчёта.
+        **params: Параметры стратегии.
+
+    Returns:
+        PortfolioResult | None: Результат (как у движка "native") или None, если сигналов не было.
+    """
+    index = data.index
+    symbols = data.columns.get_level_values("symbol")[data.columns.get_level_values(0) == "close"]
+    n_cols = len(symbols)
+
+    strategy = strategy_class(None, position_size=position_size, **params)
+    stops = (strategy.tp_pct, strategy.sl_pct, strategy.trailing_pct)
+    sim_state = new_state(n_cols, strategy.init_cash)
+    stop_state = new_stop_state(n_cols)
+    prev_entries = np.zeros((1, n_cols), dtype=bool)
+    prev_exits = np.zeros((1, n_cols), dtype=bool)
+
+    values, trades = [], []
+    any_signal = False
+    writer = ValueWriter(value_path) if value_path is not None else None
+
+    try:
+        for start, stop in iter_chunks(len(index), chunk_bars):
+            first = strategy.warmup_start(index, start)
+            window_data = data.iloc[first:stop]
+            window = strategy_class(window_data, position_size=position_size, indicators=IndicatorCache(), **params)
+            entries, exits = window.generate_signals()
+            entries = entries.fillna(False).iloc[start - first:]
+            exits = exits.fillna(False).iloc[start - first:]
+            price = window_data.xs("close", axis=1, level=0).iloc[start - first:]
+
+            if any(stop_pct is not None for stop_pct in stops):
+                exits = apply_stops(price, entries, exits, *stops, state=stop_state)
+
+            # Сдвиг на бар через границу блока: первый бар получает сигналы последнего бара прошлого блока
+            entries, exits = entries.to_numpy(dtype=bool), exits.to_numpy(dtype=bool)
+            shifted_entries = np.vstack([prev_entries, entries[:-1]])
+            shifted_exits = np.vstack([prev_exits, exits[:-1]])
+            prev_entries, prev_exits = entries[-1:], exits[-1:]
+            any_signal |= bool(shifted_entries.any() or shifted_exits.any())
+
+            value, *fields = simulate_chunk_nb(
+                np.ascontiguousarray(price.to_numpy(dtype=np.float64)),
+                shifted_entries,
+                shifted_exits,
+                float(position_size),
+                float(PORTFOLIO_KWARGS["fees"]),
+                float(PORTFOLIO_KWARGS["slippage"]),
+                start,
+                *sim_state
+            )
+            value = pd.Series(value, index=price.index, name="group")
+            values.append(value)
+            trades.append(fields)
+            if writer is not None:
+                writer.write(value)
+            print(f"🧱 {strategy_class.__name__}: {stop}/{len(index)} баров")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if not any_signal:
+        print("⚠️ Нет сигналов входа/выхода. Пропускаем стратегию.")
+        return None
+
+    value = pd.concat(values)
+    trades = trades_readable(trade_fields(trades, sim_state, len(index) - 1), index, symbols)
+    return PortfolioResult(value, trades, merge_stats(value, trades, strategy.init_cash))
@@ -1,8 +1,21 @@
 import os
+import glob
+import json
+import shutil
+import time
+import hashlib
+from datetime import date
 import requests
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
-from binance.client import Client
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from tqdm import tqdm
 import logging
 
@@ -10,112 +23,598 @@ import logging
 API_KEY = ""
 API_SECRET = ""
 
-MONTH = "2025-02"
-INTERVAL = "1m"
-BASE_URL = "https://data.binance.vision/data/spot/monthly/klines"
+START_MONTH = "2025-02"
+END_MONTH = None         # None — по текущий месяц включительно (дневными архивами)
+INTERVALS = ("1m",)
+BASE_URL = "https://data.binance.vision/data/spot"
 TEMP_DIR = "temp_downloads"
-OUTPUT_PARQUET = "../data/historic_data.parquet"
+STORE_DIR = "data/historic"    # относительно корня проекта, как main.DATA_PATH
+MANIFEST_FILE = "_manifest.json"
+ROW_GROUP_SIZE = 1440    # строк в row group: сутки минутных свечей одного символа
+
+# === Схема хранения ===
+KLINE_COLUMNS = [
+    "open_time", "open", "high", "low", "close", "volume",
+    "close_time", "quote_asset_volume", "number_of_trades",
+    "taker_buy_base_asset_volume", "taker_buy_quote_asset_volume", "ignore"
+]
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+VOLUME_COLUMNS = ["volume", "quote_asset_volume", "taker_buy_base_asset_volume", "taker_buy_quote_asset_volume"]
+TIME_COLUMNS = ["open_time", "close_time"]
+VOLUME_DTYPE = "float32"         # "float64", если нужна полная точность объёмов
+DROP_COLUMNS = ("close_time",)   # колонки, которые не сохраняем
 TOP_N = 100
-LOG_FILE = "../../data_download.log"
+LOG_FILE = "data_download.log"
+
+# === Параметры скачивания ===
+MAX_WORKERS = 8          # одновременных загрузок
+CHUNK_SIZE = 1 << 20     # размер блока при потоковой записи (1 МБ)
+MAX_RETRIES = 5
+BACKOFF = 1.0            # базовая пауза между попытками, секунд (удваивается)
+TIMEOUT = 20
 
 # === Логирование ===
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+def setup_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.FileHandler(LOG_FILE),
+            logging.StreamHandler()
+        ]
+    )
 
 def get_btc_pairs():
+    from binance.client import Client
+
     client = Client(API_KEY, API_SECRET)
     info = client.get_exchange_info()
     btc_pairs = [s['symbol'] for s in info['symbols'] if s['quoteAsset'] == 'BTC' and s['status'] == 'TRADING']
     logging.info(f"🔍 Найдено {len(btc_pairs)} BTC-пар")
     return btc_pairs
 
-def download_and_extract(symbol):
-    zip_filename = f"{symbol}-{INTERVAL}-{MONTH}.zip"
-    local_zip_path = os.path.join(TEMP_DIR, zip_filename)
+def make_session(pool_size=MAX_WORKERS):
+    """
+    Создаёт requests.Session с пулом соединений на pool_size потоков.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
-    if os.path.exists(local_zip_path):
-        logging.info(f"📦 Кеш найден: {zip_filename}")
-    else:
-        url = f"{BASE_URL}/{symbol}/{INTERVAL}/{zip_filename}"
+
+def is_not_found(error):
+    return isinstance(error, requests.HTTPError) and error.response is not None and error.response.status_code == 404
+
+
+def with_retries(url, action):
+    """
+    Вызывает action() до MAX_RETRIES раз с паузой BACKOFF, удваивающейся после каждой неудачи.
+    После последней попытки пауз нет — ошибка пробрасывается сразу.
+
+    Ответ 404 не повторяется: requests.HTTPError пробрасывается сразу.
+
+    Args:
+        url (str): Адрес (для логов).
+        action (Callable): Одна попытка запроса.
+
+    Returns:
+        Any: Результат action().
+
+    Raises:
+        Exception: Ошибка последней попытки, если все не удались.
+    """
+    for attempt in range(1, MAX_RETRIES + 1):
         try:
-            logging.info(f"⬇️ Скачиваем: {url}")
-            response = requests.get(url, timeout=20)
-            response.raise_for_status()
-            with open(local_zip_path, "wb") as f:
-                f.write(response.content)
-            logging.info(f"✅ Сохранено: {local_zip_path}")
+            return action()
         except Exception as e:
-            logging.warning(f"❌ {symbol}: ошибка при скачивании — {e}")
-            return None
+            if is_not_found(e):
+                raise
+            error = e
+
+        if attempt == MAX_RETRIES:
+            logging.warning(f"🔁 {url}: попытка {attempt}/{MAX_RETRIES} не удалась — {error}")
+            break
+        delay = BACKOFF * 2 ** (attempt - 1)
+        logging.warning(f"🔁 {url}: попытка {attempt}/{MAX_RETRIES} не удалась — {error}. Повтор через {delay:.1f} с")
+        time.sleep(delay)
+
+    raise error
+
+
+def fetch_checksum(session, url):
+    """
+    Загружает SHA256 из файла {url}.CHECKSUM, который Binance публикует рядом с архивом.
+
+    Запрос повторяется, как и загрузка архива (with_retries). Отсутствие файла (404)
+    означает, что проверять нечего; любая другая ошибка пробрасывается — архив
+    без проверки не принимается.
+
+    Returns:
+        str | None: Хеш в нижнем регистре или None, если файла контрольной суммы нет.
+    """
+    checksum_url = f"{url}.CHECKSUM"
+
+    def attempt():
+        response = session.get(checksum_url, timeout=TIMEOUT)
+        response.raise_for_status()
+        return response.text.split()[0].lower()
 
     try:
-        with zipfile.ZipFile(local_zip_path, 'r') as zf:
-            extracted_file = zf.namelist()[0]
-            zf.extractall(TEMP_DIR)
-            return os.path.join(TEMP_DIR, extracted_file)
+        return with_retries(checksum_url, attempt)
+    except requests.HTTPError as e:
+        if not is_not_found(e):
+            raise
+        logging.warning(f"⚠️ Нет контрольной суммы для {url}")
+        return None
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def download_file(session, url, path, expected_sha256=None):
+    """
+    Скачивает файл потоково, блоками по CHUNK_SIZE, с докачкой и повторами.
+
+    Данные пишутся в {path}.part; если файл уже частично скачан, запрашивается
+    только недостающий хвост (заголовок Range). После загрузки проверяется SHA256
+    (если известен), и файл переименовывается в path.
+
+    Args:
+        session (requests.Session): Сессия с пулом соединений.
+        url (str): Адрес файла.
+        path (str): Куда сохранить файл.
+        expected_sha256 (str, optional): Ожидаемый SHA256.
+
+    Returns:
+        bool: True, если файл скачан и прошёл проверку.
+    """
+    part_path = f"{path}.part"
+
+    def attempt():
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        with session.get(url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+            # 416 — файл уже скачан целиком, докачивать нечего
+            if response.status_code != 416:
+                response.raise_for_status()
+                # Если сервер проигнорировал Range, начинаем файл заново
+                mode = "ab" if response.status_code == 206 else "wb"
+                with open(part_path, mode) as f:
+                    for block in response.iter_content(chunk_size=CHUNK_SIZE):
+                        f.write(block)
+
+        if expected_sha256 and file_sha256(part_path) != expected_sha256:
+            os.remove(part_path)
+            raise ValueError("контрольная сумма не совпала")
+
+        os.replace(part_path, path)
+        return True
+
+    try:
+        return with_retries(url, attempt)
+    except Exception as e:
+        if is_not_found(e):
+            logging.warning(f"❌ Нет архива: {url}")
+        else:
+            logging.error(f"❌ Не удалось скачать {url} за {MAX_RETRIES} попыток")
+        return False
+
+
+def archive_name(symbol, interval, period):
+    return f"{symbol}-{interval}-{period}.zip"
+
+
+def archive_url(symbol, interval, period, base_url=BASE_URL):
+    """
+    Адрес архива: period "YYYY-MM" — месячный архив, "YYYY-MM-DD" — дневной.
+    """
+    kind = "daily" if len(period) == 10 else "monthly"
+    return f"{base_url}/{kind}/klines/{symbol}/{interval}/{archive_name(symbol, interval, period)}"
+
+
+def download_archive(session, symbol, interval, period, base_url=BASE_URL, temp_dir=TEMP_DIR):
+    """
+    Скачивает архив символа за месяц или день (или берёт его из кеша).
+
+    Returns:
+        str | None: Путь к zip-архиву или None при ошибке.
+    """
+    zip_filename = archive_name(symbol, interval, period)
+    local_zip_path = os.path.join(temp_dir, zip_filename)
+
+    if os.path.exists(local_zip_path):
+        logging.info(f"📦 Кеш найден: {zip_filename}")
+        return local_zip_path
+
+    url = archive_url(symbol, interval, period, base_url)
+    logging.info(f"⬇️ Скачиваем: {url}")
+    try:
+        expected_sha256 = fetch_checksum(session, url)
     except Exception as e:
-        logging.error(f"❌ {symbol}: ошибка при распаковке — {e}")
+        logging.error(f"❌ {url}: не удалось получить контрольную сумму — {e}")
+        return None
+    if not download_file(session, url, local_zip_path, expected_sha256):
         return None
 
-from datetime import datetime
+    logging.info(f"✅ Сохранено: {local_zip_path}")
+    return local_zip_path
 
-def process_csv(filepath, symbol):
-    df = pd.read_csv(filepath, header=None)
 
-    df.columns = [
-        "open_time", "open", "high", "low", "close", "volume",
-        "close_time", "quote_asset_volume", "number_of_trades",
-        "taker_buy_base_asset_volume", "taker_buy_quote_asset_volume", "ignore"
-    ]
+def download_archives(symbols, interval, periods, base_url=BASE_URL, temp_dir=TEMP_DIR, max_workers=MAX_WORKERS):
+    """
+    Скачивает архивы всех символов за все периоды параллельно, не более max_workers одновременно.
+
+    Returns:
+        dict: (символ, период) -> путь к zip-архиву (архивы с ошибкой пропускаются).
+    """
+    os.makedirs(temp_dir, exist_ok=True)
+    session = make_session(max_workers)
+    jobs = [(symbol, period) for symbol in symbols for period in periods]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        paths = pool.map(lambda job: download_archive(session, job[0], interval, job[1], base_url, temp_dir), jobs)
+        archives = dict(zip(jobs, tqdm(paths, total=len(jobs), desc=f"Загрузка {interval}")))
+
+    return {job: path for job, path in archives.items() if path}
+
+
+def apply_schema(df, volume_dtype=VOLUME_DTYPE, drop_columns=DROP_COLUMNS):
+    """
+    Приводит свечи к компактной схеме хранения.
+
+    Цены остаются float64 (у BTC-пар они порядка 1e-7), объёмы — volume_dtype,
+    число сделок — int32, symbol — категория, колонки из drop_columns удаляются.
+
+    Args:
+        df (pd.DataFrame): Свечи Binance (колонки KLINE_COLUMNS и symbol).
+        volume_dtype (str): Тип объёмов ("float32" или "float64").
+        drop_columns (Iterable[str]): Колонки, которые не нужны.
+
+    Returns:
+        pd.DataFrame: Свечи в компактной схеме.
+    """
+    df = df.drop(columns=[c for c in drop_columns if c in df.columns])
+    dtypes = {c: "float64" for c in PRICE_COLUMNS}
+    dtypes.update({c: volume_dtype for c in VOLUME_COLUMNS})
+    dtypes["number_of_trades"] = "int32"
+    dtypes["symbol"] = "category"
+    return df.astype({c: dtype for c, dtype in dtypes.items() if c in df.columns})
+
+
+def memory_report(before, after):
+    """
+    Сравнивает потребление памяти двух DataFrame по колонкам (в МБ, с учётом строк object).
+
+    Returns:
+        pd.DataFrame: Колонки before_mb, after_mb и ratio; последняя строка — итог.
+    """
+    report = pd.DataFrame({
+        "before_mb": before.memory_usage(deep=True, index=False) / 2 ** 20,
+        "after_mb": after.memory_usage(deep=True, index=False) / 2 ** 20,
+    }).reindex(before.columns).fillna(0.0)
+    report.loc["total"] = report.sum()
+    report["ratio"] = report["after_mb"] / report["before_mb"]
+    return report
+
+
+def kline_types(volume_dtype=VOLUME_DTYPE):
+    """
+    Явные типы колонок CSV для pyarrow.csv: время читается целым числом, объёмы — сразу в volume_dtype.
+
+    Returns:
+        dict: Колонка -> тип Arrow.
+    """
+    types = {c: pa.int64() for c in TIME_COLUMNS}
+    types.update({c: pa.float64() for c in PRICE_COLUMNS})
+    types.update({c: pa.from_numpy_dtype(np.dtype(volume_dtype)) for c in VOLUME_COLUMNS})
+    types["number_of_trades"] = pa.int32()
+    return types
 
-    df = df.drop(columns=["ignore"])
+
+def time_unit(open_time):
+    """
+    Единица времени файла: Binance перешёл с миллисекунд на микросекунды в 2025 году,
+    поэтому она определяется по величине первой метки каждого файла.
+
+    Args:
+        open_time (pa.ChunkedArray): Метки open_time целыми числами.
+
+    Returns:
+        str: "us" или "ms".
+    """
+    return "us" if len(open_time) and open_time[0].as_py() > 10 ** 14 else "ms"
+
+
+def read_klines(source, volume_dtype=VOLUME_DTYPE, drop_columns=DROP_COLUMNS, columns=None):
+    """
+    Разбирает CSV свечей в Arrow: явная схема, многопоточный парсер,
+    перевод времени в timestamp[ns] внутри Arrow.
+
+    Args:
+        source: Путь к CSV или файловый объект (например, член zip-архива).
+        volume_dtype (str): Тип объёмов ("float32" или "float64").
+        drop_columns (Iterable[str]): Колонки, которые не нужны.
+        columns (list, optional): Читать только эти колонки (по умолчанию — все, кроме ignore и drop_columns).
+
+    Returns:
+        pa.Table: Свечи без колонки symbol.
+    """
+    if columns is None:
+        columns = [c for c in KLINE_COLUMNS if c != "ignore" and c not in drop_columns]
+    time_columns = [c for c in TIME_COLUMNS if c in columns]
+    # open_time нужен для определения единицы времени, даже если его не просили
+    read_columns = list(dict.fromkeys(["open_time", *columns])) if time_columns else list(columns)
+
+    table = pv.read_csv(
+        source,
+        read_options=pv.ReadOptions(column_names=KLINE_COLUMNS, use_threads=True),
+        convert_options=pv.ConvertOptions(column_types=kline_types(volume_dtype), include_columns=read_columns),
+    )
+
+    if time_columns:
+        unit = time_unit(table["open_time"])
+        for name in time_columns:
+            times = table[name].cast(pa.timestamp(unit)).cast(pa.timestamp("ns"))
+            table = table.set_column(table.schema.get_field_index(name), name, times)
+
+    return table.select(columns)
+
+
+def klines_frame(table, symbol, volume_dtype=VOLUME_DTYPE, drop_columns=DROP_COLUMNS):
+    """
+    Returns:
+        pd.DataFrame: Свечи read_klines в компактной схеме (apply_schema) с колонкой symbol.
+    """
+    df = table.to_pandas()
     df["symbol"] = symbol
+    return apply_schema(df, volume_dtype, drop_columns)
 
-    # Преобразуем open_time и close_time из микросекунд в datetime
-    df["open_time"] = pd.to_datetime(df["open_time"], unit='us')
-    df["close_time"] = pd.to_datetime(df["close_time"], unit='us')
 
-    return df
+def open_archive_csv(zip_path):
+    """
+    Открывает CSV внутри zip-архива как поток, без распаковки на диск.
 
+    Returns:
+        Tuple[zipfile.ZipFile, IO[bytes]]: Архив и поток его первого файла (закрыть оба).
+    """
+    zf = zipfile.ZipFile(zip_path, 'r')
+    try:
+        return zf, zf.open(zf.namelist()[0])
+    except Exception:
+        zf.close()
+        raise
 
-def download_btc_data():
-    os.makedirs(TEMP_DIR, exist_ok=True)
-    os.makedirs(os.path.dirname(OUTPUT_PARQUET), exist_ok=True)
 
-    symbols = get_btc_pairs()
-    pair_data = {}
-    volumes = {}
+def read_archive(zip_path, symbol, volume_dtype=VOLUME_DTYPE, drop_columns=DROP_COLUMNS):
+    """
+    Читает свечи прямо из zip-архива Binance (без временных файлов).
+
+    Returns:
+        pd.DataFrame | None: Свечи в компактной схеме (apply_schema) или None, если архив повреждён.
+    """
+    try:
+        zf, stream = open_archive_csv(zip_path)
+        with zf, stream:
+            table = read_klines(stream, volume_dtype, drop_columns)
+    except (pa.ArrowInvalid, zipfile.BadZipFile, IndexError, OSError) as e:
+        logging.error(f"❌ {zip_path}: ошибка при чтении — {e}")
+        return None
+    return klines_frame(table, symbol, volume_dtype, drop_columns)
+
+
+def month_range(start, end):
+    """
+    Список месяцев "YYYY-MM" от start до end включительно.
+    """
+    return [str(month) for month in pd.period_range(start, end, freq="M")]
+
+
+def current_month_days(today=None):
+    """
+    Дни текущего месяца, за которые уже опубликованы дневные архивы (до вчера включительно).
+    """
+    today = today or date.today()
+    return [str(today.replace(day=day)) for day in range(1, today.day)]
+
+
+def load_manifest(store_dir=STORE_DIR):
+    path = os.path.join(store_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, store_dir=STORE_DIR):
+    with open(os.path.join(store_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def partition_path(interval, symbol, month, store_dir=STORE_DIR):
+    return os.path.join(store_dir, f"interval={interval}", f"symbol={symbol}", f"month={month}", "data.parquet")
+
+
+def clear_month(interval, month, store_dir=STORE_DIR):
+    """
+    Удаляет партиции месяца у всех символов (состав топ-пар мог измениться).
+    """
+    pattern = os.path.join(store_dir, f"interval={interval}", "symbol=*", f"month={month}")
+    for old_partition in glob.glob(pattern):
+        shutil.rmtree(old_partition)
+
+
+def read_dataset(path, interval, symbols=None, start=None, end=None, columns=None):
+    """
+    Читает Hive-партиционированный датасет (interval=/symbol=/month=) с фильтрами, переданными в pyarrow.
 
-    for symbol in tqdm(symbols, desc="Загрузка и обработка"):
-        path = download_and_extract(symbol)
-        if not path:
-            continue
+    Returns:
+        pd.DataFrame: Данные в длинном формате (без индекса).
+    """
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    condition = ds.field("interval") == interval
 
-        df = process_csv(path, symbol)
-        if df.empty:
-            continue
+    if symbols is not None:
+        condition &= ds.field("symbol").isin(list(symbols))
+    if start is not None:
+        start = pd.Timestamp(start)
+        condition &= (ds.field("month") >= start.strftime("%Y-%m")) & (ds.field("open_time") >= start)
+    if end is not None:
+        end = pd.Timestamp(end)
+        condition &= (ds.field("month") <= end.strftime("%Y-%m")) & (ds.field("open_time") < end)
 
-        volume = df["volume"].astype(float).sum()
-        volumes[symbol] = volume
-        pair_data[symbol] = df
+    table = dataset.to_table(columns=columns, filter=condition)
+
+    # symbol кодируем словарём ещё в Arrow, чтобы pandas получил категорию без промежуточных строк
+    symbol_index = table.schema.get_field_index("symbol")
+    table = table.set_column(symbol_index, "symbol", table.column("symbol").dictionary_encode())
+
+    df = table.to_pandas()
+    return df.drop(columns=["interval", "month"], errors="ignore")
+
+
+def archive_volume(zip_path):
+    """
+    Суммарный объём из архива без распаковки: читается только колонка volume.
+
+    Returns:
+        float | None: Объём или None, если архив пуст или повреждён.
+    """
+    try:
+        zf, stream = open_archive_csv(zip_path)
+        with zf, stream:
+            volume = read_klines(stream, volume_dtype="float64", columns=["volume"])["volume"]
+    except (pa.ArrowInvalid, zipfile.BadZipFile, IndexError, OSError) as e:
+        logging.error(f"❌ {zip_path}: не удалось прочитать объём — {e}")
+        return None
+    return pc.sum(volume).as_py() if len(volume) else None
+
+
+def write_symbol_month(zip_paths, symbol, interval, month, store_dir=STORE_DIR):
+    """
+    Потоково записывает партицию символа за месяц: архивы (месячный или дневные по порядку)
+    читаются прямо из zip по одному и дописываются в Parquet row group за row group.
+
+    Returns:
+        int: Сколько строк записано.
+    """
+    output = partition_path(interval, symbol, month, store_dir)
+    writer = None
+    rows = 0
+
+    try:
+        for zip_path in zip_paths:
+            df = read_archive(zip_path, symbol)
+            if df is None or df.empty:
+                continue
+
+            table = pa.Table.from_pandas(df.drop(columns=["symbol"]).sort_values("open_time"), preserve_index=False)
+            if writer is None:
+                os.makedirs(os.path.dirname(output), exist_ok=True)
+                writer = pq.ParquetWriter(output, table.schema, compression="snappy")
+            writer.write_table(table.cast(writer.schema), row_group_size=ROW_GROUP_SIZE)
+            rows += len(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return rows
+
+
+def ingest_month(symbols, interval, month, periods, base_url=BASE_URL, temp_dir=TEMP_DIR, store_dir=STORE_DIR):
+    """
+    Скачивает архивы месяца (один месячный или несколько дневных на символ),
+    выбирает TOP_N пар по объёму и записывает партиции interval=.../symbol=.../month=....
+
+    Два прохода: сначала по каждому архиву считается только сумма объёма (без распаковки
+    и разбора остальных колонок), затем архивы выбранных пар разбираются и пишутся
+    по одному, поэтому в памяти одновременно находится не больше одного архива символа.
+
+    Returns:
+        bool: True, если партиция записана.
+    """
+    archives = download_archives(symbols, interval, periods, base_url, temp_dir)
+    symbol_archives = {}
+    for (symbol, period), zip_path in sorted(archives.items()):
+        symbol_archives.setdefault(symbol, []).append(zip_path)
+
+    volumes = {}
+    for symbol, zip_paths in tqdm(symbol_archives.items(), desc=f"Объёмы {interval} {month}"):
+        totals = [volume for volume in map(archive_volume, zip_paths) if volume is not None]
+        if totals:
+            volumes[symbol] = sum(totals)
 
     top_symbols = sorted(volumes, key=volumes.get, reverse=True)[:TOP_N]
-    logging.info(f"📈 Топ-{TOP_N} по объёму: {top_symbols}")
+    logging.info(f"📈 {interval} {month}: топ-{TOP_N} по объёму: {top_symbols}")
+
+    if not top_symbols:
+        logging.warning(f"❌ {interval} {month}: ни одна пара не была успешно обработана.")
+        return False
+
+    clear_month(interval, month, store_dir)
+    written = [
+        symbol for symbol in tqdm(top_symbols, desc=f"Запись {interval} {month}")
+        if write_symbol_month(symbol_archives[symbol], symbol, interval, month, store_dir)
+    ]
+    logging.info(f"✅ {interval} {month}: сохранено {len(written)} пар в {store_dir}")
+    return bool(written)
+
+
+def download_btc_data(start=START_MONTH, end=END_MONTH, intervals=INTERVALS,
+                      base_url=BASE_URL, temp_dir=TEMP_DIR, store_dir=STORE_DIR, symbols=None, today=None):
+    """
+    Догружает историю BTC-пар за диапазон месяцев в партиционированное хранилище.
+
+    Завершённые месяцы берутся из месячных архивов и больше не перекачиваются
+    (отмечаются в _manifest.json). Текущий месяц собирается из дневных архивов
+    и при следующем запуске обновляется новыми днями.
+
+    Args:
+        start (str): Первый месяц "YYYY-MM".
+        end (str, optional): Последний месяц "YYYY-MM" (по умолчанию — текущий).
+        intervals (Iterable[str]): Интервалы свечей, например ("1m", "5m").
+        base_url (str): Корень data.binance.vision.
+        temp_dir (str): Папка для архивов.
+        store_dir (str): Корень хранилища Parquet.
+        symbols (list, optional): Список пар (по умолчанию — все торгуемые BTC-пары).
+        today (datetime.date, optional): Текущая дата (для тестов).
+    """
+    today = today or date.today()
+    this_month = today.strftime("%Y-%m")
+    os.makedirs(temp_dir, exist_ok=True)
+    os.makedirs(store_dir, exist_ok=True)
+
+    symbols = symbols or get_btc_pairs()
+    manifest = load_manifest(store_dir)
+
+    for interval in intervals:
+        done = manifest.setdefault(interval, {})
+
+        for month in month_range(start, end or this_month):
+            if done.get(month) == "complete":
+                logging.info(f"⏭️ {interval} {month}: уже загружен")
+                continue
+
+            if month == this_month:
+                periods = current_month_days(today)
+                if not periods or done.get(month) == f"partial:{periods[-1]}":
+                    logging.info(f"⏭️ {interval} {month}: новых дней нет")
+                    continue
+            else:
+                periods = [month]
 
-    top_dfs = [pair_data[s] for s in top_symbols if s in pair_data]
-    if top_dfs:
-        final_df = pd.concat(top_dfs)
-        final_df.to_parquet(OUTPUT_PARQUET, engine="pyarrow", compression="snappy")
-        logging.info(f"✅ Сохранено в: {OUTPUT_PARQUET}")
-    else:
-        logging.warning("❌ Ни одна пара не была успешно обработана.")
+            if ingest_month(symbols, interval, month, periods, base_url, temp_dir, store_dir):
+                done[month] = "complete" if month != this_month else f"partial:{periods[-1]}"
+                save_manifest(manifest, store_dir)
 
 if __name__ == "__main__":
+    setup_logging()
     download_btc_data()
 
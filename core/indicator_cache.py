@@ -0,0 +1,216 @@
+# core/indicator_cache.py
+# Кеш индикаторов: LRU в памяти + файлы на диске, ключ — (имя, параметры, отпечаток данных)
+
+import hashlib
+import os
+import time
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+INDICATOR_CACHE_DIR = "data/indicators"
+INDICATOR_CACHE_MAX_BYTES = 2 ** 30
+INDICATOR_CACHE_MAX_AGE_DAYS = 30
+
+# Отпечатки уже захешированных DataFrame: (id(df), поля) -> хеш
+_FINGERPRINTS = {}
+
+
+def data_fingerprint(df, fields=("close",)):
+    """
+    Отпечаток содержимого широкого DataFrame по выбранным полям.
+
+    Хешируются индекс, символы и значения полей. Результат запоминается
+    на время жизни объекта df, поэтому повторные вызовы бесплатны.
+
+    Args:
+        df (pd.DataFrame): Данные с колонками (field, symbol).
+        fields (tuple): Поля, от которых зависит индикатор.
+
+    Returns:
+        str: Хеш BLAKE2b.
+    """
+    key = (id(df), tuple(fields))
+    if key in _FINGERPRINTS:
+        return _FINGERPRINTS[key]
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(df.index.to_numpy(dtype="datetime64[ns]")).view(np.int64).data)
+    for field in fields:
+        block = df.xs(field, level=0, axis=1)
+        digest.update(repr((field, [str(c) for c in block.columns])).encode())
+        digest.update(np.ascontiguousarray(block.to_numpy()).data)
+
+    fingerprint = digest.hexdigest()
+    _FINGERPRINTS[key] = fingerprint
+    weakref.finalize(df, _FINGERPRINTS.pop, key, None)
+    return fingerprint
+
+
+def _nbytes(value):
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=False).sum())
+    return getattr(value, "nbytes", 0)
+
+
+class IndicatorCache:
+    """
+    Двухуровневый кеш индикаторов.
+
+    Первый уровень — LRU в памяти, ограниченный по объёму (max_bytes).
+    Второй уровень — pickle-файлы в disk_dir (если задан); он переживает перезапуски
+    и общий для процессов пула. Файлы вытесняются по возрасту и суммарному объёму, как
+    записи core.run_cache.RunCache (время изменения файла — время последнего чтения).
+    Счётчики hits / disk_hits / misses доступны через stats().
+    """
+
+    def __init__(self, max_bytes=512 * 2 ** 20, disk_dir=None, disk_max_bytes=INDICATOR_CACHE_MAX_BYTES,
+                 disk_max_age_days=INDICATOR_CACHE_MAX_AGE_DAYS):
+        """
+        Args:
+            max_bytes (int): Предельный объём индикаторов в памяти.
+            disk_dir (str, optional): Папка дискового уровня (None — только память).
+            disk_max_bytes (int): Предельный объём файлов дискового уровня.
+            disk_max_age_days (float): Файлы, которые не читались дольше, удаляются.
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_max_age_days = disk_max_age_days
+        self._memory = OrderedDict()
+        self._sizes = {}
+        self._total = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._memory)
+
+    def get_or_compute(self, name, params, fingerprint, func):
+        """
+        Возвращает индикатор из кеша или считает его через func(**params).
+
+        Args:
+            name (str): Имя индикатора.
+            params (dict): Параметры индикатора.
+            fingerprint (str): Отпечаток входных данных.
+            func (Callable): Функция расчёта.
+
+        Returns:
+            Any: Результат func(**params).
+        """
+        key = (name, tuple(sorted(params.items())), fingerprint)
+
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        path = self._path(key)
+        if path and os.path.exists(path):
+            value = pd.read_pickle(path)
+            os.utime(path)
+            self.disk_hits += 1
+        else:
+            value = func(**params)
+            self.misses += 1
+            if path:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                pd.to_pickle(value, tmp_path)
+                os.replace(tmp_path, path)
+                self.evict()
+
+        self._remember(key, value)
+        return value
+
+    def stats(self):
+        """
+        Returns:
+            dict: Счётчики попаданий и промахов, число и объём индикаторов в памяти.
+        """
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._memory),
+            "memory_mb": self._total / 2 ** 20,
+        }
+
+    def clear(self):
+        self._memory.clear()
+        self._sizes.clear()
+        self._total = 0
+
+    def disk_entries(self):
+        """
+        Returns:
+            list: (время последнего чтения, объём в байтах, путь) по файлам дискового уровня.
+        """
+        if not self.disk_dir or not os.path.isdir(self.disk_dir):
+            return []
+
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            path = os.path.join(self.disk_dir, name)
+            if name.endswith(".pkl"):
+                entries.append((os.path.getmtime(path), os.path.getsize(path), path))
+        return entries
+
+    def evict(self, now=None):
+        """
+        Удаляет файлы старше disk_max_age_days, затем самые давно читанные, пока объём больше disk_max_bytes.
+
+        Returns:
+            list: Пути удалённых файлов.
+        """
+        now = time.time() if now is None else now
+        entries = sorted(self.disk_entries())
+        total = sum(size for _, size, _ in entries)
+
+        removed = []
+        for used, size, path in entries:
+            if now - used <= self.disk_max_age_days * 86400 and total <= self.disk_max_bytes:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # файл уже удалил другой процесс пула
+            total -= size
+            removed.append(path)
+        return removed
+
+    def clear_disk(self):
+        """
+        Удаляет все файлы дискового уровня.
+        """
+        for _, _, path in self.disk_entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _path(self, key):
+        if not self.disk_dir:
+            return None
+        name = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.disk_dir, f"{key[0]}-{name}.pkl")
+
+    def _remember(self, key, value):
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        self._memory[key] = value
+        self._sizes[key] = size
+        self._total += size
+        while self._total > self.max_bytes:
+            old_key, _ = self._memory.popitem(last=False)
+            self._total -= self._sizes.pop(old_key)
+
+
+# Общий кеш процесса; main включает дисковый уровень
+DEFAULT_CACHE = IndicatorCache()
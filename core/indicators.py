@@ -0,0 +1,107 @@
+# core/indicators.py
+# Векторизованные индикаторы: считаются сразу по всей матрице (время × символ)
+
+import numpy as np
+import pandas as pd
+
+
+def rsi(close, window=14):
+    """
+    RSI по Уайлдеру для всех символов за один проход.
+
+    Повторяет ta.momentum.RSIIndicator (fillna=False), но работает
+    с широким DataFrame целиком, без цикла по колонкам.
+
+    Args:
+        close (pd.DataFrame): Цены закрытия (индекс — время, колонки — символы).
+        window (int): Период RSI.
+
+    Returns:
+        pd.DataFrame: Значения RSI той же формы, что и close.
+    """
+    diff = close.diff(1)
+    up = diff.where(diff > 0, 0.0)
+    down = -diff.where(diff < 0, 0.0)
+
+    ema_up = up.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    ema_down = down.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+
+    values_up = ema_up.to_numpy()
+    values_down = ema_down.to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(values_down == 0, 100.0, 100 - 100 / (1 + values_up / values_down))
+
+    return pd.DataFrame(values, index=close.index, columns=close.columns)
+
+
+def bollinger_bands(close, window=20, window_dev=2):
+    """
+    Полосы Боллинджера для всех символов за один проход.
+
+    Повторяет ta.volatility.BollingerBands (fillna=False, std с ddof=0).
+
+    Args:
+        close (pd.DataFrame): Цены закрытия (индекс — время, колонки — символы).
+        window (int): Период скользящего окна.
+        window_dev (float): Количество стандартных отклонений.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: средняя, верхняя и нижняя полосы.
+    """
+    rolling = close.rolling(window, min_periods=window)
+    mavg = rolling.mean()
+    mstd = rolling.std(ddof=0)
+
+    hband = mavg + window_dev * mstd
+    lband = mavg - window_dev * mstd
+    return mavg, hband, lband
+
+
+def session_keys(index, anchor="day"):
+    """
+    Метки торговых сессий для внутридневного сброса накопленных сумм.
+
+    Args:
+        index (pd.DatetimeIndex): Временной индекс баров (UTC).
+        anchor (str): "day" — календарный день UTC, либо время начала сессии в формате "HH:MM".
+
+    Returns:
+        pd.DatetimeIndex: Для каждого бара — начало его сессии.
+    """
+    index = pd.DatetimeIndex(index)
+    if anchor == "day":
+        return index.normalize()
+
+    offset = pd.Timedelta(f"{anchor}:00")
+    return (index - offset).normalize() + offset
+
+
+def vwap(close, volume, anchor="day"):
+    """
+    VWAP для всех символов за один проход.
+
+    Накопленные суммы "цена * объём" и объёма считаются одним групповым cumsum
+    по всей широкой матрице, со сбросом на границе сессии.
+
+    Args:
+        close (pd.DataFrame): Цены закрытия (индекс — время, колонки — символы).
+        volume (pd.DataFrame): Объёмы той же формы.
+        anchor (str | int): Якорь сессии:
+            - "day" — сброс в полночь UTC (по умолчанию);
+            - "HH:MM" — сброс в заданное время начала сессии;
+            - int — скользящий VWAP по последним N барам.
+
+    Returns:
+        pd.DataFrame: VWAP той же формы, что и close.
+    """
+    vol_price = close * volume
+
+    if isinstance(anchor, int):
+        cum_vol_price = vol_price.rolling(anchor, min_periods=1).sum()
+        cum_vol = volume.rolling(anchor, min_periods=1).sum()
+    else:
+        keys = session_keys(close.index, anchor)
+        cum_vol_price = vol_price.groupby(keys).cumsum()
+        cum_vol = volume.groupby(keys).cumsum()
+
+    return cum_vol_price / cum_vol
@@ -89,15 +89,14 @@ print("\n🏁 Все графики трейдов построены!")
 """
 
 
-import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.graph_objects as go
-import webbrowser
+# core/metrics.py
+# Сборка HTML-отчёта по результатам стратегий (results/*_stats.parquet, results/cash/*_cash.parquet; CSV старых прогонов тоже читается)
+#
+# Запуск: python -m core.metrics (или python cli.py report)
 
-# Установим рабочую директорию в корень проекта
-os.chdir(os.path.dirname(os.path.dirname(__file__)))
+import hashlib
+import json
+import os
 
 # === Пути ===
 RESULTS_DIR = "results"
@@ -105,44 +104,19 @@ TRADES_DIR = os.path.join(RESULTS_DIR, "trades")
 CASH_DIR = os.path.join(RESULTS_DIR, "cash")
 SCREENSHOTS_DIR = os.path.join(RESULTS_DIR, "screenshots")
 REPORT_PATH = os.path.join(RESULTS_DIR, "report.html")
-
-os.makedirs(RESULTS_DIR, exist_ok=True)
-os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
+# Манифест и HTML-фрагменты инкрементальной сборки (внутри папки результатов)
+REPORT_STATE_DIR = ".report"
+# Меняется вместе с оформлением фигур, чтобы пересобрать все цели
+REPORT_VERSION = 2
+# Сколько точек оставлять на кривой капитала в отчёте и на PNG
+REPORT_MAX_POINTS = 2000
+# Plotly JS кладётся рядом с отчётом один раз, фрагменты на него ссылаются
+PLOTLYJS_NAME = "plotly.min.js"
 
 # === Стратегии (короткие имена) ===
-strategies = ["sma", "rsi", "vwap"]
-
-# === Загружаем метрики ===
-metrics_list = []
-
-for strat in strategies:
-    stats_path = os.path.join(RESULTS_DIR, f"{strat}_stats.csv")
-    print(f"🔍 Проверка: существует ли {stats_path}?")
-
-    if not os.path.exists(stats_path):
-        print(f"❌ Файл НЕ найден: {stats_path}")
-        continue
-
-    print(f"✅ Файл найден: {stats_path}")
-    stats = pd.read_csv(stats_path, index_col=0).T
-    stats["Strategy"] = strat
+STRATEGY_NAMES = ["sma", "rsi", "vwap"]
 
-    for col in stats.columns:
-        if col != "Strategy":
-            stats[col] = pd.to_numeric(stats[col], errors="coerce")
-
-    metrics_list.append(stats)
-
-if not metrics_list:
-    print("❌ Нет метрик для отчета.")
-    exit()
-
-metrics = pd.concat(metrics_list)
-
-# === HTML блоки ===
-html_parts = []
-
-html_parts.append("""
+HTML_HEAD = """
 <!DOCTYPE html>
 <html lang="ru">
 <head>
@@ -169,28 +143,79 @@ tr:nth-child(even) { background-color: #f2f2f2; }
 </style>
 </head>
 <body>
-""")
+"""
 
-html_parts.append('<h1>📊 Аналитика стратегий</h1>')
-html_parts.append(f'<a href="{os.path.basename(REPORT_PATH)}" download class="download-btn">📥 Скачать отчет</a>')
 
-# === 1. Equity Curve ===
-html_parts.append("<h2>1. Equity Curve по стратегиям</h2>")
+def result_candidates(directory, stem):
+    """
+    Returns:
+        list: Пути результата по форматам в порядке предпочтения (Parquet, затем CSV).
+    """
+    return [os.path.join(directory, f"{stem}.{fmt}") for fmt in ("parquet", "csv")]
 
-fig = go.Figure()
 
-for strat in strategies:
-    cash_path = os.path.join(CASH_DIR, f"{strat}_cash.csv")
-    print(f"🔍 Проверка кеша: {cash_path}")
-    if not os.path.exists(cash_path):
-        print(f"⛔ Нет кеш-файла для {strat.upper()} по пути: {cash_path}")
-        continue
+def first_existing(paths):
+    return next((path for path in paths if os.path.exists(path)), None)
+
+
+def load_metrics(strategies=STRATEGY_NAMES, results_dir=RESULTS_DIR):
+    """
+    Загружает метрики стратегий из results/{strategy}_stats.parquet (или .csv старых прогонов).
+
+    Args:
+        strategies (list): Короткие имена стратегий.
+        results_dir (str): Папка результатов.
+
+    Returns:
+        pd.DataFrame | None: Метрики (строка на стратегию, колонка Strategy) или None, если файлов нет.
+    """
+    import pandas as pd
+    from core.results_store import read_stats
+
+    metrics_list = []
 
-    df = pd.read_csv(cash_path, index_col=0, parse_dates=True)
+    for strat in strategies:
+        stats_path = first_existing(result_candidates(results_dir, f"{strat}_stats"))
+        print(f"🔍 Проверка: есть ли метрики {strat.upper()} в {results_dir}?")
+
+        if stats_path is None:
+            print(f"❌ Файл НЕ найден: {strat}_stats в {results_dir}")
+            continue
+
+        print(f"✅ Файл найден: {stats_path}")
+        stats = read_stats(stats_path).to_frame().T
+        stats["Strategy"] = strat
+
+        for col in stats.columns:
+            if col != "Strategy":
+                stats[col] = pd.to_numeric(stats[col], errors="coerce")
+
+        metrics_list.append(stats)
+
+    return pd.concat(metrics_list) if metrics_list else None
+
+
+def load_equity(strat, cash_dir=CASH_DIR):
+    """
+    Загружает кривую стоимости портфеля стратегии из results/cash/{strat}_cash.parquet (или .csv).
+
+    Returns:
+        pd.Series | None: Стоимость портфеля или None, если файла нет или он пуст.
+    """
+    import pandas as pd
+    from core.results_store import read_value
+
+    cash_path = first_existing(result_candidates(cash_dir, f"{strat}_cash"))
+    print(f"🔍 Проверка кеша: {strat}_cash в {cash_dir}")
+    if cash_path is None:
+        print(f"⛔ Нет кеш-файла для {strat.upper()} в {cash_dir}")
+        return None
+
+    df = read_value(cash_path)
 
     if df.empty:
         print(f"⚠️ Пустой кеш-файл для {strat.upper()}")
-        continue
+        return None
 
     if isinstance(df, pd.DataFrame) and df.shape[1] == 1:
         series = df.iloc[:, 0]
@@ -203,87 +228,356 @@ for strat in strategies:
 
     if series.empty:
         print(f"⚠️ Пустая серия баланса для {strat.upper()}")
-        continue
+        return None
+    return series
 
-    fig.add_trace(go.Scatter(
-        x=series.index,
-        y=series.values,
-        mode="lines",
-        name=f"{strat.upper()} Strategy"
-    ))
 
-    # === Сохраняем PNG скриншот ===
-    screenshot_path = os.path.join(SCREENSHOTS_DIR, f"{strat}_equity.png")
-    fig.write_image(screenshot_path, width=1000, height=500)
-    print(f"🖼 Сохранено изображение: {screenshot_path}")
+def metrics_table(metrics):
+    """
+    Таблица средних метрик по стратегиям с подсветкой лучших значений.
 
-fig.update_layout(
-    title="Equity Curve по стратегиям",
-    xaxis_title="Дата",
-    yaxis_title="Баланс портфеля",
-    height=500,
-    yaxis=dict(tickformat=".0f")
-)
+    Returns:
+        str: HTML-таблица.
+    """
+    avg_metrics = metrics.groupby("Strategy").mean()
+    styled_table = avg_metrics.round(2).astype("object").copy()
 
-html_parts.append(fig.to_html(full_html=False, include_plotlyjs=True))
+    for col in ["Total Return [%]", "Win Rate [%]", "Profit Factor"]:
+        if col in avg_metrics.columns:
+            best_strategy = avg_metrics[col].idxmax()
+            styled_table.loc[best_strategy, col] = f'<td class="metric-best">{styled_table.loc[best_strategy, col]}</td>'
 
-# === 2. Heatmap по Total Return ===
-html_parts.append("<h2>2. Heatmap по Total Return [%]</h2>")
+    for col in ["Max Drawdown [%]"]:
+        if col in avg_metrics.columns:
+            best_strategy = avg_metrics[col].idxmin()
+            styled_table.loc[best_strategy, col] = f'<td class="metric-best">{styled_table.loc[best_strategy, col]}</td>'
 
-pivot = metrics.pivot_table(values="Total Return [%]", index="Strategy")
+    table_html = "<table><tr><th>Strategy</th>"
+    for col in styled_table.columns:
+        table_html += f"<th>{col}</th>"
+    table_html += "</tr>"
 
-plt.figure(figsize=(8, 3))
-sns.heatmap(pivot, annot=True, cmap="coolwarm", fmt=".2f")
-heatmap_path = os.path.join(RESULTS_DIR, "heatmap.png")
-plt.title("Total Return [%] по стратегиям")
-plt.tight_layout()
-plt.savefig(heatmap_path)
-plt.close()
+    for idx, row in styled_table.iterrows():
+        table_html += f"<tr><td>{idx}</td>"
+        for col in styled_table.columns:
+            cell = row[col]
+            if isinstance(cell, str) and 'class="metric-best"' in cell:
+                table_html += cell
+            else:
+                table_html += f"<td>{cell}</td>"
+        table_html += "</tr>"
+    table_html += "</table>"
+    return table_html
+
+
+def downsample(series, max_points=REPORT_MAX_POINTS):
+    """
+    Прореживает кривую до max_points точек, сохраняя форму: ряд делится на корзины,
+    и в каждой остаются минимум и максимум в порядке времени (пики и просадки не теряются).
+
+    Args:
+        series (pd.Series): Кривая капитала.
+        max_points (int): Максимум точек в результате (None — без прореживания).
+
+    Returns:
+        pd.Series: Подвыборка исходного ряда (первая и последняя точки сохраняются).
+    """
+    import numpy as np
+
+    n = len(series)
+    if max_points is None or n <= max_points:
+        return series
+
+    n_buckets = max(1, (max_points - 2) // 2)
+    inner = series.to_numpy()[1:-1]
+    bounds = np.linspace(0, len(inner), n_buckets + 1).astype(np.int64)
+    starts = np.unique(bounds[:-1])
+    bucket = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(inner)]))
+
+    def first_in_bucket(mask):
+        positions = np.flatnonzero(mask)
+        _, first = np.unique(bucket[positions], return_index=True)
+        return positions[first]
+
+    lows = first_in_bucket(inner == np.minimum.reduceat(inner, starts)[bucket])
+    highs = first_in_bucket(inner == np.maximum.reduceat(inner, starts)[bucket])
+    keep = np.unique(np.r_[0, lows + 1, highs + 1, n - 1])
+    return series.iloc[keep]
+
+
+def input_fingerprint(paths, **extra):
+    """
+    Отпечаток входов цели отчёта: размеры и время изменения файлов (как dataset_fingerprint).
+
+    Args:
+        paths (list): Пути к входным файлам (отсутствующие тоже учитываются).
+        **extra: Параметры сборки, влияющие на результат (например, max_points).
+
+    Returns:
+        str: SHA1-хеш.
+    """
+    digest = hashlib.sha1(f"v{REPORT_VERSION};".encode())
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        else:
+            digest.update(f"{os.path.basename(path)}:missing;".encode())
+    digest.update(json.dumps(extra, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def render_equity_png(strat, cash_dir, output, max_points=REPORT_MAX_POINTS):
+    """
+    Экспортирует кривую капитала одной стратегии в PNG (один вызов kaleido на фигуру).
+
+    Returns:
+        bool: True, если изображение сохранено.
+    """
+    series = load_equity(strat, cash_dir)
+    if series is None:
+        return False
+    series = downsample(series, max_points)
+
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Scatter(x=series.index, y=series.values, mode="lines", name=f"{strat.upper()} Strategy"))
+    fig.update_layout(title=f"Equity Curve: {strat.upper()}", xaxis_title="Дата", yaxis_title="Баланс портфеля")
+    try:
+        fig.write_image(output, width=1000, height=500)
+    except ValueError as e:
+        print(f"⚠️ Не удалось сохранить PNG (нужен kaleido): {e}")
+        return False
+    print(f"🖼 Сохранено изображение: {output}")
+    return True
+
+
+def render_equity_html(strategies, cash_dir, output, max_points=REPORT_MAX_POINTS):
+    """
+    Сохраняет HTML-фрагмент общей кривой капитала всех стратегий
+    (кривые прорежены до max_points, Plotly JS подключается отдельно — см. write_plotlyjs).
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for strat in strategies:
+        series = load_equity(strat, cash_dir)
+        if series is None:
+            continue
+        series = downsample(series, max_points)
+
+        fig.add_trace(go.Scatter(
+            x=series.index,
+            y=series.values,
+            mode="lines",
+            name=f"{strat.upper()} Strategy"
+        ))
+
+    fig.update_layout(
+        title="Equity Curve по стратегиям",
+        xaxis_title="Дата",
+        yaxis_title="Баланс портфеля",
+        height=500,
+        yaxis=dict(tickformat=".0f")
+    )
+
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(fig.to_html(full_html=False, include_plotlyjs=False))
+    return True
+
+
+def write_plotlyjs(output):
+    """
+    Сохраняет бандл Plotly JS рядом с отчётом (один раз, а не внутри каждой страницы).
+    """
+    from plotly.offline import get_plotlyjs
+
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(get_plotlyjs())
+    return True
+
+
+def render_heatmap(strategies, results_dir, output):
+    """
+    Сохраняет heatmap Total Return [%] по стратегиям.
+    """
+    metrics = load_metrics(strategies, results_dir)
+    if metrics is None:
+        return False
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    pivot = metrics.pivot_table(values="Total Return [%]", index="Strategy")
+
+    plt.figure(figsize=(8, 3))
+    sns.heatmap(pivot, annot=True, cmap="coolwarm", fmt=".2f")
+    plt.title("Total Return [%] по стратегиям")
+    plt.tight_layout()
+    plt.savefig(output)
+    plt.close()
+    return True
+
+
+def render_metrics_html(strategies, results_dir, output):
+    """
+    Сохраняет HTML-фрагмент таблицы метрик.
+    """
+    metrics = load_metrics(strategies, results_dir)
+    if metrics is None:
+        return False
+
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(metrics_table(metrics))
+    return True
+
+
+def report_targets(strategies=STRATEGY_NAMES, results_dir=RESULTS_DIR, max_points=REPORT_MAX_POINTS):
+    """
+    Цели отчёта с их входами: PNG по каждой стратегии зависит только от её cash-файла,
+    общая кривая — от всех cash-файлов, heatmap и таблица — от stats-файлов.
+
+    Returns:
+        dict: Имя цели -> (функция сборки, аргументы, входные файлы, выходной файл).
+    """
+    cash_dir = os.path.join(results_dir, "cash")
+    screenshots_dir = os.path.join(results_dir, "screenshots")
+    state_dir = os.path.join(results_dir, REPORT_STATE_DIR)
+
+    cash_paths = {s: result_candidates(cash_dir, f"{s}_cash") for s in strategies}
+    stats_paths = [path for s in strategies for path in result_candidates(results_dir, f"{s}_stats")]
+
+    targets = {}
+    for strat in strategies:
+        output = os.path.join(screenshots_dir, f"{strat}_equity.png")
+        targets[f"{strat}_equity.png"] = (render_equity_png, (strat, cash_dir, output, max_points), cash_paths[strat], output)
+
+    output = os.path.join(state_dir, "equity.html")
+    targets["equity.html"] = (render_equity_html, (strategies, cash_dir, output, max_points), sum(cash_paths.values(), []), output)
+    output = os.path.join(results_dir, PLOTLYJS_NAME)
+    targets[PLOTLYJS_NAME] = (write_plotlyjs, (output,), [], output)
+    output = os.path.join(results_dir, "heatmap.png")
+    targets["heatmap.png"] = (render_heatmap, (strategies, results_dir, output), stats_paths, output)
+    output = os.path.join(state_dir, "metrics.html")
+    targets["metrics.html"] = (render_metrics_html, (strategies, results_dir, output), stats_paths, output)
+    return targets
+
+
+def _build_target(func, args):
+    return func(*args)
+
+
+def build_report(strategies=STRATEGY_NAMES, results_dir=RESULTS_DIR, open_browser=False, workers=1, force=False,
+                 max_points=REPORT_MAX_POINTS):
+    """
+    Собирает HTML-отчёт: кривые капитала, heatmap доходности и сравнение метрик.
+
+    Сборка инкрементальная: отпечатки входов каждой цели хранятся в results/.report/manifest.json,
+    и перерисовываются только цели, чьи входы изменились (или выход пропал).
+    Фрагменты HTML кешируются там же, report.html склеивается из них заново при каждом вызове.
+    Plotly, matplotlib и seaborn импортируются только в функциях сборки целей.
+
+    Args:
+        strategies (list): Короткие имена стратегий.
+        results_dir (str): Папка результатов (в ней же сохраняется report.html).
+        open_browser (bool): Открыть отчёт в браузере после сборки.
+        workers (int): Число процессов для сборки целей (1 — последовательно).
+        force (bool): Пересобрать все цели, не глядя на манифест.
+        max_points (int): Сколько точек оставлять на кривых капитала (None — все).
+
+    Returns:
+        str | None: Путь к отчёту или None, если метрик нет.
+    """
+    stats_paths = [path for s in strategies for path in result_candidates(results_dir, f"{s}_stats")]
+    if first_existing(stats_paths) is None:
+        print("❌ Нет метрик для отчета.")
+        return None
+
+    state_dir = os.path.join(results_dir, REPORT_STATE_DIR)
+    manifest_path = os.path.join(state_dir, "manifest.json")
+    report_path = os.path.join(results_dir, "report.html")
+    os.makedirs(state_dir, exist_ok=True)
+    os.makedirs(os.path.join(results_dir, "screenshots"), exist_ok=True)
+
+    manifest = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    targets = report_targets(strategies, results_dir, max_points)
+    fingerprints = {name: input_fingerprint(inputs, args=args) for name, (_, args, inputs, _) in targets.items()}
+    # Цель устарела, если изменились входы или пропал ранее собранный выход.
+    # Неудачные цели (нет cash-файла, нет kaleido) при тех же входах не повторяются — для этого есть force
+    stale = [
+        name for name, (_, _, _, output) in targets.items()
+        if manifest.get(name, {}).get("inputs") != fingerprints[name]
+        or (manifest[name]["built"] and not os.path.exists(output))
+    ]
+    skipped = [name for name in targets if name not in stale]
+
+    if workers > 1 and len(stale) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(min(workers, len(stale))) as pool:
+            futures = {name: pool.submit(_build_target, targets[name][0], targets[name][1]) for name in stale}
+            built = {name: future.result() for name, future in futures.items()}
+    else:
+        built = {name: _build_target(targets[name][0], targets[name][1]) for name in stale}
 
-html_parts.append(f'<img src="heatmap.png" style="width:600px;">')
+    for name, ok in built.items():
+        manifest[name] = {"inputs": fingerprints[name], "built": bool(ok)}
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
 
+    print(f"🔨 Пересобрано: {', '.join(stale) or '—'}")
+    print(f"⏭️ Без изменений: {', '.join(skipped) or '—'}")
 
-# === 3. Сравнение метрик ===
-html_parts.append("<h2>3. Сравнение метрик по стратегиям</h2>")
+    # === HTML блоки ===
+    html_parts = [HTML_HEAD]
 
-avg_metrics = metrics.groupby("Strategy").mean()
-styled_table = avg_metrics.round(2).astype("object").copy()
+    html_parts.append('<h1>📊 Аналитика стратегий</h1>')
+    html_parts.append(f'<a href="{os.path.basename(report_path)}" download class="download-btn">📥 Скачать отчет</a>')
 
-for col in ["Total Return [%]", "Win Rate [%]", "Profit Factor"]:
-    if col in avg_metrics.columns:
-        best_strategy = avg_metrics[col].idxmax()
-        styled_table.loc[best_strategy, col] = f'<td class="metric-best">{styled_table.loc[best_strategy, col]}</td>'
+    # === 1. Equity Curve ===
+    html_parts.append("<h2>1. Equity Curve по стратегиям</h2>")
+    html_parts.append(f'<script src="{PLOTLYJS_NAME}"></script>')
+    html_parts.append(read_fragment(targets["equity.html"][3]))
 
-for col in ["Max Drawdown [%]"]:
-    if col in avg_metrics.columns:
-        best_strategy = avg_metrics[col].idxmin()
-        styled_table.loc[best_strategy, col] = f'<td class="metric-best">{styled_table.loc[best_strategy, col]}</td>'
+    # === 2. Heatmap по Total Return ===
+    html_parts.append("<h2>2. Heatmap по Total Return [%]</h2>")
+    html_parts.append(f'<img src="heatmap.png" style="width:600px;">')
 
-table_html = "<table><tr><th>Strategy</th>"
-for col in styled_table.columns:
-    table_html += f"<th>{col}</th>"
-table_html += "</tr>"
+    # === 3. Сравнение метрик ===
+    html_parts.append("<h2>3. Сравнение метрик по стратегиям</h2>")
+    html_parts.append(read_fragment(targets["metrics.html"][3]))
 
-for idx, row in styled_table.iterrows():
-    table_html += f"<tr><td>{idx}</td>"
-    for col in styled_table.columns:
-        cell = row[col]
-        if isinstance(cell, str) and 'class="metric-best"' in cell:
-            table_html += cell
-        else:
-            table_html += f"<td>{cell}</td>"
-    table_html += "</tr>"
-table_html += "</table>"
+    # === Завершение ===
+    html_parts.append("</body></html>")
 
-html_parts.append(table_html)
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(''.join(html_parts))
 
-# === Завершение ===
-html_parts.append("</body></html>")
+    print(f"✅ HTML-отчет сохранён: {report_path}")
+    if open_browser:
+        import webbrowser
+        webbrowser.open('file://' + os.path.realpath(report_path))
+    return report_path
 
-with open(REPORT_PATH, "w", encoding="utf-8") as f:
-    f.write(''.join(html_parts))
 
-print(f"✅ HTML-отчет сохранён: {REPORT_PATH}")
-webbrowser.open('file://' + os.path.realpath(REPORT_PATH))
+def read_fragment(path):
+    """
+    Returns:
+        str: Содержимое HTML-фрагмента или пустая строка, если его нет.
+    """
+    if not os.path.exists(path):
+        return ""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
 
 
+if __name__ == "__main__":
+    # Как и раньше, скрипт работает из корня проекта и открывает отчёт в браузере
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    build_report(open_browser=True)
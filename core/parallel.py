@@ -0,0 +1,222 @@
+# core/parallel.py
+# Параллельный запуск стратегий и блоков символов в пуле процессов
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+from core.indicator_cache import DEFAULT_CACHE
+from core.portfolio import PORTFOLIO_KWARGS
+from core.wide_cache import to_wide
+
+# Годовой коэффициент для минутных баров (как у vectorbt: year_freq = 365 дней)
+ANN_FACTOR = pd.Timedelta(days=365) / pd.Timedelta(PORTFOLIO_KWARGS["freq"])
+
+# Данные, подключённые в процессе-воркере (заполняется в _init_worker)
+_WORKER_DATA = {}
+
+
+class PortfolioResult:
+    """
+    Облегчённый результат бэктеста, собранный из частей.
+
+    Повторяет ту часть интерфейса vbt.Portfolio, которой пользуются
+    collect_stats_by_symbol и save_trades: stats(), value() и trades.records_readable.
+    """
+
+    def __init__(self, value, trades, stats):
+        self._value = value
+        self._stats = stats
+        self.trades = SimpleNamespace(records_readable=trades)
+
+    def value(self):
+        return self._value
+
+    def stats(self):
+        return self._stats
+
+
+def share_frame(df_wide, directory):
+    """
+    Сохраняет числовые поля широкой матрицы в .npy, чтобы воркеры открывали её через memmap,
+    а не получали копию в каждой задаче.
+
+    Args:
+        df_wide (pd.DataFrame): Данные с колонками (field, symbol).
+        directory (str): Временная папка для файла.
+
+    Returns:
+        dict: Описание матрицы (путь, индекс, колонки) для attach_frame.
+    """
+    numeric = df_wide.select_dtypes("number")
+    path = os.path.join(directory, "prices.npy")
+    np.save(path, numeric.to_numpy(dtype=np.float64))
+    return {"path": path, "index": numeric.index, "columns": numeric.columns}
+
+
+def attach_frame(meta):
+    """
+    Открывает матрицу, сохранённую share_frame, как DataFrame поверх memmap (без копирования).
+
+    Args:
+        meta (dict): Результат share_frame.
+
+    Returns:
+        pd.DataFrame: Широкий DataFrame только для чтения.
+    """
+    values = np.load(meta["path"], mmap_mode="r")
+    return pd.DataFrame(values, index=meta["index"], columns=meta["columns"], copy=False)
+
+
+def _init_worker(meta, indicator_dir):
+    _WORKER_DATA["data"] = attach_frame(meta)
+    DEFAULT_CACHE.disk_dir = indicator_dir
+
+
+def _run_task(strategy_class, symbols, position_size, init_cash, engine):
+    data = _WORKER_DATA["data"]
+    if symbols is not None:
+        data = data.loc[:, data.columns.get_level_values("symbol").isin(symbols)]
+
+    strategy = strategy_class(data, position_size=position_size, init_cash=init_cash, engine=engine)
+    strategy.run_backtest()
+
+    pf = strategy.portfolio
+    if pf is None:
+        return None
+    return {"value": pf.value(), "trades": pf.trades.records_readable, "stats": pf.stats()}
+
+
+def run_parallel(strategies, df, max_workers=None, symbol_chunks=1, position_size=0.01, engine="vbt"):
+    """
+    Запускает стратегии параллельно, дополнительно деля символы на блоки.
+
+    Матрица цен разворачивается один раз и передаётся воркерам через memmap-файл.
+    При symbol_chunks=1 каждая стратегия считается целиком, и результат совпадает
+    с run_multi_strategy. При symbol_chunks > 1 каждый блок получает долю начального
+    капитала пропорционально числу символов, общий кеш действует внутри блока,
+    а стоимость портфеля, сделки и метрики сводятся обратно в один результат.
+    Это другая модель размера позиций, чем один портфель с cash_sharing, поэтому
+    в метриках такого результата есть "Symbol Chunks".
+
+    Args:
+        strategies (Iterable): Классы стратегий.
+        df (pd.DataFrame): Данные с индексом (open_time, symbol) или уже широкий DataFrame.
+        max_workers (int, optional): Число процессов (по умолчанию — число ядер).
+        symbol_chunks (int): На сколько блоков делить символы.
+        position_size (float): Размер позиции в долях.
+        engine (str): Движок симуляции ("vbt" или "native").
+
+    Returns:
+        dict: Класс стратегии -> PortfolioResult (или None, если сигналов не было).
+    """
+    df_wide = to_wide(df)
+    symbols = df_wide.columns.get_level_values("symbol").unique()
+    chunks = [list(chunk) for chunk in np.array_split(symbols, symbol_chunks) if len(chunk)]
+    init_cash = PORTFOLIO_KWARGS["init_cash"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        meta = share_frame(df_wide, tmp)
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(meta, DEFAULT_CACHE.disk_dir)) as pool:
+            futures = {
+                strategy: [
+                    pool.submit(
+                        _run_task,
+                        strategy,
+                        chunk if len(chunks) > 1 else None,
+                        position_size,
+                        init_cash * len(chunk) / len(symbols),
+                        engine
+                    )
+                    for chunk in chunks
+                ]
+                for strategy in strategies
+            }
+            return {
+                strategy: merge_results([f.result() for f in fs], symbol_chunks=len(chunks))
+                for strategy, fs in futures.items()
+            }
+
+
+def merge_results(parts, symbol_chunks=1):
+    """
+    Сводит результаты блоков символов в один PortfolioResult.
+
+    Args:
+        parts (list): Результаты _run_task (None — блок без сигналов).
+        symbol_chunks (int): Число блоков; при > 1 записывается в метрики как "Symbol Chunks".
+
+    Returns:
+        PortfolioResult | None
+    """
+    parts = [part for part in parts if part is not None]
+    if not parts:
+        return None
+    if len(parts) == 1:
+        value, trades, stats = parts[0]["value"], parts[0]["trades"], parts[0]["stats"]
+    else:
+        value = sum(part["value"] for part in parts)
+        trades = pd.concat([part["trades"] for part in parts], ignore_index=True)
+        trades = trades.sort_values("Entry Timestamp", kind="stable").reset_index(drop=True)
+        trades["Exit Trade Id"] = np.arange(len(trades))
+        stats = merge_stats(value, trades)
+
+    if symbol_chunks > 1:
+        stats = pd.concat([stats, pd.Series({"Symbol Chunks": symbol_chunks})]).rename(stats.name)
+    return PortfolioResult(value, trades, stats)
+
+
+def merge_stats(value, trades, init_cash=PORTFOLIO_KWARGS["init_cash"]):
+    """
+    Считает основные метрики vectorbt по сводной стоимости портфеля и сделкам.
+
+    Args:
+        value (pd.Series): Стоимость портфеля.
+        trades (pd.DataFrame): Сделки в формате records_readable.
+        init_cash (float): Начальный капитал.
+
+    Returns:
+        pd.Series: Метрики с теми же названиями, что и в pf.stats().
+    """
+    prev_value = np.r_[init_cash, value.to_numpy()[:-1]]
+    returns = value.to_numpy() / prev_value - 1
+    drawdown = 1 - value / value.cummax()
+
+    closed = trades[trades["Status"] == "Closed"]
+    wins = closed[closed["PnL"] > 0]
+    losses = closed[closed["PnL"] < 0]
+    win_rate = len(wins) / len(closed) if len(closed) else np.nan
+    avg_win = wins["PnL"].mean() if len(wins) else 0.0
+    avg_loss = losses["PnL"].mean() if len(losses) else 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+    # Без закрытых сделок фактор не определён (NaN), бесконечен — только при прибыльных без убыточных
+    if len(losses):
+        profit_factor = wins["PnL"].sum() / abs(losses["PnL"].sum())
+    else:
+        profit_factor = np.inf if len(wins) else np.nan
+
+    return pd.Series({
+        "Start": value.index[0],
+        "End": value.index[-1],
+        "Period": len(value) * pd.Timedelta(PORTFOLIO_KWARGS["freq"]),
+        "Start Value": float(init_cash),
+        "End Value": float(value.iloc[-1]),
+        "Total Return [%]": (value.iloc[-1] / init_cash - 1) * 100,
+        "Total Fees Paid": trades["Entry Fees"].sum() + trades["Exit Fees"].sum(),
+        "Max Drawdown [%]": drawdown.max() * 100,
+        "Total Trades": len(trades),
+        "Total Closed Trades": len(closed),
+        "Total Open Trades": len(trades) - len(closed),
+        "Open Trade PnL": trades.loc[trades["Status"] == "Open", "PnL"].sum(),
+        "Win Rate [%]": win_rate * 100,
+        "Best Trade [%]": closed["Return"].max() * 100,
+        "Worst Trade [%]": closed["Return"].min() * 100,
+        "Avg Winning Trade [%]": wins["Return"].mean() * 100,
+        "Avg Losing Trade [%]": losses["Return"].mean() * 100,
+        "Profit Factor": profit_factor,
+        "Expectancy": win_rate * avg_win + (1 - win_rate) * avg_loss,
+        "Sharpe Ratio": returns.mean() / returns.std(ddof=1) * np.sqrt(ANN_FACTOR),
+        "Sortino Ratio": returns.mean() / downside * np.sqrt(ANN_FACTOR),
+    }, name="group")
@@ -0,0 +1,15 @@
+# core/portfolio.py
+# Параметры симуляции портфеля, общие для стратегий и движков (без тяжёлых импортов)
+
+# Параметры симуляции портфеля, общие для всех стратегий
+PORTFOLIO_KWARGS = dict(
+    init_cash=10_000,
+    size_type='percent',
+    fees=0.001,
+    slippage=0.001,
+    freq="1min",
+    cash_sharing=True
+)
+
+# Движки симуляции: полный vbt.Portfolio или лёгкий симулятор core.simulator
+ENGINES = ("vbt", "native")
@@ -0,0 +1,186 @@
+# core/replay.py
+# Воспроизведение истории из parquet как потока минутных баров (для инкрементального режима стратегий)
+#
+# Запуск: python -m core.replay
+
+import asyncio
+import logging
+import os
+import time
+import numpy as np
+import pandas as pd
+from core.data_loader_bd_vision import read_dataset
+
+REPLAY_PATH = "data/historic"    # хранилище загрузчика, как main.DATA_PATH
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+def read_bars(path=REPLAY_PATH, interval="1m", symbols=None, start=None, end=None, columns=None):
+    """
+    Читает историю в схеме read_archive, упорядоченную по времени.
+
+    Подходит и одиночный файл, и партиционированное хранилище: из него читаются только
+    партиции interval (через read_dataset), чтобы свечи разных интервалов не попали
+    в одни минутные пачки.
+
+    Args:
+        path (str): Parquet-файл или корень хранилища.
+        interval (str): Интервал свечей (только для хранилища).
+        symbols (list, optional): Только эти пары.
+        start (str | pd.Timestamp, optional): Начало периода (включительно).
+        end (str | pd.Timestamp, optional): Конец периода (не включительно).
+        columns (list, optional): Только эти поля (open_time и symbol читаются всегда).
+
+    Returns:
+        pd.DataFrame: Бары в длинном формате (колонки open_time, symbol, ...).
+    """
+    if columns is not None:
+        columns = ["open_time", "symbol"] + [c for c in columns if c not in ("open_time", "symbol")]
+
+    if os.path.isdir(path):
+        df = read_dataset(path, interval, symbols, start, end, columns)
+    else:
+        filters = [("symbol", "in", list(symbols))] if symbols is not None else []
+        filters += [("open_time", ">=", pd.Timestamp(start))] if start is not None else []
+        filters += [("open_time", "<", pd.Timestamp(end))] if end is not None else []
+        df = pd.read_parquet(path, columns=columns, filters=filters or None)
+
+    df["symbol"] = df["symbol"].astype("category")
+    return df.sort_values("open_time", kind="stable", ignore_index=True)
+
+
+def iter_batches(df):
+    """
+    Делит бары на пачки по минутам: в каждой — все символы одного open_time.
+
+    Args:
+        df (pd.DataFrame): Бары в длинном формате (или с индексом (open_time, symbol)).
+
+    Yields:
+        pd.DataFrame: Бары одной минуты.
+    """
+    if isinstance(df.index, pd.MultiIndex):
+        df = df.reset_index()
+    if not df["open_time"].is_monotonic_increasing:
+        df = df.sort_values("open_time", kind="stable", ignore_index=True)
+
+    times = df["open_time"].to_numpy()
+    bounds = np.flatnonzero(times[1:] != times[:-1]) + 1
+    for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(df)]):
+        yield df.iloc[start:stop]
+
+
+async def replay(df, speed=None):
+    """
+    Асинхронный поток минутных пачек баров.
+
+    Args:
+        df (pd.DataFrame): Бары в длинном формате.
+        speed (float, optional): Во сколько раз быстрее реального времени отдавать бары
+            (1 — как на бирже, 60 — минута за секунду). None — без пауз, как можно быстрее.
+
+    Yields:
+        Tuple[pd.DataFrame, float]: пачка баров и момент (time.perf_counter), когда она должна была прийти.
+    """
+    started = time.perf_counter()
+    first_time = None
+
+    for batch in iter_batches(df):
+        open_time = batch["open_time"].iloc[0]
+        if speed is None:
+            due = time.perf_counter()
+            await asyncio.sleep(0)
+        else:
+            first_time = open_time if first_time is None else first_time
+            due = started + (open_time - first_time).total_seconds() / speed
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        yield batch, due
+
+
+def replay_report(latencies, sizes, elapsed):
+    """
+    Сводка прогона: пропускная способность и перцентили задержки минутной пачки.
+
+    Задержка — время пачки целиком: бар становится доступен стратегии только вместе со своей
+    пачкой. Стоимость бара (cost_per_bar_us) — суммарное время пачек, делённое на число баров;
+    это показатель пропускной способности, а не задержки.
+
+    Args:
+        latencies (list): Задержки обработки каждой пачки, с.
+        sizes (list): Число баров (символов) в каждой пачке.
+        elapsed (float): Общее время прогона, с.
+
+    Returns:
+        dict: batches, rows, elapsed_s, batches_per_s, bars_per_s, cost_per_bar_us
+            и latency_p*_us / latency_max_us (на пачку).
+    """
+    latencies = np.asarray(latencies) * 1e6
+    rows = int(np.sum(sizes))
+    report = {
+        "batches": len(latencies),
+        "rows": rows,
+        "elapsed_s": elapsed,
+        "batches_per_s": len(latencies) / elapsed if elapsed else np.nan,
+        "bars_per_s": rows / elapsed if elapsed else np.nan,
+        "cost_per_bar_us": latencies.sum() / rows if rows else np.nan,
+    }
+    for q in LATENCY_PERCENTILES:
+        report[f"latency_p{q}_us"] = np.percentile(latencies, q) if len(latencies) else np.nan
+    report["latency_max_us"] = latencies.max() if len(latencies) else np.nan
+    return report
+
+
+async def run_replay(consumers, df, speed=None):
+    """
+    Прогоняет поток баров через потребителей и меряет задержку.
+
+    Задержка пачки — время от момента, когда она должна была прийти, до окончания
+    её обработки всеми потребителями (при отставании от графика она растёт).
+
+    Args:
+        consumers (list): Функции или корутины от пачки баров, например strategy.update.
+        df (pd.DataFrame): Бары в длинном формате.
+        speed (float, optional): Множитель реального времени (None — как можно быстрее).
+
+    Returns:
+        dict: Отчёт replay_report.
+    """
+    latencies = []
+    sizes = []
+    started = time.perf_counter()
+
+    async for batch, due in replay(df, speed):
+        for consumer in consumers:
+            result = consumer(batch)
+            if asyncio.iscoroutine(result):
+                await result
+        latencies.append(time.perf_counter() - due)
+        sizes.append(len(batch))
+
+    return replay_report(latencies, sizes, time.perf_counter() - started)
+
+
+def main(path=REPLAY_PATH, interval="1m", speed=None):
+    """
+    Воспроизводит историю через инкрементальный режим всех стратегий и печатает отчёт.
+    """
+    from strategies import STRATEGIES
+
+    df = read_bars(path, interval, columns=["close", "volume"])
+    strategies = [strategy(None) for strategy in STRATEGIES]
+    for strategy in strategies:
+        strategy.reset_stream(df["symbol"].cat.categories)
+    logging.info(f"▶️ Воспроизведение {len(df)} баров ({df['symbol'].nunique()} символов), speed={speed}")
+
+    report = asyncio.run(run_replay([strategy.update for strategy in strategies], df, speed))
+    print(f"📈 {report['bars_per_s']:.0f} баров/с ({report['batches_per_s']:.0f} минут/с), "
+          f"{report['cost_per_bar_us']:.1f} мкс обработки на бар")
+    print("⏱️ Задержка минутной пачки: " + ", ".join(
+        f"p{q} {report[f'latency_p{q}_us']:.1f} мкс" for q in LATENCY_PERCENTILES
+    ) + f", max {report['latency_max_us']:.1f} мкс")
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    main()
@@ -0,0 +1,165 @@
+# core/results_store.py
+# Результаты бэктеста в Parquet: стоимость портфеля, сделки и метрики с типизированными колонками
+#
+# Время хранится как timestamp, символы и статусы — как категории, поэтому запись и чтение
+# обходятся без разбора текста. CSV пишется только по запросу (formats=("parquet", "csv")).
+
+import os
+import pandas as pd
+
+RESULTS_DIR = "results"
+RESULT_FORMATS = ("parquet", "csv")
+DEFAULT_FORMATS = ("parquet",)
+
+# Текстовые колонки сделок, которые хранятся категориями
+TRADE_CATEGORIES = ("Column", "Direction", "Status")
+
+# Подпапки results/ по виду результата (метрики стратегии лежат в корне)
+RESULT_SUBDIRS = {"stats": "", "symbols": "stats"}
+
+
+def result_path(kind, name, results_dir=RESULTS_DIR, fmt="parquet"):
+    """
+    Путь к файлу результата.
+
+    Args:
+        kind (str): "cash" (results/cash/{name}_cash), "trades" (results/trades/{name}_trades),
+            "stats" (results/{name}_stats) или "symbols" (results/stats/{name}_symbols).
+        name (str): Короткое имя стратегии.
+        results_dir (str): Папка результатов.
+        fmt (str): "parquet" или "csv".
+
+    Returns:
+        str: Путь к файлу.
+    """
+    return os.path.join(results_dir, RESULT_SUBDIRS.get(kind, kind), f"{name}_{kind}.{fmt}")
+
+
+def _check_formats(formats):
+    unknown = set(formats) - set(RESULT_FORMATS)
+    if unknown:
+        raise ValueError(f"Неизвестный формат результатов: {sorted(unknown)}. Доступны: {RESULT_FORMATS}")
+
+
+def write_value(value, name, results_dir=RESULTS_DIR, formats=DEFAULT_FORMATS):
+    """
+    Сохраняет стоимость портфеля.
+
+    Args:
+        value (pd.Series | pd.DataFrame): Стоимость портфеля во времени.
+        name (str): Короткое имя стратегии.
+        results_dir (str): Папка результатов.
+        formats (tuple): Форматы записи (RESULT_FORMATS).
+
+    Returns:
+        list: Пути записанных файлов.
+    """
+    _check_formats(formats)
+    os.makedirs(os.path.join(results_dir, "cash"), exist_ok=True)
+    frame = value.to_frame() if isinstance(value, pd.Series) else value
+    frame = frame.set_axis([str(col) for col in frame.columns], axis=1)
+
+    paths = []
+    for fmt in formats:
+        path = result_path("cash", name, results_dir, fmt)
+        if fmt == "parquet":
+            frame.to_parquet(path)
+        else:
+            value.to_csv(path)
+        paths.append(path)
+    return paths
+
+
+def write_trades(trades, name, results_dir=RESULTS_DIR, formats=DEFAULT_FORMATS):
+    """
+    Сохраняет сделки (формат records_readable).
+
+    Returns:
+        list: Пути записанных файлов.
+    """
+    _check_formats(formats)
+    os.makedirs(os.path.join(results_dir, "trades"), exist_ok=True)
+
+    paths = []
+    for fmt in formats:
+        path = result_path("trades", name, results_dir, fmt)
+        if fmt == "parquet":
+            typed = trades.astype({col: "category" for col in TRADE_CATEGORIES if col in trades.columns})
+            typed.to_parquet(path, index=False)
+        else:
+            trades.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def write_stats(stats, name, results_dir=RESULTS_DIR, formats=DEFAULT_FORMATS):
+    """
+    Сохраняет метрики стратегии; в Parquet — одной строкой, каждая метрика в своей типизированной колонке.
+
+    Returns:
+        list: Пути записанных файлов.
+    """
+    _check_formats(formats)
+    os.makedirs(results_dir, exist_ok=True)
+
+    paths = []
+    for fmt in formats:
+        path = result_path("stats", name, results_dir, fmt)
+        if fmt == "parquet":
+            frame = pd.DataFrame({str(key): [val] for key, val in stats.items()})
+            frame.to_parquet(path, index=False)
+        else:
+            stats.to_csv(path)
+        paths.append(path)
+    return paths
+
+
+def write_symbol_stats(table, name, results_dir=RESULTS_DIR, formats=DEFAULT_FORMATS):
+    """
+    Сохраняет таблицу метрик по символам (core.symbol_stats.symbol_stats).
+
+    Returns:
+        list: Пути записанных файлов.
+    """
+    _check_formats(formats)
+    os.makedirs(os.path.join(results_dir, RESULT_SUBDIRS["symbols"]), exist_ok=True)
+
+    paths = []
+    for fmt in formats:
+        path = result_path("symbols", name, results_dir, fmt)
+        if fmt == "parquet":
+            table.to_parquet(path)
+        else:
+            table.to_csv(path)
+        paths.append(path)
+    return paths
+
+
+def read_value(path):
+    """
+    Returns:
+        pd.DataFrame: Стоимость портфеля (индекс — время).
+    """
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, memory_map=True)
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+def read_trades(path):
+    """
+    Returns:
+        pd.DataFrame: Сделки в формате records_readable.
+    """
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, memory_map=True)
+    return pd.read_csv(path, parse_dates=["Entry Timestamp", "Exit Timestamp"])
+
+
+def read_stats(path):
+    """
+    Returns:
+        pd.Series: Метрики стратегии (индекс — названия метрик).
+    """
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, memory_map=True).iloc[0]
+    return pd.read_csv(path, index_col=0).iloc[:, 0]
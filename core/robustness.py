@@ -0,0 +1,305 @@
+# core/robustness.py
+# Устойчивость результата бэктеста: бутстреп сделок, перестановка порядка сделок
+# и блочный бутстреп поминутных доходностей — распределения доходности и просадки
+#
+# Случайные выборки делаются пачками NumPy (итерации × сделки или блоки), доходность и просадка
+# каждой траектории — за один проход ядром numba без матрицы капитала; пачки можно раздать
+# пулу процессов. Пачки и их зерна не зависят от числа процессов, поэтому результат
+# при том же seed одинаков для workers=1 и workers=N.
+#
+# Запуск: python cli.py robustness --iterations 10000
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from numba import njit
+from core.metrics import RESULTS_DIR, STRATEGY_NAMES, first_existing, load_equity, result_candidates
+from core.portfolio import PORTFOLIO_KWARGS
+from core.results_store import read_trades
+
+N_ITER = 10_000
+BLOCK_BARS = 1440        # длина блока поминутных доходностей (сутки), сохраняет автокорреляцию внутри дня
+BATCH_ELEMENTS = 1 << 20  # случайных чисел в одной пачке (~8 МБ)
+CI_LEVELS = (0.05, 0.5, 0.95)
+
+# Метод -> что ресэмплируется
+ROBUSTNESS_METHODS = {
+    "trades": "бутстреп PnL сделок с возвращением",
+    "shuffle": "перестановка порядка сделок",
+    "blocks": "блочный бутстреп поминутных доходностей",
+}
+
+SAMPLE_COLUMNS = ("Total Return [%]", "Max Drawdown [%]")
+
+
+@njit(cache=True)
+def _path_step(equity, peak, max_drawdown):
+    if equity > peak:
+        peak = equity
+    drawdown = 1 - equity / peak
+    return peak, max(max_drawdown, drawdown)
+
+
+@njit(cache=True)
+def trade_paths_nb(pnl, index, init_cash):
+    """
+    Доходность и максимальная просадка траекторий капитала из сделок pnl[index[i]], за один проход
+    по каждой траектории (матрица капитала не строится).
+
+    Args:
+        pnl (np.ndarray): PnL сделок.
+        index (np.ndarray): Номера сделок формы (итерации, шаги).
+        init_cash (float): Начальный капитал (первый пик).
+
+    Returns:
+        np.ndarray: Форма (итерации, 2): доходность и просадка в процентах.
+    """
+    n_iter, n_steps = index.shape
+    out = np.empty((n_iter, 2))
+    for i in range(n_iter):
+        equity, peak, max_drawdown = init_cash, init_cash, 0.0
+        for j in range(n_steps):
+            equity += pnl[index[i, j]]
+            peak, max_drawdown = _path_step(equity, peak, max_drawdown)
+        out[i, 0] = (equity / init_cash - 1) * 100
+        out[i, 1] = max_drawdown * 100
+    return out
+
+
+@njit(cache=True)
+def shuffle_paths_nb(pnl, uniforms, init_cash):
+    """
+    То же для сделок в случайном порядке: перестановка Фишера — Йетса по заранее
+    выбранным равномерным числам uniforms (итерации, сделки).
+
+    Returns:
+        np.ndarray: Форма (итерации, 2): доходность и просадка в процентах.
+    """
+    n_iter, n_trades = uniforms.shape
+    out = np.empty((n_iter, 2))
+    order = np.empty(n_trades, dtype=np.int64)
+    for i in range(n_iter):
+        for k in range(n_trades):
+            order[k] = k
+        for k in range(n_trades - 1, 0, -1):
+            j = int(uniforms[i, k] * (k + 1))
+            order[k], order[j] = order[j], order[k]
+
+        equity, peak, max_drawdown = init_cash, init_cash, 0.0
+        for k in range(n_trades):
+            equity += pnl[order[k]]
+            peak, max_drawdown = _path_step(equity, peak, max_drawdown)
+        out[i, 0] = (equity / init_cash - 1) * 100
+        out[i, 1] = max_drawdown * 100
+    return out
+
+
+@njit(cache=True)
+def block_paths_nb(returns, starts, block_bars, init_cash):
+    """
+    То же для кривой из склеенных блоков доходностей returns[start:start + block_bars],
+    обрезанной до длины исходного ряда.
+
+    Args:
+        returns (np.ndarray): Поминутные доходности.
+        starts (np.ndarray): Начала блоков формы (итерации, блоки).
+        block_bars (int): Длина блока.
+        init_cash (float): Начальный капитал.
+
+    Returns:
+        np.ndarray: Форма (итерации, 2): доходность и просадка в процентах.
+    """
+    n_iter, n_blocks = starts.shape
+    n_bars = len(returns)
+    out = np.empty((n_iter, 2))
+    for i in range(n_iter):
+        equity, peak, max_drawdown = init_cash, init_cash, 0.0
+        step = 0
+        for b in range(n_blocks):
+            for k in range(starts[i, b], starts[i, b] + block_bars):
+                if step == n_bars:
+                    break
+                equity *= 1 + returns[k]
+                peak, max_drawdown = _path_step(equity, peak, max_drawdown)
+                step += 1
+        out[i, 0] = (equity / init_cash - 1) * 100
+        out[i, 1] = max_drawdown * 100
+    return out
+
+
+def draw_trades(pnl, n, rng, init_cash, block_bars=None):
+    """
+    Returns:
+        np.ndarray: Метрики n траекторий из сделок, выбранных с возвращением.
+    """
+    return trade_paths_nb(pnl, rng.integers(0, len(pnl), (n, len(pnl))), init_cash)
+
+
+def draw_shuffle(pnl, n, rng, init_cash, block_bars=None):
+    """
+    Returns:
+        np.ndarray: Метрики n траекторий из тех же сделок в случайном порядке
+            (итоговая доходность не меняется, меняется просадка).
+    """
+    return shuffle_paths_nb(pnl, rng.random((n, len(pnl))), init_cash)
+
+
+def draw_blocks(returns, n, rng, init_cash, block_bars=BLOCK_BARS):
+    """
+    Returns:
+        np.ndarray: Метрики n траекторий из склеенных случайных блоков по block_bars доходностей.
+    """
+    n_bars = len(returns)
+    block_bars = min(block_bars, n_bars)
+    n_blocks = -(-n_bars // block_bars)
+    starts = rng.integers(0, n_bars - block_bars + 1, (n, n_blocks))
+    return block_paths_nb(returns, starts, block_bars, init_cash)
+
+
+_DRAWS = {"trades": draw_trades, "shuffle": draw_shuffle, "blocks": draw_blocks}
+
+
+def _run_batch(method, series, n, seed, init_cash, block_bars):
+    return _DRAWS[method](series, n, np.random.default_rng(seed), init_cash, block_bars)
+
+
+def resample(method, series, n_iter=N_ITER, init_cash=PORTFOLIO_KWARGS["init_cash"], block_bars=BLOCK_BARS,
+             seed=0, workers=1):
+    """
+    Распределение доходности и просадки по n_iter ресэмплам.
+
+    Args:
+        method (str): Ключ ROBUSTNESS_METHODS.
+        series (np.ndarray): PnL сделок ("trades", "shuffle") или поминутные доходности ("blocks").
+        n_iter (int): Число итераций.
+        init_cash (float): Начальный капитал.
+        block_bars (int): Длина блока для "blocks".
+        seed (int): Зерно генератора.
+        workers (int): Число процессов (1 — в текущем процессе).
+
+    Returns:
+        pd.DataFrame: Строка на итерацию, колонки SAMPLE_COLUMNS.
+    """
+    if method not in _DRAWS:
+        raise ValueError(f"Неизвестный метод '{method}', доступны: {', '.join(ROBUSTNESS_METHODS)}")
+
+    series = np.ascontiguousarray(series, dtype=np.float64)
+    batch = max(1, BATCH_ELEMENTS // max(len(series), 1))
+    sizes = [min(batch, n_iter - start) for start in range(0, n_iter, batch)]
+    tasks = [
+        (method, series, size, seed_seq, float(init_cash), block_bars)
+        for size, seed_seq in zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes)))
+    ]
+
+    if workers == 1:
+        parts = [_run_batch(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(_run_batch, *zip(*tasks)))
+
+    return pd.DataFrame(np.vstack(parts), columns=list(SAMPLE_COLUMNS))
+
+
+def bar_returns(value, init_cash=PORTFOLIO_KWARGS["init_cash"]):
+    """
+    Returns:
+        np.ndarray: Поминутные доходности портфеля (первая — от начального капитала, как в merge_stats).
+    """
+    value = np.asarray(value, dtype=np.float64)
+    return value / np.r_[init_cash, value[:-1]] - 1
+
+
+def robustness(trades, value=None, n_iter=N_ITER, init_cash=PORTFOLIO_KWARGS["init_cash"], block_bars=BLOCK_BARS,
+               seed=0, workers=1, methods=tuple(ROBUSTNESS_METHODS)):
+    """
+    Прогоняет все методы ресэмплинга для одной стратегии.
+
+    Args:
+        trades (pd.DataFrame): Сделки в формате records_readable (берутся закрытые).
+        value (pd.Series, optional): Стоимость портфеля по барам; без неё метод "blocks" пропускается.
+        n_iter (int): Итераций на метод.
+        init_cash (float): Начальный капитал.
+        block_bars (int): Длина блока для "blocks".
+        seed (int): Зерно генератора.
+        workers (int): Число процессов.
+        methods (tuple): Методы из ROBUSTNESS_METHODS.
+
+    Returns:
+        pd.DataFrame: Выборки с колонками method и SAMPLE_COLUMNS.
+    """
+    pnl = trades.loc[trades["Status"] == "Closed", "PnL"].to_numpy(dtype=np.float64)
+    series = {"trades": pnl, "shuffle": pnl}
+    if value is not None:
+        series["blocks"] = bar_returns(value, init_cash)
+
+    samples = []
+    for method in methods:
+        if method not in series or not len(series[method]):
+            continue
+        part = resample(method, series[method], n_iter, init_cash, block_bars, seed, workers)
+        samples.append(part.assign(method=method))
+
+    columns = ["method", *SAMPLE_COLUMNS]
+    return pd.concat(samples, ignore_index=True)[columns] if samples else pd.DataFrame(columns=columns)
+
+
+def confidence_intervals(samples, levels=CI_LEVELS):
+    """
+    Квантили и среднее распределений по методам.
+
+    Args:
+        samples (pd.DataFrame): Результат robustness.
+        levels (tuple): Уровни квантилей.
+
+    Returns:
+        pd.DataFrame: Индекс (method, metric), колонки mean и квантили (q5, q50, q95 ...);
+            пустой, если выборок нет.
+    """
+    columns = ["mean", *(f"q{level * 100:g}" for level in levels)]
+    if samples.empty:
+        return pd.DataFrame(columns=columns, index=pd.MultiIndex.from_arrays([[], []], names=["method", "metric"]))
+
+    long = samples.melt(id_vars="method", var_name="metric")
+    grouped = long.groupby(["method", "metric"], sort=False)["value"]
+    table = grouped.quantile(list(levels)).unstack()
+    table.columns = columns[1:]
+    table.insert(0, "mean", grouped.mean())
+    return table
+
+
+def run_robustness(strategies=STRATEGY_NAMES, results_dir=RESULTS_DIR, n_iter=N_ITER, block_bars=BLOCK_BARS,
+                   seed=0, workers=1):
+    """
+    Анализ устойчивости по сохранённым результатам бэктеста: выборки —
+    results/robustness/{name}_samples.parquet, доверительные интервалы — results/robustness/{name}_ci.csv.
+
+    Args:
+        strategies (list): Короткие имена стратегий.
+        results_dir (str): Папка результатов.
+        n_iter (int): Итераций на метод.
+        block_bars (int): Длина блока для "blocks".
+        seed (int): Зерно генератора.
+        workers (int): Число процессов.
+    """
+    output_dir = os.path.join(results_dir, "robustness")
+    os.makedirs(output_dir, exist_ok=True)
+
+    for name in strategies:
+        trades_path = first_existing(result_candidates(os.path.join(results_dir, "trades"), f"{name}_trades"))
+        if trades_path is None:
+            print(f"⛔ Нет сделок для {name.upper()} в {results_dir}/trades")
+            continue
+
+        value = load_equity(name, os.path.join(results_dir, "cash"))
+        samples = robustness(read_trades(trades_path), value, n_iter, block_bars=block_bars, seed=seed,
+                             workers=workers)
+        if samples.empty:
+            print(f"⛔ Нет закрытых сделок и стоимости портфеля для {name.upper()} — нечего ресэмплировать")
+            continue
+        table = confidence_intervals(samples)
+
+        samples.to_parquet(os.path.join(output_dir, f"{name}_samples.parquet"), index=False)
+        table.to_csv(os.path.join(output_dir, f"{name}_ci.csv"))
+        print(f"\n🎲 Устойчивость {name.upper()} ({n_iter} итераций на метод):")
+        print(table.round(2))
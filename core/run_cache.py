@@ -0,0 +1,230 @@
+# core/run_cache.py
+# Кеш прогонов бэктеста: стоимость портфеля, сделки и метрики по ключу из содержимого данных,
+# класса стратегии с её параметрами, кода симуляции и её настроек
+#
+# Повторный запуск с теми же данными и параметрами (например, после правки отчёта) берёт результат
+# с диска вместо симуляции. Записи вытесняются по возрасту и суммарному объёму (давно не читанные — первыми).
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import shutil
+import time
+import pandas as pd
+from core.indicator_cache import data_fingerprint
+from core.parallel import PortfolioResult
+from core.portfolio import PORTFOLIO_KWARGS
+from core.results_store import read_stats, read_trades, read_value, result_path, write_stats, write_trades, write_value
+from core.wide_cache import to_wide
+
+RUN_CACHE_DIR = "data/runs"
+RUN_CACHE_MAX_BYTES = 2 * 2 ** 30
+RUN_CACHE_MAX_AGE_DAYS = 30
+META_FILE = "_meta.json"
+
+# Имя результата внутри записи кеша (файлы раскладываются как в results/)
+ENTRY_NAME = "run"
+
+# Атрибуты стратегии, которые не являются её параметрами
+RUNTIME_ATTRIBUTES = ("data", "portfolio", "indicators", "stream_symbols")
+
+# Модули вне strategies, от кода которых зависит результат прогона: индикаторы, стопы,
+# нативный симулятор и сведение блоков символов
+SIMULATION_MODULES = ("core.indicators", "core.stops", "core.simulator", "core.parallel")
+
+
+def strategy_params(strategy):
+    """
+    Параметры экземпляра стратегии: простые публичные атрибуты (окна, пороги, стопы,
+    position_size, init_cash, engine), без данных и состояния.
+
+    Returns:
+        dict: Имя параметра -> значение.
+    """
+    return {
+        name: value for name, value in sorted(vars(strategy).items())
+        if not name.startswith("_") and name not in RUNTIME_ATTRIBUTES
+        and (value is None or isinstance(value, (bool, int, float, str)))
+    }
+
+
+def strategy_source(strategy_class):
+    """
+    Хеш исходного кода стратегии, её базовых классов из пакета strategies и модулей
+    SIMULATION_MODULES: правка generate_signals, индикаторов или симулятора сбрасывает кеш
+    так же, как смена параметров.
+
+    Returns:
+        str: SHA1-хеш.
+    """
+    digest = hashlib.sha1()
+    for cls in strategy_class.__mro__:
+        if cls.__module__.startswith("strategies"):
+            digest.update(inspect.getsource(cls).encode())
+    for module in SIMULATION_MODULES:
+        # Файл читается с диска, без импорта: core.stops тянет за собой numba
+        with open(importlib.util.find_spec(module).origin, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def run_key(strategy_class, df, position_size=0.01, engine=None, portfolio_kwargs=PORTFOLIO_KWARGS, symbol_chunks=1):
+    """
+    Ключ прогона: хеш отпечатка данных, класса стратегии с параметрами и настроек from_signals.
+
+    Последовательный прогон и параллельный с symbol_chunks=1 дают один результат и один ключ;
+    при symbol_chunks > 1 капитал делится между блоками (core.parallel), это другой прогон.
+
+    Args:
+        strategy_class: Класс стратегии (подкласс StrategyBase).
+        df (pd.DataFrame): Данные с индексом (open_time, symbol) или уже широкий DataFrame.
+        position_size (float): Размер позиции в долях.
+        engine (str, optional): Движок симуляции (None — движок стратегии по умолчанию).
+        portfolio_kwargs (dict): Настройки симуляции (init_cash, fees, slippage, ...).
+        symbol_chunks (int): На сколько блоков делились символы (core.parallel.run_parallel).
+
+    Returns:
+        str: SHA1-хеш.
+    """
+    options = {} if engine is None else {"engine": engine}
+    strategy = strategy_class(None, position_size=position_size, **options)
+    df = to_wide(df)
+    numeric = df.dtypes.map(pd.api.types.is_numeric_dtype)
+    fields = tuple(df.columns[numeric.to_numpy()].get_level_values(0).unique())
+
+    payload = {
+        "data": data_fingerprint(df, fields),
+        "strategy": f"{strategy_class.__module__}.{strategy_class.__qualname__}",
+        "source": strategy_source(strategy_class),
+        "params": strategy_params(strategy),
+        "portfolio": portfolio_kwargs,
+        "symbol_chunks": symbol_chunks,
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class RunCache:
+    """
+    Дисковый кеш результатов бэктеста.
+
+    Запись — папка {key}/ с файлами в формате core.results_store; _meta.json пишется последним
+    и служит признаком завершённой записи, время его изменения — временем последнего чтения.
+    """
+
+    def __init__(self, cache_dir=RUN_CACHE_DIR, max_bytes=RUN_CACHE_MAX_BYTES, max_age_days=RUN_CACHE_MAX_AGE_DAYS):
+        """
+        Args:
+            cache_dir (str): Папка кеша.
+            max_bytes (int): Предельный объём всех записей.
+            max_age_days (float): Записи, которые не читались дольше, удаляются.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key):
+        """
+        Returns:
+            PortfolioResult | None: Сохранённый результат или None, если записи нет.
+        """
+        entry = self._entry(key)
+        meta_path = os.path.join(entry, META_FILE)
+        if not os.path.exists(meta_path):
+            self.misses += 1
+            return None
+
+        value = read_value(result_path("cash", ENTRY_NAME, entry))
+        if value.shape[1] == 1:
+            value = value.iloc[:, 0]
+        result = PortfolioResult(
+            value,
+            read_trades(result_path("trades", ENTRY_NAME, entry)),
+            read_stats(result_path("stats", ENTRY_NAME, entry)).rename(None),
+        )
+        os.utime(meta_path)
+        self.hits += 1
+        return result
+
+    def store(self, key, pf):
+        """
+        Сохраняет результат прогона и вытесняет лишние записи.
+
+        Args:
+            key (str): Ключ run_key.
+            pf: vbt.Portfolio или PortfolioResult.
+
+        Returns:
+            PortfolioResult: Тот же результат в облегчённом виде (метрики уже посчитаны).
+        """
+        result = PortfolioResult(pf.value(), pf.trades.records_readable, pf.stats())
+        entry = self._entry(key)
+        shutil.rmtree(entry, ignore_errors=True)
+
+        write_value(result.value(), ENTRY_NAME, entry)
+        write_trades(result.trades.records_readable, ENTRY_NAME, entry)
+        write_stats(result.stats(), ENTRY_NAME, entry)
+        with open(os.path.join(entry, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"key": key, "created": time.time()}, f)
+
+        self.evict()
+        return result
+
+    def entries(self):
+        """
+        Returns:
+            list: (время последнего чтения, объём в байтах, путь) по всем записям, включая незавершённые.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry = self._entry(name)
+            if not os.path.isdir(entry):
+                continue
+            meta_path = os.path.join(entry, META_FILE)
+            files = [os.path.join(root, f) for root, _, names in os.walk(entry) for f in names]
+            size = sum(os.path.getsize(f) for f in files)
+            used = os.path.getmtime(meta_path if os.path.exists(meta_path) else entry)
+            entries.append((used, size, entry))
+        return entries
+
+    def evict(self, now=None):
+        """
+        Удаляет записи старше max_age_days, затем самые давно читанные, пока объём больше max_bytes.
+
+        Returns:
+            list: Пути удалённых записей.
+        """
+        now = time.time() if now is None else now
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+
+        removed = []
+        for used, size, entry in entries:
+            if now - used <= self.max_age_days * 86400 and total <= self.max_bytes:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed.append(entry)
+        return removed
+
+    def stats(self):
+        """
+        Returns:
+            dict: Попадания, промахи, число записей и их объём в МБ.
+        """
+        entries = self.entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "size_mb": round(sum(size for _, size, _ in entries) / 2 ** 20, 2),
+        }
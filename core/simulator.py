@@ -0,0 +1,220 @@
+# core/simulator.py
+# Лёгкий симулятор портфеля по сигналам (long-only, доля от кеша, комиссии, проскальзывание, общий кеш)
+# — замена vbt.Portfolio.from_signals, когда нужны только value(), stats() и сделки
+
+import numpy as np
+import pandas as pd
+from numba import njit
+from core.parallel import PortfolioResult, merge_stats
+
+# Поля записей сделок, которые возвращает ядро
+TRADE_FIELDS = ("col", "size", "entry_idx", "entry_price", "entry_fees", "exit_idx", "exit_price", "exit_fees", "is_open")
+
+# Состояние симуляции между блоками времени: общий кеш, позиции, последние цены и открытые сделки
+STATE_FIELDS = ("cash", "position", "last_price", "open_size", "open_entry_idx", "open_entry_price", "open_entry_fees")
+
+
+def new_state(n_cols, init_cash):
+    """
+    Returns:
+        tuple: Массивы состояния в порядке STATE_FIELDS (кеш — массив из одного элемента).
+    """
+    return (
+        np.array([float(init_cash)]),
+        np.zeros(n_cols),
+        np.full(n_cols, np.nan),
+        np.zeros(n_cols),
+        np.full(n_cols, -1, dtype=np.int64),
+        np.zeros(n_cols),
+        np.zeros(n_cols),
+    )
+
+
+@njit(cache=True)
+def simulate_chunk_nb(close, entries, exits, size, fees, slippage, row_offset,
+                      cash, position, last_price, open_size, open_entry_idx, open_entry_price, open_entry_fees):
+    """
+    Бар за баром, внутри бара — колонки по порядку (как call_seq='default' у vectorbt).
+
+    Вход тратит долю size от текущего общего кеша (вместе с комиссией),
+    выход закрывает позицию целиком. Повторный вход в открытую позицию
+    и одновременные вход и выход игнорируются, бары без цены пропускаются.
+
+    Состояние (STATE_FIELDS) обновляется на месте, поэтому блоки времени можно
+    прогонять по очереди; row_offset — номер первого бара блока во всём ряду.
+
+    Returns:
+        Tuple: стоимость портфеля по барам и массивы полей закрытых в блоке сделок
+            (TRADE_FIELDS без is_open).
+    """
+    n_rows, n_cols = close.shape
+    max_trades = np.sum(entries) + n_cols
+
+    value = np.empty(n_rows)
+    t_col = np.empty(max_trades, dtype=np.int64)
+    t_size = np.empty(max_trades)
+    t_entry_idx = np.empty(max_trades, dtype=np.int64)
+    t_entry_price = np.empty(max_trades)
+    t_entry_fees = np.empty(max_trades)
+    t_exit_idx = np.empty(max_trades, dtype=np.int64)
+    t_exit_price = np.empty(max_trades)
+    t_exit_fees = np.empty(max_trades)
+    n_trades = 0
+
+    for i in range(n_rows):
+        for col in range(n_cols):
+            price = close[i, col]
+            if np.isnan(price):
+                continue
+            last_price[col] = price
+
+            entry = entries[i, col]
+            exit_signal = exits[i, col]
+            if entry and exit_signal:
+                continue
+
+            if position[col] > 0:
+                if exit_signal:
+                    adj_price = price * (1 - slippage)
+                    acq_cash = position[col] * adj_price
+                    fees_paid = acq_cash * fees
+                    cash[0] += acq_cash - fees_paid
+
+                    t = n_trades
+                    t_col[t] = col
+                    t_size[t] = open_size[col]
+                    t_entry_idx[t] = open_entry_idx[col]
+                    t_entry_price[t] = open_entry_price[col]
+                    t_entry_fees[t] = open_entry_fees[col]
+                    t_exit_idx[t] = row_offset + i
+                    t_exit_price[t] = adj_price
+                    t_exit_fees[t] = fees_paid
+                    n_trades += 1
+
+                    position[col] = 0.0
+                    open_entry_idx[col] = -1
+            elif entry and cash[0] > 0:
+                cash_limit = min(cash[0], size * cash[0])
+                adj_price = price * (1 + slippage)
+                req_cash = cash_limit / (1 + fees)
+                position[col] = req_cash / adj_price
+                cash[0] -= cash_limit
+
+                open_size[col] = position[col]
+                open_entry_idx[col] = row_offset + i
+                open_entry_price[col] = adj_price
+                open_entry_fees[col] = cash_limit - req_cash
+
+        asset_value = 0.0
+        for col in range(n_cols):
+            if position[col] != 0:
+                asset_value += position[col] * last_price[col]
+        value[i] = cash[0] + asset_value
+
+    return (
+        value,
+        t_col[:n_trades], t_size[:n_trades], t_entry_idx[:n_trades], t_entry_price[:n_trades],
+        t_entry_fees[:n_trades], t_exit_idx[:n_trades], t_exit_price[:n_trades], t_exit_fees[:n_trades]
+    )
+
+
+def trade_fields(chunks, state, last_row):
+    """
+    Сводит закрытые сделки блоков и открытые позиции из состояния в поля TRADE_FIELDS.
+
+    Открытые позиции оцениваются по последней цене на последнем баре.
+
+    Args:
+        chunks (list): Поля закрытых сделок каждого блока (результат simulate_chunk_nb без value).
+        state (tuple): Состояние симуляции после последнего блока.
+        last_row (int): Номер последнего бара.
+
+    Returns:
+        dict: Поле -> массив.
+    """
+    _, _, last_price, open_size, open_entry_idx, open_entry_price, open_entry_fees = state
+    is_open = np.flatnonzero(open_entry_idx >= 0)
+    n_open = len(is_open)
+
+    opened = (
+        is_open, open_size[is_open], open_entry_idx[is_open], open_entry_price[is_open], open_entry_fees[is_open],
+        np.full(n_open, last_row, dtype=np.int64), last_price[is_open], np.zeros(n_open)
+    )
+    fields = [np.concatenate(parts) for parts in zip(*chunks, opened)]
+    n_closed = len(fields[0]) - n_open
+    fields.append(np.r_[np.zeros(n_closed, dtype=bool), np.ones(n_open, dtype=bool)])
+    return dict(zip(TRADE_FIELDS, fields))
+
+
+def trades_readable(trades, index, columns):
+    """
+    Собирает сделки в формате vbt trades.records_readable.
+
+    Args:
+        trades (dict): Поля сделок (TRADE_FIELDS, см. trade_fields).
+        index (pd.Index): Временной индекс.
+        columns (pd.Index): Колонки (символы).
+
+    Returns:
+        pd.DataFrame: Сделки, упорядоченные по колонке и времени входа.
+    """
+    order = np.lexsort((trades["entry_idx"], trades["col"]))
+    trades = {name: values[order] for name, values in trades.items()}
+
+    entry_value = trades["size"] * trades["entry_price"]
+    pnl = trades["size"] * trades["exit_price"] - entry_value - trades["entry_fees"] - trades["exit_fees"]
+
+    col = trades["col"]
+
+    return pd.DataFrame({
+        "Exit Trade Id": np.arange(len(col)),
+        "Column": columns[col],
+        "Size": trades["size"],
+        "Entry Timestamp": index[trades["entry_idx"]],
+        "Avg Entry Price": trades["entry_price"],
+        "Entry Fees": trades["entry_fees"],
+        "Exit Timestamp": index[trades["exit_idx"]],
+        "Avg Exit Price": trades["exit_price"],
+        "Exit Fees": trades["exit_fees"],
+        "PnL": pnl,
+        "Return": pnl / entry_value,
+        "Direction": "Long",
+        "Status": np.where(trades["is_open"], "Open", "Closed"),
+        # Без накопления каждая позиция — ровно одна сделка
+        "Position Id": np.arange(len(col)),
+    })
+
+
+def simulate_from_signals(price, entries, exits, size, init_cash, fees, slippage, **kwargs):
+    """
+    Симулирует портфель с общим кешем по всем колонкам.
+
+    Принимает те же параметры, что и vbt.Portfolio.from_signals в StrategyBase
+    (size_type='percent', cash_sharing=True); остальные ключи PORTFOLIO_KWARGS игнорируются.
+
+    Args:
+        price (pd.DataFrame): Цены исполнения (индекс — время, колонки — символы).
+        entries (pd.DataFrame): Сигналы входа.
+        exits (pd.DataFrame): Сигналы выхода.
+        size (float): Доля доступного кеша на вход.
+        init_cash (float): Начальный капитал.
+        fees (float): Комиссия с объёма сделки.
+        slippage (float): Проскальзывание цены.
+
+    Returns:
+        PortfolioResult: value(), stats() и trades.records_readable.
+    """
+    state = new_state(price.shape[1], init_cash)
+    value, *fields = simulate_chunk_nb(
+        np.ascontiguousarray(price.to_numpy(dtype=np.float64)),
+        entries.to_numpy(dtype=bool),
+        exits.to_numpy(dtype=bool),
+        float(size),
+        float(fees),
+        float(slippage),
+        0,
+        *state
+    )
+    value = pd.Series(value, index=price.index, name="group")
+    trades = trades_readable(trade_fields([fields], state, len(price) - 1), price.index, price.columns)
+    return PortfolioResult(value, trades, merge_stats(value, trades, init_cash))
@@ -0,0 +1,119 @@
+# core/stops.py
+# Выходы по тейк-профиту, стоп-лоссу и трейлинг-стопу: компилируемое ядро numba по матрице (время × символ)
+
+import numpy as np
+import pandas as pd
+from numba import njit
+from core.portfolio import PORTFOLIO_KWARGS
+
+
+def new_stop_state(n_cols):
+    """
+    Returns:
+        tuple: Состояние автомата по колонкам: в позиции, цена входа (NaN — вход ещё не исполнен),
+            максимум после входа.
+    """
+    return np.zeros(n_cols, dtype=np.bool_), np.zeros(n_cols), np.zeros(n_cols)
+
+
+@njit(cache=True)
+def apply_stops_nb(close, entries, exits, tp_pct, sl_pct, trailing_pct, slippage,
+                   in_position_state, entry_price_state, peak_state):
+    """
+    Проходит каждую колонку как конечный автомат "вне позиции / в позиции".
+
+    Сигналы здесь ещё не сдвинуты: движки исполняют сигнал бара i на баре i + 1.
+    Поэтому вход по сигналу entries исполняется на следующем баре — цена входа берётся
+    с него с проскальзыванием, а если там нет цены, вход пропадает, как в движках.
+    Позиция закрывается исходным сигналом exits или первым сработавшим стопом.
+    Одновременные вход и выход движки игнорируют, поэтому такой бар позицию не закрывает.
+    NaN в параметре стопа отключает его. Состояние автомата (new_stop_state)
+    читается в начале и записывается в конце, чтобы продолжить со следующего блока времени.
+    Достаточно ли кеша на вход, автомат не знает: позиция считается открытой всегда.
+
+    Returns:
+        np.ndarray: Сигналы выхода с добавленными стопами.
+    """
+    n_rows, n_cols = close.shape
+    out = exits.copy()
+
+    for col in range(n_cols):
+        in_position = in_position_state[col]
+        entry_price = entry_price_state[col]
+        peak = peak_state[col]
+
+        for i in range(n_rows):
+            price = close[i, col]
+            entry = entries[i, col]
+            exit_signal = exits[i, col]
+
+            # Бар исполнения входа, поданного на прошлом баре
+            if in_position and np.isnan(entry_price):
+                if np.isnan(price):
+                    in_position = False
+                else:
+                    entry_price = price * (1 + slippage)
+                    peak = price
+
+            if not in_position:
+                if entry and not exit_signal:
+                    in_position = True
+                    entry_price = np.nan
+                continue
+
+            if exit_signal and not entry:
+                in_position = False
+                continue
+            if np.isnan(price):
+                continue
+
+            if price > peak:
+                peak = price
+
+            take_profit_hit = price >= entry_price * (1 + tp_pct)
+            stop_loss_hit = price <= entry_price * (1 - sl_pct)
+            trailing_stop_hit = price <= peak * (1 - trailing_pct)
+
+            if (take_profit_hit or stop_loss_hit or trailing_stop_hit) and not entry:
+                out[i, col] = True
+                in_position = False
+
+        in_position_state[col] = in_position
+        entry_price_state[col] = entry_price
+        peak_state[col] = peak
+
+    return out
+
+
+def apply_stops(close, entries, exits, tp_pct=None, sl_pct=None, trailing_pct=None, state=None,
+                slippage=PORTFOLIO_KWARGS["slippage"]):
+    """
+    Добавляет к сигналам выхода тейк-профит, стоп-лосс и трейлинг-стоп.
+
+    Args:
+        close (pd.DataFrame): Цены закрытия (индекс — время, колонки — символы).
+        entries (pd.DataFrame): Сигналы входа той же формы.
+        exits (pd.DataFrame): Сигналы выхода той же формы.
+        tp_pct (float, optional): Тейк-профит от цены входа (0.05 — +5%).
+        sl_pct (float, optional): Стоп-лосс от цены входа (0.02 — -2%).
+        trailing_pct (float, optional): Трейлинг-стоп от максимума с момента входа (0.03 — -3%).
+        state (tuple, optional): Состояние new_stop_state, продолжаемое с прошлого блока времени
+            (обновляется на месте); по умолчанию — все колонки вне позиции.
+        slippage (float): Проскальзывание цены входа (как в PORTFOLIO_KWARGS).
+
+    Returns:
+        pd.DataFrame: Сигналы выхода со стопами.
+    """
+    as_param = lambda value: np.nan if value is None else float(value)
+
+    out = apply_stops_nb(
+        np.ascontiguousarray(close.to_numpy(dtype=np.float64)),
+        entries.to_numpy(dtype=bool),
+        exits.to_numpy(dtype=bool),
+        as_param(tp_pct),
+        as_param(sl_pct),
+        as_param(trailing_pct),
+        float(slippage),
+        *(new_stop_state(close.shape[1]) if state is None else state)
+    )
+    return pd.DataFrame(out, index=exits.index, columns=exits.columns)
@@ -0,0 +1,233 @@
+# core/streaming.py
+# Инкрементальные индикаторы: O(1) состояние на символ, один шаг — один бар по всем символам
+
+import numpy as np
+import pandas as pd
+from core.wide_cache import to_wide
+
+
+class RollingSum:
+    """
+    Скользящая сумма по окну из window баров.
+
+    Хранит кольцевой буфер последних значений, сумму и число не-NaN значений в окне.
+    NaN в сумму не входят (как в pandas rolling).
+    """
+
+    def __init__(self, n_symbols, window):
+        self.window = window
+        self._buffer = np.full((window, n_symbols), np.nan)
+        self._pos = 0
+        self.sum = np.zeros(n_symbols)
+        self.count = np.zeros(n_symbols, dtype=np.int64)
+
+    def update(self, x, min_periods=1):
+        """
+        Args:
+            x (np.ndarray): Значения нового бара по символам.
+            min_periods (int): Минимум значений в окне, иначе результат NaN.
+
+        Returns:
+            np.ndarray: Сумма окна по символам.
+        """
+        old = self._buffer[self._pos]
+        new_valid = ~np.isnan(x)
+        old_valid = ~np.isnan(old)
+
+        self.sum += np.where(new_valid, x, 0.0) - np.where(old_valid, old, 0.0)
+        self.count += new_valid.astype(np.int64) - old_valid
+        self.sum[self.count == 0] = 0.0
+
+        self._buffer[self._pos] = x
+        self._pos = (self._pos + 1) % self.window
+        return np.where(self.count >= min_periods, self.sum, np.nan)
+
+
+class RollingMean(RollingSum):
+    """
+    Скользящая средняя (как close.rolling(window).mean()).
+    """
+
+    def update(self, x):
+        return super().update(x, min_periods=self.window) / self.window
+
+
+class RollingMoments:
+    """
+    Скользящие среднее и стандартное отклонение (ddof=0) по алгоритму Уэлфорда.
+
+    При сдвиге окна уходящее значение вычитается, новое добавляется,
+    поэтому шаг не зависит от длины окна.
+    """
+
+    def __init__(self, n_symbols, window):
+        self.window = window
+        self._buffer = np.full((window, n_symbols), np.nan)
+        self._pos = 0
+        self.count = np.zeros(n_symbols, dtype=np.int64)
+        self.mean = np.zeros(n_symbols)
+        self._m2 = np.zeros(n_symbols)
+
+    def update(self, x):
+        """
+        Args:
+            x (np.ndarray): Значения нового бара по символам.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: среднее и стандартное отклонение окна (NaN, пока окно неполное).
+        """
+        old = self._buffer[self._pos].copy()
+        self._buffer[self._pos] = x
+        self._pos = (self._pos + 1) % self.window
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Убираем уходящее значение
+            removed = ~np.isnan(old)
+            count = self.count - removed
+            delta = old - self.mean
+            mean = np.where(removed, np.where(count > 0, self.mean - delta / count, 0.0), self.mean)
+            self._m2 = np.where(removed, np.where(count > 0, self._m2 - delta * (old - mean), 0.0), self._m2)
+
+            # Добавляем новое
+            added = ~np.isnan(x)
+            self.count = count + added
+            delta = x - mean
+            self.mean = np.where(added, mean + delta / self.count, mean)
+            self._m2 = np.where(added, self._m2 + delta * (x - self.mean), self._m2)
+
+            full = self.count == self.window
+            std = np.sqrt(np.maximum(self._m2, 0.0) / self.window)
+
+        return np.where(full, self.mean, np.nan), np.where(full, std, np.nan)
+
+
+class WilderRsi:
+    """
+    RSI по Уайлдеру (как core.indicators.rsi): храним прошлую цену и две EMA.
+    """
+
+    def __init__(self, n_symbols, window=14):
+        self.window = window
+        self._alpha = 1 / window
+        self._prev = np.full(n_symbols, np.nan)
+        self._up = np.zeros(n_symbols)
+        self._down = np.zeros(n_symbols)
+        self._bars = 0
+
+    def update(self, close):
+        """
+        Args:
+            close (np.ndarray): Цены закрытия нового бара по символам.
+
+        Returns:
+            np.ndarray: RSI по символам (NaN первые window - 1 баров).
+        """
+        diff = close - self._prev
+        self._prev = close.copy()
+        up = np.where(diff > 0, diff, 0.0)
+        down = np.where(diff < 0, -diff, 0.0)
+
+        if self._bars == 0:
+            self._up, self._down = up, down
+        else:
+            # Та же формула, что у pandas ewm(adjust=False)
+            old_wt = 1 - self._alpha
+            norm = old_wt + self._alpha
+            self._up = (old_wt * self._up + self._alpha * up) / norm
+            self._down = (old_wt * self._down + self._alpha * down) / norm
+        self._bars += 1
+
+        if self._bars < self.window:
+            return np.full(close.shape, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self._down == 0, 100.0, 100 - 100 / (1 + self._up / self._down))
+
+
+def session_bounds(timestamp, anchor="day"):
+    """
+    Начало и конец сессии, в которую попадает бар (см. core.indicators.session_keys).
+
+    Args:
+        timestamp (pd.Timestamp): Время бара.
+        anchor (str): "day" или время начала сессии "HH:MM".
+
+    Returns:
+        Tuple[pd.Timestamp, pd.Timestamp]: начало и конец сессии.
+    """
+    timestamp = pd.Timestamp(timestamp)
+    offset = pd.Timedelta(0) if anchor == "day" else pd.Timedelta(f"{anchor}:00")
+    start = (timestamp - offset).normalize() + offset
+    return start, start + pd.Timedelta(days=1)
+
+
+class SessionVwap:
+    """
+    VWAP (как core.indicators.vwap): накопленные суммы сбрасываются на границе сессии,
+    для числового anchor — скользящие суммы по окну.
+    """
+
+    def __init__(self, n_symbols, anchor="day"):
+        self.anchor = anchor
+        if isinstance(anchor, int):
+            self._pv = RollingSum(n_symbols, anchor)
+            self._v = RollingSum(n_symbols, anchor)
+        else:
+            self._cum_pv = np.zeros(n_symbols)
+            self._cum_v = np.zeros(n_symbols)
+            self._session_start = self._session_end = None
+
+    def update(self, timestamp, close, volume):
+        """
+        Args:
+            timestamp (pd.Timestamp): Время бара.
+            close (np.ndarray): Цены закрытия по символам.
+            volume (np.ndarray): Объёмы по символам.
+
+        Returns:
+            np.ndarray: VWAP по символам.
+        """
+        vol_price = close * volume
+        if isinstance(self.anchor, int):
+            return self._pv.update(vol_price) / self._v.update(volume)
+
+        if self._session_end is None or not self._session_start <= timestamp < self._session_end:
+            self._session_start, self._session_end = session_bounds(timestamp, self.anchor)
+            self._cum_pv[:] = 0.0
+            self._cum_v[:] = 0.0
+
+        self._cum_pv += np.nan_to_num(vol_price)
+        self._cum_v += np.nan_to_num(volume)
+        return np.where(np.isnan(vol_price), np.nan, self._cum_pv) / np.where(np.isnan(volume), np.nan, self._cum_v)
+
+
+def replay_signals(strategy, df):
+    """
+    Прогоняет историю через инкрементальный режим стратегии бар за баром.
+
+    Результат должен совпадать с strategy.generate_signals() на тех же данных.
+
+    Args:
+        strategy (StrategyBase): Стратегия (её состояние потока сбрасывается).
+        df (pd.DataFrame): Данные в длинном или широком формате.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: entries и exits (индекс — время, колонки — символы).
+    """
+    df = to_wide(df)
+    symbols = df.xs("close", level=0, axis=1).columns
+    strategy.reset_stream(symbols)
+
+    fields = {
+        field: df.xs(field, level=0, axis=1).reindex(columns=symbols).to_numpy(dtype=np.float64)
+        for field in strategy.stream_fields
+    }
+    entries = np.zeros((len(df), len(symbols)), dtype=bool)
+    exits = np.zeros_like(entries)
+
+    for i, timestamp in enumerate(df.index):
+        entries[i], exits[i] = strategy.step(timestamp, {field: values[i] for field, values in fields.items()})
+
+    return (
+        pd.DataFrame(entries, index=df.index, columns=symbols),
+        pd.DataFrame(exits, index=df.index, columns=symbols)
+    )
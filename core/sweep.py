@@ -0,0 +1,122 @@
+# core/sweep.py
+# Перебор сетки параметров стратегии за минимальное число симуляций vectorbt
+
+import itertools
+import numpy as np
+import pandas as pd
+from core.portfolio import PORTFOLIO_KWARGS
+from core.wide_cache import to_wide
+
+
+def param_combinations(param_grid):
+    """
+    Разворачивает сетку параметров в список комбинаций.
+
+    Args:
+        param_grid (dict): Имя параметра -> список значений, например {'fast_window': [20, 50]}.
+
+    Returns:
+        Tuple[list, list]: имена параметров и список словарей с комбинациями.
+    """
+    names = list(param_grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+    return names, combos
+
+
+def run_sweep(strategy_class, df, param_grid, position_size=0.01, chunk_size=8, indicators=None):
+    """
+    Прогоняет стратегию по сетке параметров.
+
+    Данные разворачиваются в широкий формат один раз, индикаторы с одинаковыми
+    параметрами считаются один раз (кеш индикаторов), а сигналы всех комбинаций
+    складываются в дополнительные уровни колонок и симулируются одним вызовом
+    vbt.Portfolio.from_signals на каждый блок из chunk_size комбинаций.
+    Каждая комбинация — отдельная группа с общим кешем, как в run_multi_strategy.
+
+    Args:
+        strategy_class: Класс стратегии (подкласс StrategyBase).
+        df (pd.DataFrame): Данные с индексом (open_time, symbol) или уже широкий DataFrame.
+        param_grid (dict): Сетка параметров стратегии.
+        position_size (float): Размер позиции в долях.
+        chunk_size (int): Сколько комбинаций симулировать за один вызов (ограничивает память).
+        indicators (IndicatorCache, optional): Кеш индикаторов (по умолчанию — общий кеш процесса).
+
+    Returns:
+        pd.DataFrame: Таблица с колонками параметров, 'symbol' и метриками.
+    """
+    import vectorbt as vbt
+
+    df_wide = to_wide(df)
+    names, combos = param_combinations(param_grid)
+
+    results = []
+    for start in range(0, len(combos), chunk_size):
+        chunk = combos[start:start + chunk_size]
+
+        prices, entries, exits = [], [], []
+        for params in chunk:
+            strategy = strategy_class(df_wide, position_size=position_size, indicators=indicators, **params)
+            price, chunk_entries, chunk_exits = strategy.prepare_signals()
+            prices.append(price)
+            entries.append(chunk_entries)
+            exits.append(chunk_exits)
+
+        keys = [tuple(p[n] for n in names) if len(names) > 1 else p[names[0]] for p in chunk]
+        stack = lambda frames: pd.concat(frames, axis=1, keys=keys, names=names)
+
+        price = stack(prices)
+
+        # Группы задаём метками колонок без уровня символа: список имён уровней
+        # vectorbt принял бы за сами метки, если его длина совпадёт с числом колонок
+        pf = vbt.Portfolio.from_signals(
+            price,
+            stack(entries),
+            stack(exits),
+            size=position_size,
+            group_by=price.columns.droplevel('symbol'),
+            **PORTFOLIO_KWARGS
+        )
+        results.append(summarize_sweep(pf, names))
+        print(f"🔁 {strategy_class.__name__}: {min(start + chunk_size, len(combos))}/{len(combos)} комбинаций")
+
+    return pd.concat(results, ignore_index=True)
+
+
+def summarize_sweep(pf, names):
+    """
+    Сводит портфель перебора в плоскую таблицу: одна строка на (параметры, символ).
+
+    Метрики по символу считаются из записей сделок (np.bincount по колонкам),
+    метрики портфеля — по группе параметров.
+
+    Args:
+        pf (vbt.Portfolio): Портфель, сгруппированный по уровням параметров.
+        names (list): Имена уровней параметров.
+
+    Returns:
+        pd.DataFrame: Таблица результатов.
+    """
+    columns = pf.wrapper.columns
+    n_columns = len(columns)
+    records = pf.trades.records
+    col = records['col']
+    pnl = records['pnl']
+
+    total_trades = np.bincount(col, minlength=n_columns)
+    wins = np.bincount(col, weights=pnl > 0, minlength=n_columns)
+    total_pnl = np.bincount(col, weights=pnl, minlength=n_columns)
+
+    table = columns.to_frame(index=False)
+    table['Total Trades'] = total_trades
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table['Win Rate [%]'] = np.where(total_trades > 0, wins / total_trades * 100, np.nan)
+    table['PnL'] = total_pnl
+    table['Return [%]'] = total_pnl / PORTFOLIO_KWARGS['init_cash'] * 100
+
+    # При одной комбинации vectorbt возвращает скаляры, поэтому индекс групп задаём явно
+    group_stats = pd.DataFrame({
+        'Portfolio Return [%]': np.atleast_1d(pf.total_return()) * 100,
+        'Sharpe Ratio': np.atleast_1d(pf.sharpe_ratio()),
+        'Max Drawdown [%]': -np.atleast_1d(pf.max_drawdown()) * 100
+    }, index=pf.wrapper.get_columns()).reset_index()
+    return table.merge(group_stats, on=names)
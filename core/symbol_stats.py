@@ -0,0 +1,104 @@
+# core/symbol_stats.py
+# Метрики по каждому символу за один проход: матрица PnL (время × символ) из сделок и цен,
+# дальше — редукции NumPy по осям вместо pf.stats(column=...) на каждую пару
+
+import numpy as np
+import pandas as pd
+from core.parallel import ANN_FACTOR
+from core.portfolio import PORTFOLIO_KWARGS
+
+# Колонки таблицы в порядке вывода
+SYMBOL_STATS_COLUMNS = (
+    "Total Return [%]", "PnL", "Sharpe Ratio", "Sortino Ratio", "Max Drawdown [%]",
+    "Total Trades", "Win Rate [%]", "Profit Factor", "Expectancy",
+)
+
+
+def pnl_matrix(close, trades):
+    """
+    Накопленный PnL каждого символа по барам (реализованный + переоценка открытой позиции).
+
+    Вход списывает стоимость позиции с комиссией, выход возвращает выручку за вычетом комиссии,
+    позиция оценивается по последней известной цене — как value() у vectorbt и core.simulator,
+    поэтому init_cash + сумма по символам совпадает со стоимостью портфеля.
+
+    Args:
+        close (pd.DataFrame): Цены закрытия (индекс — время, колонки — символы).
+        trades (pd.DataFrame): Сделки в формате records_readable.
+
+    Returns:
+        np.ndarray: PnL формы (бары, символы).
+    """
+    n_rows, n_cols = close.shape
+    col = close.columns.get_indexer(trades["Column"])
+    entry_idx = close.index.get_indexer(trades["Entry Timestamp"])
+    exit_idx = close.index.get_indexer(trades["Exit Timestamp"])
+    closed = (trades["Status"] == "Closed").to_numpy()
+    size = trades["Size"].to_numpy(dtype=np.float64)
+
+    cash_flow = np.zeros((n_rows, n_cols))
+    position = np.zeros((n_rows, n_cols))
+    np.add.at(cash_flow, (entry_idx, col), -(size * trades["Avg Entry Price"].to_numpy() + trades["Entry Fees"].to_numpy()))
+    np.add.at(position, (entry_idx, col), size)
+
+    exit_flow = size * trades["Avg Exit Price"].to_numpy() - trades["Exit Fees"].to_numpy()
+    np.add.at(cash_flow, (exit_idx[closed], col[closed]), exit_flow[closed])
+    np.add.at(position, (exit_idx[closed], col[closed]), -size[closed])
+
+    price = close.ffill().to_numpy(dtype=np.float64)
+    holding = np.cumsum(position, axis=0)
+    asset_value = np.where(holding != 0, holding * np.nan_to_num(price), 0.0)
+    return np.cumsum(cash_flow, axis=0) + asset_value
+
+
+def symbol_stats(close, trades, init_cash=PORTFOLIO_KWARGS["init_cash"]):
+    """
+    Таблица метрик по символам: доходность, Sharpe, Sortino, просадка и статистика сделок.
+
+    Кривая символа — init_cash плюс его накопленный PnL, то есть вклад пары в общий портфель
+    при том же капитале; формулы совпадают с core.parallel.merge_stats.
+
+    Args:
+        close (pd.DataFrame): Цены закрытия (индекс — время, колонки — символы).
+        trades (pd.DataFrame): Сделки в формате records_readable.
+        init_cash (float): Начальный капитал портфеля.
+
+    Returns:
+        pd.DataFrame: Строка на символ, колонки SYMBOL_STATS_COLUMNS.
+    """
+    n_cols = close.shape[1]
+    equity = init_cash + pnl_matrix(close, trades)
+    prev = np.vstack([np.full((1, n_cols), float(init_cash)), equity[:-1]])
+    returns = equity / prev - 1
+    drawdown = 1 - equity / np.maximum.accumulate(equity, axis=0)
+
+    col = close.columns.get_indexer(trades["Column"])
+    pnl = trades["PnL"].to_numpy(dtype=np.float64)
+    closed = (trades["Status"] == "Closed").to_numpy()
+    count = lambda mask: np.bincount(col[mask], minlength=n_cols)
+    total = lambda mask: np.bincount(col[mask], weights=pnl[mask], minlength=n_cols)
+
+    n_closed = count(closed)
+    n_wins, n_losses = count(closed & (pnl > 0)), count(closed & (pnl < 0))
+    gross_win, gross_loss = total(closed & (pnl > 0)), total(closed & (pnl < 0))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        win_rate = np.where(n_closed > 0, n_wins / n_closed, np.nan)
+        avg_win = np.where(n_wins > 0, gross_win / n_wins, 0.0)
+        avg_loss = np.where(n_losses > 0, gross_loss / n_losses, 0.0)
+        downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2, axis=0))
+
+        table = pd.DataFrame({
+            "Total Return [%]": (equity[-1] / init_cash - 1) * 100,
+            "PnL": equity[-1] - init_cash,
+            "Sharpe Ratio": returns.mean(axis=0) / returns.std(axis=0, ddof=1) * np.sqrt(ANN_FACTOR),
+            "Sortino Ratio": returns.mean(axis=0) / downside * np.sqrt(ANN_FACTOR),
+            "Max Drawdown [%]": drawdown.max(axis=0) * 100,
+            "Total Trades": np.bincount(col, minlength=n_cols),
+            "Win Rate [%]": win_rate * 100,
+            # inf — только при выигрышах без проигрышей; без закрытых сделок метрики нет
+            "Profit Factor": np.where(n_losses > 0, gross_win / np.abs(gross_loss), np.where(n_wins > 0, np.inf, np.nan)),
+            "Expectancy": win_rate * avg_win + (1 - win_rate) * avg_loss,
+        }, index=pd.Index(close.columns, name="Symbol"))
+
+    return table.loc[:, list(SYMBOL_STATS_COLUMNS)]
@@ -0,0 +1,253 @@
+# core/walk_forward.py
+# Walk-forward оптимизация: подбор параметров на обучающем окне и проверка на следующем тестовом,
+# склейка out-of-sample кривой капитала по всем фолдам
+#
+# Индикаторы и сигналы каждой комбинации параметров считаются один раз по всей истории
+# (они причинные — бар видит только прошлое) и режутся по окнам, поэтому пересекающиеся
+# обучающие окна ничего не пересчитывают. Сигналы и цены передаются воркерам через memmap,
+# фолды симулируются параллельно.
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from core.parallel import attach_frame, share_frame
+from core.portfolio import PORTFOLIO_KWARGS
+from core.sweep import param_combinations
+from core.wide_cache import to_wide
+
+# 30 дней обучения и 7 дней проверки на минутных барах
+TRAIN_BARS = 43_200
+TEST_BARS = 10_080
+
+# Метрика выбора параметров на обучающем окне (больше — лучше)
+WF_METRIC = "Sharpe Ratio"
+
+# Цены и сигналы, подключённые в процессе-воркере (заполняется в _init_worker)
+_FOLD_DATA = {}
+
+
+def walk_forward_folds(n_rows, train_bars=TRAIN_BARS, test_bars=TEST_BARS, anchored=False):
+    """
+    Разбивает историю на фолды: обучающее окно и следующее за ним тестовое.
+
+    Тестовые окна идут подряд без пересечений; обучающее окно скользит за ними
+    (anchored=False) или всегда начинается с первого бара (anchored=True).
+
+    Args:
+        n_rows (int): Число баров.
+        train_bars (int): Баров в обучающем окне (для anchored — в первом).
+        test_bars (int): Баров в тестовом окне (последнее может быть короче).
+        anchored (bool): Расширяющееся обучающее окно вместо скользящего.
+
+    Returns:
+        list: Кортежи (train_start, train_stop, test_start, test_stop) — границы [start, stop).
+    """
+    folds = []
+    for test_start in range(train_bars, n_rows, test_bars):
+        train_start = 0 if anchored else test_start - train_bars
+        folds.append((train_start, test_start, test_start, min(test_start + test_bars, n_rows)))
+    return folds
+
+
+def window_signals(price, entries, exits, start, stop, stops):
+    """
+    Готовит цены и сигналы окна [start, stop) так же, как StrategyBase.prepare_signals:
+    стопы (портфель на входе в окно пуст) и сдвиг на бар — вход на первом баре окна
+    может дать сигнал последнего бара перед ним.
+
+    Args:
+        price (pd.DataFrame): Цены закрытия всей истории.
+        entries (np.ndarray): Сигналы входа всей истории (без сдвига).
+        exits (np.ndarray): Сигналы выхода всей истории (без сдвига).
+        start (int): Первый бар окна.
+        stop (int): Бар после последнего.
+        stops (tuple): (tp_pct, sl_pct, trailing_pct) стратегии.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: price, entries, exits окна.
+    """
+    first = max(start - 1, 0)
+    window = price.iloc[first:stop]
+    window_entries = pd.DataFrame(entries[first:stop], index=window.index, columns=window.columns)
+    window_exits = pd.DataFrame(exits[first:stop], index=window.index, columns=window.columns)
+
+    if any(stop_pct is not None for stop_pct in stops):
+        from core.stops import apply_stops
+        window_exits = apply_stops(window, window_entries, window_exits, *stops)
+
+    offset = start - first
+    return (
+        window.iloc[offset:],
+        window_entries.shift(1, fill_value=False).iloc[offset:],
+        window_exits.shift(1, fill_value=False).iloc[offset:],
+    )
+
+
+def simulate_window(combo, start, stop, position_size, init_cash, engine="native"):
+    """
+    Симулирует комбинацию параметров на окне по данным воркера.
+
+    Returns:
+        PortfolioResult | vbt.Portfolio | None: Портфель или None, если в окне нет сигналов.
+    """
+    entries, exits, stops = _FOLD_DATA["signals"][combo]
+    price, entries, exits = window_signals(_FOLD_DATA["price"], entries, exits, start, stop, stops)
+    if not entries.to_numpy().any() and not exits.to_numpy().any():
+        return None
+
+    if engine == "native":
+        from core.simulator import simulate_from_signals
+    else:
+        import vectorbt as vbt
+        simulate_from_signals = vbt.Portfolio.from_signals
+
+    return simulate_from_signals(price, entries, exits, size=position_size, **{**PORTFOLIO_KWARGS, "init_cash": init_cash})
+
+
+def liquidation_cost(trades, fees=PORTFOLIO_KWARGS["fees"], slippage=PORTFOLIO_KWARGS["slippage"]):
+    """
+    Издержки закрытия открытых позиций по последней цене: продажа с проскальзыванием и комиссией,
+    как при выходе по сигналу.
+
+    Args:
+        trades (pd.DataFrame): Сделки в формате records_readable (открытые оценены по последней цене).
+        fees (float): Комиссия в долях.
+        slippage (float): Проскальзывание в долях.
+
+    Returns:
+        float: На сколько стоимость портфеля после продажи меньше оценки по рынку.
+    """
+    opened = trades[trades["Status"] == "Open"]
+    market_value = (opened["Size"] * opened["Avg Exit Price"]).sum()
+    return float(market_value * (1 - (1 - slippage) * (1 - fees)))
+
+
+def _init_worker(price_meta, signal_files):
+    _FOLD_DATA["price"] = attach_frame(price_meta)
+    _FOLD_DATA["signals"] = [
+        (np.load(entries_path, mmap_mode="r"), np.load(exits_path, mmap_mode="r"), stops)
+        for entries_path, exits_path, stops in signal_files
+    ]
+
+
+def _run_fold(fold, position_size, init_cash, metric, engine):
+    train_start, train_stop, test_start, test_stop = fold
+
+    scores = []
+    for combo in range(len(_FOLD_DATA["signals"])):
+        pf = simulate_window(combo, train_start, train_stop, position_size, init_cash, engine)
+        scores.append(float(pf.stats()[metric]) if pf is not None else np.nan)
+
+    scores = np.array(scores)
+    best = int(np.nanargmax(scores)) if np.isfinite(scores).any() else None
+    pf = simulate_window(best, test_start, test_stop, position_size, init_cash, engine) if best is not None else None
+
+    if pf is None:
+        # Без сигналов (или без подходящих параметров) капитал на тестовом окне не меняется
+        index = _FOLD_DATA["price"].index[test_start:test_stop]
+        return {"best": best, "score": np.nan, "value": pd.Series(float(init_cash), index=index, name="group"),
+                "trades": 0}
+
+    # Следующий фолд начинается без позиций: открытые позиции продаются на последнем баре окна
+    trades = pf.trades.records_readable
+    value = pf.value().copy()
+    value.iloc[-1] -= liquidation_cost(trades)
+    return {"best": best, "score": scores[best], "value": value, "trades": len(trades)}
+
+
+def walk_forward(strategy_class, df, param_grid, train_bars=TRAIN_BARS, test_bars=TEST_BARS, anchored=False,
+                 position_size=0.01, metric=WF_METRIC, max_workers=None, engine="native", indicators=None):
+    """
+    Walk-forward оптимизация стратегии по сетке параметров.
+
+    На каждом фолде все комбинации симулируются на обучающем окне, комбинация с лучшей
+    метрикой проверяется на тестовом. Тестовые кривые склеиваются с переносом капитала:
+    каждый фолд начинается с капитала, которым закончился предыдущий. Фолд начинается
+    без позиций, поэтому открытые в конце теста позиции закрываются на его последнем баре
+    с комиссией и проскальзыванием (liquidation_cost), а не переносятся по рыночной оценке.
+
+    Args:
+        strategy_class: Класс стратегии (подкласс StrategyBase).
+        df (pd.DataFrame): Данные с индексом (open_time, symbol) или уже широкий DataFrame.
+        param_grid (dict): Сетка параметров стратегии (как у core.sweep.run_sweep).
+        train_bars (int): Баров в обучающем окне.
+        test_bars (int): Баров в тестовом окне.
+        anchored (bool): Расширяющееся обучающее окно вместо скользящего.
+        position_size (float): Размер позиции в долях.
+        metric (str): Метрика stats() для выбора параметров (больше — лучше).
+        max_workers (int, optional): Число процессов (1 — в текущем процессе, None — по числу ядер).
+        engine (str): Движок симуляции: "native" (core.simulator) или "vbt".
+        indicators (IndicatorCache, optional): Кеш индикаторов (по умолчанию — общий кеш процесса).
+
+    Returns:
+        Tuple[pd.Series, pd.DataFrame]: Склеенная out-of-sample стоимость портфеля и таблица фолдов
+            (границы окон, выбранные параметры, метрика на обучении, доходность и сделки на тесте).
+    """
+    df_wide = to_wide(df)
+    price = df_wide.xs("close", axis=1, level=0)
+    folds = walk_forward_folds(len(price), train_bars, test_bars, anchored)
+    if not folds:
+        raise ValueError(f"История из {len(price)} баров короче обучающего окна ({train_bars} баров)")
+
+    names, combos = param_combinations(param_grid)
+    init_cash = PORTFOLIO_KWARGS["init_cash"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Сигналы каждой комбинации — один раз по всей истории, в .npy для memmap в воркерах
+        signal_files = []
+        for i, params in enumerate(combos):
+            strategy = strategy_class(df_wide, position_size=position_size, indicators=indicators, **params)
+            entries, exits = strategy.generate_signals()
+            paths = (os.path.join(tmp, f"entries_{i}.npy"), os.path.join(tmp, f"exits_{i}.npy"))
+            np.save(paths[0], entries.reindex(columns=price.columns).fillna(False).to_numpy(dtype=bool))
+            np.save(paths[1], exits.reindex(columns=price.columns).fillna(False).to_numpy(dtype=bool))
+            signal_files.append((*paths, (strategy.tp_pct, strategy.sl_pct, strategy.trailing_pct)))
+        print(f"🧭 {strategy_class.__name__}: сигналы {len(combos)} комбинаций готовы, {len(folds)} фолдов")
+
+        price_meta = share_frame(price, tmp)
+        args = (position_size, init_cash, metric, engine)
+        if max_workers == 1:
+            _init_worker(price_meta, signal_files)
+            results = [_run_fold(fold, *args) for fold in folds]
+            _FOLD_DATA.clear()
+        else:
+            with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(price_meta, signal_files)) as pool:
+                results = list(pool.map(_run_fold, folds, *[[arg] * len(folds) for arg in args]))
+
+    return stitch_folds(price.index, folds, results, combos, names, init_cash, metric)
+
+
+def stitch_folds(index, folds, results, combos, names, init_cash, metric):
+    """
+    Склеивает тестовые окна в одну кривую капитала и собирает таблицу фолдов.
+
+    Последнее значение каждого окна уже за вычетом закрытия открытых позиций (_run_fold),
+    так что следующий фолд стартует с капитала, реально доступного без позиций.
+
+    Returns:
+        Tuple[pd.Series, pd.DataFrame]: Стоимость портфеля и таблица фолдов.
+    """
+    capital = float(init_cash)
+    values, rows = [], []
+    for number, ((train_start, train_stop, test_start, test_stop), result) in enumerate(zip(folds, results)):
+        value = result["value"] * (capital / init_cash)
+        test_return = (value.iloc[-1] / capital - 1) * 100
+        capital = float(value.iloc[-1])
+        values.append(value)
+
+        params = combos[result["best"]] if result["best"] is not None else dict.fromkeys(names)
+        rows.append({
+            "fold": number,
+            "train_start": index[train_start],
+            "train_end": index[train_stop - 1],
+            "test_start": index[test_start],
+            "test_end": index[test_stop - 1],
+            **params,
+            f"Train {metric}": result["score"],
+            "Test Return [%]": test_return,
+            "Test Trades": result["trades"],
+        })
+
+    return pd.concat(values).rename("group"), pd.DataFrame(rows)
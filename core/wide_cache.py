@@ -0,0 +1,136 @@
+# core/wide_cache.py
+# Кеш широких матриц (время × поле × символ) в .npy, открываемом через memmap
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+WIDE_CACHE_DIR = "data/wide"
+META_FILE = "_meta.json"
+VALUES_FILE = "values.npy"
+CACHE_VERSION = 2                 # формат кеша; старые версии пересобираются
+
+
+def dataset_fingerprint(path, **extra):
+    """
+    Отпечаток исходных данных: пути, размеры и время изменения всех parquet-файлов.
+
+    Args:
+        path (str): Файл или папка с parquet-данными.
+        **extra: Дополнительные параметры, влияющие на содержимое (например, interval).
+
+    Returns:
+        str: SHA1-хеш.
+    """
+    path = str(path)
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(path)
+            for name in names if name.endswith(".parquet")
+        )
+    else:
+        files = [path]
+
+    digest = hashlib.sha1()
+    for file in files:
+        stat = os.stat(file)
+        digest.update(f"{os.path.relpath(file, path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    digest.update(json.dumps(extra, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def to_wide(df):
+    """
+    Разворачивает длинный формат (open_time, symbol) в колонки (field, symbol).
+    Уже широкий DataFrame возвращается как есть.
+    """
+    return df.unstack('symbol') if isinstance(df.index, pd.MultiIndex) else df
+
+
+def save_wide(df_wide, cache_dir, fingerprint):
+    """
+    Сохраняет числовые поля широкой матрицы одним массивом values.npy формы (время, поле, символ).
+
+    Все поля приводятся к float64 (int32 и float32 представимы в нём точно): один dtype
+    даёт один блок pandas. Поля и символы сортируются, чтобы колонки (field, symbol)
+    были лексикографически упорядочены и выбор поля в load_wide был срезом — view на memmap.
+    Файл _meta.json пишется последним и служит признаком завершённой записи.
+
+    Args:
+        df_wide (pd.DataFrame): Данные с колонками (field, symbol).
+        cache_dir (str): Папка кеша.
+        fingerprint (str): Отпечаток исходных данных.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path = os.path.join(cache_dir, META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    numeric = df_wide.select_dtypes("number")
+    fields = sorted(numeric.columns.get_level_values(0).unique())
+    symbols = numeric.columns.get_level_values("symbol").unique().sort_values()
+
+    np.save(os.path.join(cache_dir, "index.npy"), numeric.index.to_numpy(dtype="datetime64[ns]"))
+    values = np.lib.format.open_memmap(
+        os.path.join(cache_dir, VALUES_FILE), mode="w+", dtype="float64",
+        shape=(len(numeric), len(fields), len(symbols))
+    )
+    for i, field in enumerate(fields):
+        values[:, i, :] = numeric[field].reindex(columns=symbols).to_numpy(dtype="float64")
+    values.flush()
+    del values
+
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": CACHE_VERSION,
+            "fingerprint": fingerprint,
+            "fields": fields,
+            "symbols": [str(s) for s in symbols],
+            "index_name": numeric.index.name,
+        }, f)
+
+
+def load_wide(cache_dir, fingerprint=None, fields=None):
+    """
+    Открывает кеш широких матриц без копирования (memmap).
+
+    Возвращаемый DataFrame — один блок поверх values.npy: df['close'] и
+    df.xs('close', axis=1, level=0) тоже остаются view на файл.
+
+    Args:
+        cache_dir (str): Папка кеша.
+        fingerprint (str, optional): Ожидаемый отпечаток; при несовпадении кеш считается устаревшим.
+        fields (list, optional): Только эти поля (по умолчанию — все); порядок — как в кеше.
+            Поля, идущие в кеше не подряд, выбираются копией.
+
+    Returns:
+        pd.DataFrame | None: Данные с колонками (field, symbol) или None, если кеша нет или он устарел.
+    """
+    meta_path = os.path.join(cache_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != CACHE_VERSION:
+        return None
+    if fingerprint is not None and meta["fingerprint"] != fingerprint:
+        return None
+
+    index = pd.DatetimeIndex(np.load(os.path.join(cache_dir, "index.npy")), name=meta["index_name"])
+    symbols = pd.CategoricalIndex(meta["symbols"], name="symbol")
+
+    fields = [field for field in meta["fields"] if fields is None or field in fields]
+    positions = [meta["fields"].index(field) for field in fields]
+    if positions == list(range(positions[0], positions[0] + len(positions))):
+        positions = slice(positions[0], positions[0] + len(positions))
+
+    values = np.load(os.path.join(cache_dir, VALUES_FILE), mmap_mode="r")[:, positions, :]
+    return pd.DataFrame(
+        values.reshape(len(index), -1),
+        index=index,
+        columns=pd.MultiIndex.from_product([fields, symbols], names=[None, "symbol"]),
+        copy=False
+    )
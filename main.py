@@ -60,18 +60,45 @@ import os
 import pandas as pd
 import logging
 from strategies import STRATEGIES
-from core.backtester import run_multi_strategy
+from core.backtester import run_multi_strategy, save_value
+from core.results_store import DEFAULT_FORMATS, result_path, write_stats, write_symbol_stats, write_trades, write_value
+from core.symbol_stats import symbol_stats
+from core.parallel import run_parallel
+from core.run_cache import RunCache, run_key
+from core.data_loader_bd_vision import read_dataset
+from core.wide_cache import WIDE_CACHE_DIR, dataset_fingerprint, load_wide, save_wide, to_wide
+from core.sweep import run_sweep
+from core.indicator_cache import DEFAULT_CACHE, INDICATOR_CACHE_DIR
+from core.portfolio import PORTFOLIO_KWARGS
+
+# === Пути к данным ===
+DATA_PATH = "data/historic"
+LEGACY_DATA_PATH = "data/historic_data.parquet"
+
+# === Сетки параметров для перебора ===
+SWEEP_GRIDS = {
+    "sma": {"fast_window": [20, 50, 100], "slow_window": [200, 400]},
+    "rsi": {"rsi_period": [7, 14, 21], "bb_period": [20, 40], "bb_std": [2, 2.5]},
+    "vwap": {"threshold": [0.003, 0.005, 0.01]},
+}
 
 # === Настройка логгера ===
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
-def collect_stats_by_symbol(pf, filename_prefix: str):
+def collect_stats_by_symbol(pf, filename_prefix: str, formats=DEFAULT_FORMATS, close=None):
     if pf is None:
         print(f"⚠️ Портфель для стратегии {filename_prefix.upper()} не был создан.")
         return
 
     stats = pf.stats()
-    stats.to_csv(f"results/{filename_prefix}_stats.csv")
+    write_stats(stats, filename_prefix, formats=formats)
+
+    # Метрики по каждой паре — одним проходом по матрице PnL, без pf.stats(column=...)
+    if close is not None:
+        table = symbol_stats(close, pf.trades.records_readable, stats["Start Value"])
+        write_symbol_stats(table, filename_prefix, formats=formats)
+        print(f"\n🏆 Топ-5 пар по доходности ({filename_prefix.upper()}):")
+        print(table["Total Return [%]"].nlargest(5).round(2))
 
     if "Total Return [%]" in stats.index:
         print(f"\n📈 Доходность по стратегии ({filename_prefix.upper()}): {stats['Total Return [%]']:.2f}%")
@@ -81,22 +108,46 @@ def collect_stats_by_symbol(pf, filename_prefix: str):
         print(f"\n⚠️ В stats нет метрики 'Total Return [%]'. Доступные метрики: {stats.index.tolist()}")
 
 
-def save_trades(pf, filename_prefix: str):
+def save_trades(pf, filename_prefix: str, formats=DEFAULT_FORMATS):
     if pf is None:
         print(f"⚠️ Портфель для {filename_prefix.upper()} не создан, трейды не сохраняем.")
         return
 
-    trades_df = pf.trades.records_readable
-    os.makedirs("results/trades", exist_ok=True)
-    trades_df.to_csv(f"results/trades/{filename_prefix}_trades.csv", index=False)
-    print(f"💾 Трейды для {filename_prefix.upper()} сохранены в results/trades/{filename_prefix}_trades.csv")
+    paths = write_trades(pf.trades.records_readable, filename_prefix, formats=formats)
+    print(f"💾 Трейды для {filename_prefix.upper()} сохранены в {', '.join(paths)}")
+
+
+def load_data(path=DATA_PATH, interval="1m", symbols=None, start=None, end=None, columns=None):
+    """
+    Загружает историю из партиционированного хранилища (interval=.../symbol=.../month=...).
 
+    Фильтры передаются в pyarrow: лишние партиции символов и месяцев не открываются,
+    а row group вне [start, end) отсекаются по статистике open_time.
+    Если хранилища нет, читает одиночный файл LEGACY_DATA_PATH.
 
-def load_data():
-    path = "data/historic_data.parquet"
+    Args:
+        path (str): Корень хранилища Parquet.
+        interval (str): Интервал свечей.
+        symbols (list, optional): Только эти пары.
+        start (str | pd.Timestamp, optional): Начало периода (включительно).
+        end (str | pd.Timestamp, optional): Конец периода (не включительно).
+        columns (list, optional): Только эти поля (open_time и symbol читаются всегда).
+
+    Returns:
+        pd.DataFrame: Данные с индексом (open_time, symbol).
+    """
+    if columns is not None:
+        columns = ["open_time", "symbol"] + [c for c in columns if c not in ("open_time", "symbol")]
 
     try:
-        df = pd.read_parquet(path)
+        if os.path.isdir(path):
+            df = read_dataset(path, interval, symbols, start, end, columns)
+        else:
+            path = LEGACY_DATA_PATH
+            filters = [("symbol", "in", list(symbols))] if symbols is not None else []
+            filters += [("open_time", ">=", pd.Timestamp(start))] if start is not None else []
+            filters += [("open_time", "<", pd.Timestamp(end))] if end is not None else []
+            df = pd.read_parquet(path, columns=columns, filters=filters or None)
     except FileNotFoundError:
         raise FileNotFoundError(f"❌ Файл {path} не найден. Сначала запусти скрипт загрузки данных.")
 
@@ -111,6 +162,7 @@ def load_data():
 
     # Удаляем строки, где нет времени или символа
     df = df.dropna(subset=["open_time", "symbol"])
+    df["symbol"] = df["symbol"].astype("category")
 
     # Устанавливаем MultiIndex
     df = df.set_index(["open_time", "symbol"]).sort_index()
@@ -125,18 +177,208 @@ def load_data():
 
 
 
-def run_strategy(strategy, df):
+def load_wide_data(path=DATA_PATH, interval="1m", cache_dir=WIDE_CACHE_DIR, fields=None):
+    """
+    Загружает данные сразу в широком формате (field, symbol) через кеш матриц.
+
+    Если исходные parquet-файлы не менялись, матрицы открываются из cache_dir
+    через memmap — без декодирования parquet и без unstack. Иначе данные читаются
+    load_data, разворачиваются один раз и сохраняются в кеш.
+
+    Args:
+        path (str): Корень хранилища Parquet.
+        interval (str): Интервал свечей.
+        cache_dir (str): Корень кеша широких матриц.
+        fields (list, optional): Только эти поля (например, ['close', 'volume']).
+
+    Returns:
+        pd.DataFrame: Данные с колонками (field, symbol).
+    """
+    source = path if os.path.exists(path) else LEGACY_DATA_PATH
+    if not os.path.exists(source):
+        return to_wide(load_data(path, interval))
+
+    fingerprint = dataset_fingerprint(source, interval=interval)
+    cache_dir = os.path.join(cache_dir, interval)
+
+    df_wide = load_wide(cache_dir, fingerprint, fields)
+    if df_wide is not None:
+        logging.info(f"⚡ Широкие матрицы взяты из кеша: {cache_dir}")
+        return df_wide
+
+    df_wide = to_wide(load_data(path, interval))
+    save_wide(df_wide, cache_dir, fingerprint)
+    logging.info(f"💾 Широкие матрицы сохранены в кеш: {cache_dir}")
+    return load_wide(cache_dir, fingerprint, fields)
+
+
+def run_strategy(strategy, df, engine=None, formats=DEFAULT_FORMATS, run_cache=None):
     print(f"🚀 Запуск {strategy.name.upper()}...")
-    pf = run_multi_strategy(strategy, df)
-    collect_stats_by_symbol(pf, strategy.name)
-    save_trades(pf, strategy.name)
+    key = run_key(strategy, df, engine=engine) if run_cache is not None else None
+    pf = cached_run(run_cache, key, strategy, formats)
+    if pf is None:
+        pf = run_multi_strategy(strategy, df, engine=engine, formats=formats)
+        if pf is not None and run_cache is not None:
+            pf = run_cache.store(key, pf)
+    collect_stats_by_symbol(pf, strategy.name, formats, to_wide(df)["close"])
+    save_trades(pf, strategy.name, formats)
     print(f"✅ {str(strategy)} завершена\n")
 
 
-def main():
-    df = load_data()
+def cached_run(run_cache, key, strategy, formats=DEFAULT_FORMATS):
+    """
+    Берёт прогон из кеша (core.run_cache) и сохраняет его стоимость портфеля в results/cash,
+    как это сделал бы run_multi_strategy.
+
+    Ключ (run_key) считается вызывающим один раз на стратегию и им же используется для store:
+    отпечаток данных и исходников стратегии не пересчитывается.
+
+    Returns:
+        PortfolioResult | None: Результат или None, если кеш выключен или записи нет.
+    """
+    if run_cache is None:
+        return None
+
+    pf = run_cache.load(key)
+    if pf is not None:
+        print(f"⚡ {strategy.name.upper()}: результат взят из кеша прогонов")
+        save_value(pf.value(), strategy.name, formats)
+    return pf
+
+
+def run_sweeps(df, grids=None):
+    """
+    Перебирает параметры каждой стратегии и сохраняет таблицы в results/sweeps/{name}_sweep.csv.
+
+    Args:
+        df (pd.DataFrame): Данные с индексом (open_time, symbol).
+        grids (dict, optional): Сетки параметров по имени стратегии (по умолчанию SWEEP_GRIDS).
+    """
+    grids = SWEEP_GRIDS if grids is None else grids
+    df_wide = to_wide(df)
+    os.makedirs("results/sweeps", exist_ok=True)
+
     for strategy in STRATEGIES:
-        run_strategy(strategy, df)
+        if strategy.name not in grids:
+            continue
+        print(f"🔁 Перебор параметров {strategy.name.upper()}...")
+        table = run_sweep(strategy, df_wide, grids[strategy.name])
+        table.to_csv(f"results/sweeps/{strategy.name}_sweep.csv", index=False)
+        print(f"💾 Результаты перебора сохранены в results/sweeps/{strategy.name}_sweep.csv")
+
+
+def run_walk_forwards(df, grids=None, train_bars=None, test_bars=None, anchored=False, workers=None):
+    """
+    Walk-forward оптимизация каждой стратегии по её сетке (core.walk_forward): склеенная
+    out-of-sample стоимость портфеля — results/walk_forward/{name}_oos.parquet,
+    параметры по фолдам — results/walk_forward/{name}_folds.csv.
+
+    Args:
+        df (pd.DataFrame): Данные с индексом (open_time, symbol) или уже широкий DataFrame.
+        grids (dict, optional): Сетки параметров по имени стратегии (по умолчанию SWEEP_GRIDS).
+        train_bars (int, optional): Баров в обучающем окне (по умолчанию core.walk_forward.TRAIN_BARS).
+        test_bars (int, optional): Баров в тестовом окне (по умолчанию core.walk_forward.TEST_BARS).
+        anchored (bool): Расширяющееся обучающее окно вместо скользящего.
+        workers (int, optional): Число процессов для фолдов.
+    """
+    from core.walk_forward import TEST_BARS, TRAIN_BARS, walk_forward
+
+    grids = SWEEP_GRIDS if grids is None else grids
+    df_wide = to_wide(df)
+    os.makedirs("results/walk_forward", exist_ok=True)
+
+    for strategy in STRATEGIES:
+        if strategy.name not in grids:
+            continue
+        print(f"🧭 Walk-forward {strategy.name.upper()}...")
+        equity, folds = walk_forward(
+            strategy, df_wide, grids[strategy.name], train_bars or TRAIN_BARS, test_bars or TEST_BARS,
+            anchored=anchored, max_workers=workers
+        )
+        equity.to_frame().to_parquet(f"results/walk_forward/{strategy.name}_oos.parquet")
+        folds.to_csv(f"results/walk_forward/{strategy.name}_folds.csv", index=False)
+        total = (equity.iloc[-1] / PORTFOLIO_KWARGS["init_cash"] - 1) * 100
+        print(f"📈 Out-of-sample доходность {strategy.name.upper()} за {len(folds)} фолдов: {total:.2f}%")
+        print(f"💾 Результаты сохранены в results/walk_forward/{strategy.name}_*")
+
+
+def run_strategy_chunked(strategy, df, chunk_bars, formats=DEFAULT_FORMATS):
+    """
+    Прогоняет стратегию блоками по времени (core.chunked): стоимость портфеля пишется
+    в results/cash по мере расчёта, метрики по символам не считаются — им нужна вся матрица.
+    df — memmap из кеша широких матриц (load_wide_data): окна блоков берутся его срезами,
+    вся история в память не читается.
+    """
+    print(f"🚀 Запуск {strategy.name.upper()} блоками по {chunk_bars} баров...")
+    from core.chunked import run_chunked
+
+    os.makedirs("results/cash", exist_ok=True)
+    pf = run_chunked(strategy, df, chunk_bars, value_path=result_path("cash", strategy.name))
+    if pf is not None and "csv" in formats:
+        write_value(pf.value(), strategy.name, formats=("csv",))
+    collect_stats_by_symbol(pf, strategy.name, formats)
+    save_trades(pf, strategy.name, formats)
+    print(f"✅ {str(strategy)} завершена\n")
+
+
+def main(workers=1, symbol_chunks=1, engine="vbt", formats=DEFAULT_FORMATS, chunk_bars=None, cache=True):
+    """
+    Запускает все стратегии.
+
+    Args:
+        workers (int, optional): Число процессов; 1 — последовательный запуск в текущем процессе,
+            None — по числу ядер.
+        symbol_chunks (int): На сколько блоков делить символы при параллельном запуске; при > 1
+            каждый блок торгует своей долей капитала — это не тот же бэктест, что один общий портфель.
+        engine (str): Движок симуляции: "vbt" или "native" (core.simulator).
+        formats (tuple): Форматы результатов: по умолчанию только Parquet, ("parquet", "csv") — ещё и CSV.
+        chunk_bars (int, optional): Считать блоками по столько баров (движок "native", последовательно) —
+            для истории, которая не помещается в память целиком.
+        cache (bool): Брать прогоны с теми же данными и параметрами из кеша (core.run_cache);
+            режим chunk_bars кеш не использует.
+    """
+    df = load_wide_data()
+    DEFAULT_CACHE.disk_dir = INDICATOR_CACHE_DIR
+
+    if chunk_bars is not None:
+        for strategy in STRATEGIES:
+            run_strategy_chunked(strategy, df, chunk_bars, formats)
+        return
+
+    run_cache = RunCache() if cache else None
+
+    if workers == 1:
+        for strategy in STRATEGIES:
+            run_strategy(strategy, df, engine, formats, run_cache)
+        print(f"🧮 Кеш индикаторов: {DEFAULT_CACHE.stats()}")
+        if run_cache is not None:
+            print(f"🗄️ Кеш прогонов: {run_cache.stats()}")
+        return
+
+    if symbol_chunks > 1 and PORTFOLIO_KWARGS["cash_sharing"]:
+        print(f"⚠️ Символы делятся на {symbol_chunks} блок(а): каждый блок торгует своей долей капитала, "
+              f"результат отличается от одного портфеля с общим капиталом (в метриках — 'Symbol Chunks')")
+
+    keys = {
+        strategy: run_key(strategy, df, engine=engine, symbol_chunks=symbol_chunks) if run_cache is not None else None
+        for strategy in STRATEGIES
+    }
+    results = {strategy: cached_run(run_cache, keys[strategy], strategy, formats) for strategy in STRATEGIES}
+    pending = [strategy for strategy, pf in results.items() if pf is None]
+    if pending:
+        print(f"🚀 Параллельный запуск {len(pending)} стратегий ({symbol_chunks} блок(а) символов)...")
+        computed = run_parallel(pending, df, max_workers=workers, symbol_chunks=symbol_chunks, engine=engine)
+        for strategy, pf in computed.items():
+            if pf is not None:
+                save_value(pf.value(), strategy.name, formats)
+                if run_cache is not None:
+                    pf = run_cache.store(keys[strategy], pf)
+            results[strategy] = pf
+
+    for strategy, pf in results.items():
+        collect_stats_by_symbol(pf, strategy.name, formats, df["close"])
+        save_trades(pf, strategy.name, formats)
+        print(f"✅ {strategy.__name__} завершена\n")
 
 
 if __name__ == "__main__":
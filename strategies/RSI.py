@@ -27,11 +27,14 @@ class RsiBbStrategy(StrategyBase):
 """
 
 
-import pandas as pd
-from ta.momentum import RSIIndicator
-from ta.volatility import BollingerBands
+from core.indicators import rsi, bollinger_bands
+from core.streaming import RollingMoments, WilderRsi
 from strategies.base_strategy import StrategyBase
 
+# EMA Уайлдера помнит всю историю: через 50 периодов вес начального значения
+# (1 - 1/period)^(50 * period) меньше машинной точности
+RSI_WARMUP_PERIODS = 50
+
 class RsiBbStrategy(StrategyBase):
     name = "rsi"
     """
@@ -62,6 +65,10 @@ class RsiBbStrategy(StrategyBase):
         self.bb_period = bb_period
         self.bb_std = bb_std
 
+    @property
+    def warmup_bars(self):
+        return max(RSI_WARMUP_PERIODS * self.rsi_period, self.bb_period)
+
     def generate_signals(self):
         """
         Генерирует сигналы входа и выхода на основе RSI и Bollinger Bands.
@@ -73,15 +80,32 @@ class RsiBbStrategy(StrategyBase):
         """
         close = self.data.xs('close', level=0, axis=1)
 
-        entries = pd.DataFrame(False, index=close.index, columns=close.columns)
-        exits = pd.DataFrame(False, index=close.index, columns=close.columns)
-
-        for symbol in close.columns:
-            rsi = RSIIndicator(close=close[symbol], window=self.rsi_period).rsi()
-            bb = BollingerBands(close=close[symbol], window=self.bb_period, window_dev=self.bb_std)
+        # RSI и полосы считаются сразу по всем символам, без цикла по колонкам
+        rsi_values = self.indicator("rsi", lambda window: rsi(close, window), window=self.rsi_period)
+        _, hband, lband = self.indicator(
+            "bbands",
+            lambda window, window_dev: bollinger_bands(close, window, window_dev),
+            window=self.bb_period,
+            window_dev=self.bb_std
+        )
 
-            entries[symbol] = (rsi < 30) & (close[symbol] < bb.bollinger_lband())
-            exits[symbol] = (rsi > 70) & (close[symbol] > bb.bollinger_hband())
+        entries = (rsi_values < 30) & (close < lband)
+        exits = (rsi_values > 70) & (close > hband)
 
         return entries, exits
 
+    def init_stream(self, n_symbols):
+        self._rsi = WilderRsi(n_symbols, self.rsi_period)
+        self._bbands = RollingMoments(n_symbols, self.bb_period)
+
+    def step(self, timestamp, bars):
+        """
+        Один бар инкрементального режима: RSI по Уайлдеру и полосы через скользящие моменты.
+        """
+        close = bars['close']
+        rsi_values = self._rsi.update(close)
+        mavg, mstd = self._bbands.update(close)
+
+        entries = (rsi_values < 30) & (close < mavg - self.bb_std * mstd)
+        exits = (rsi_values > 70) & (close > mavg + self.bb_std * mstd)
+        return entries, exits
@@ -32,8 +32,10 @@ class VwapReversionStrategy(StrategyBase):
 
 
 # VwapReversionStrategy (мультиформат)
+import numpy as np
+from core.indicators import vwap
+from core.streaming import SessionVwap, session_bounds
 from strategies.base_strategy import StrategyBase
-import pandas as pd
 
 class VwapReversionStrategy(StrategyBase):
     name = "vwap"
@@ -46,12 +48,29 @@ class VwapReversionStrategy(StrategyBase):
     Args:
         data (pd.DataFrame): Мультиформатный DataFrame с колонками уровня 'close' и 'volume'.
         threshold (float, optional): Порог отклонения от VWAP для входа в сделку. По умолчанию 0.005 (0.5%).
+        anchor (str | int, optional): Якорь сессии VWAP: "day" (полночь UTC), "HH:MM" (начало сессии)
+            или число баров для скользящего VWAP. По умолчанию "day".
         **kwargs: Дополнительные параметры для базового класса StrategyBase.
     """
 
-    def __init__(self, data, threshold=0.005, **kwargs):
+    stream_fields = ("close", "volume")
+
+    def __init__(self, data, threshold=0.005, anchor="day", **kwargs):
         super().__init__(data, **kwargs)
         self.threshold = threshold
+        self.anchor = anchor
+
+    def warmup_start(self, index, start):
+        """
+        Окно начинается с сессии предыдущего бара: накопленный VWAP сбрасывается только
+        на её границе, а сигнал сдвинут на бар. Для числового anchor — скользящее окно плюс бар.
+        """
+        if start == 0:
+            return 0
+        if isinstance(self.anchor, int):
+            return max(0, start - self.anchor)
+        session_start, _ = session_bounds(index[start - 1], self.anchor)
+        return int(index.searchsorted(session_start))
 
     def generate_signals(self):
         """
@@ -65,34 +84,38 @@ class VwapReversionStrategy(StrategyBase):
         close = self.data.xs('close', level=0, axis=1)
         volume = self.data.xs('volume', level=0, axis=1)
 
-        # Инициализация пустых таблиц сигналов
-        entries = pd.DataFrame(False, index=close.index, columns=close.columns)
-        exits = pd.DataFrame(False, index=close.index, columns=close.columns)
+        # VWAP по всем символам сразу, со сбросом на границе сессии
+        vwap_values = self.indicator(
+            "vwap",
+            lambda anchor: vwap(close, volume, anchor),
+            inputs=("close", "volume"),
+            anchor=self.anchor
+        )
 
-        # Проходим по каждому символу
-        for symbol in close.columns:
-            symbol_close = close[symbol]
-            symbol_volume = volume[symbol]
+        # Вход — цена ниже VWAP на порог, выход — цена выше или равна VWAP
+        entry_signal = close < vwap_values * (1 - self.threshold)
+        exit_signal = close >= vwap_values
 
-            # Приводим индекс времени к дате для расчёта внутридневного VWAP
-            day_index = symbol_close.index.get_level_values('open_time').normalize()
+        # Сдвигаем сигналы на 1 бар вперёд (реакция на следующий бар)
+        entries = entry_signal.shift(1, fill_value=False)
+        exits = exit_signal.shift(1, fill_value=False)
 
-            # Считаем накопленную сумму "цена * объем" и объема
-            cum_vol_price = (symbol_close * symbol_volume).groupby(day_index).cumsum()
-            cum_vol = symbol_volume.groupby(day_index).cumsum()
-
-            # Вычисляем VWAP
-            vwap = cum_vol_price / cum_vol
-
-            # Генерация сигналов:
-            # Вход — цена ниже VWAP на порог
-            entry_signal = symbol_close < vwap * (1 - self.threshold)
+        return entries, exits
 
-            # Выход — цена выше или равна VWAP
-            exit_signal = symbol_close >= vwap
+    def init_stream(self, n_symbols):
+        self._vwap = SessionVwap(n_symbols, self.anchor)
+        self._prev_entries = np.zeros(n_symbols, dtype=bool)
+        self._prev_exits = np.zeros(n_symbols, dtype=bool)
 
-            # Сдвигаем сигналы на 1 бар вперёд (реакция на следующий бар)
-            entries[symbol] = entry_signal.shift(1, fill_value=False)
-            exits[symbol] = exit_signal.shift(1, fill_value=False)
+    def step(self, timestamp, bars):
+        """
+        Один бар инкрементального режима. Как и в generate_signals, сигналы
+        отдаются с задержкой в 1 бар: возвращаются условия предыдущего бара.
+        """
+        close = bars['close']
+        vwap_values = self._vwap.update(timestamp, close, bars['volume'])
 
+        entries, exits = self._prev_entries, self._prev_exits
+        self._prev_entries = close < vwap_values * (1 - self.threshold)
+        self._prev_exits = close >= vwap_values
         return entries, exits
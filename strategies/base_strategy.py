@@ -53,7 +53,10 @@ class StrategyBase(ABC):
 
 
 from abc import ABC, abstractmethod
-import vectorbt as vbt
+import numpy as np
+import pandas as pd
+from core.indicator_cache import DEFAULT_CACHE, data_fingerprint
+from core.portfolio import ENGINES, PORTFOLIO_KWARGS
 
 
 class StrategyBase(ABC):
@@ -63,17 +66,77 @@ class StrategyBase(ABC):
     Все пользовательские стратегии должны реализовать метод generate_signals().
     После генерации сигналов можно запускать бэктест с помощью run_backtest(),
     и затем извлекать метрики с помощью get_metrics().
+
+    Для живой торговли есть инкрементальный режим: update() принимает бары
+    одной минуты и возвращает сигналы только для них. Стратегия хранит O(1)
+    состояние на символ (init_stream) и считает один бар в step().
     """
 
-    def __init__(self, data, position_size=0.01):
+    # Поля бара, нужные инкрементальному режиму
+    stream_fields = ("close",)
+
+    # Сколько баров истории нужно индикаторам перед блоком времени (core.chunked)
+    warmup_bars = 0
+
+    def __init__(self, data, position_size=0.01, indicators=None, init_cash=PORTFOLIO_KWARGS['init_cash'],
+                 tp_pct=None, sl_pct=None, trailing_pct=None, engine="vbt"):
         """
         Args:
             data (pd.DataFrame): Исторические данные с мультиколонками (уровень 0: 'close', 'volume', и т.д., уровень 1: symbol).
             position_size (float): Размер позиции в процентах от капитала (например, 0.01 для 1%).
+            indicators (IndicatorCache, optional): Кеш индикаторов (по умолчанию — общий кеш процесса).
+                Одинаковые индикаторы на одних и тех же данных считаются один раз,
+                в том числе между экземплярами стратегий и перебором параметров.
+            init_cash (float): Начальный капитал портфеля.
+            tp_pct (float, optional): Тейк-профит от цены входа (например, 0.05 для +5%).
+            sl_pct (float, optional): Стоп-лосс от цены входа (например, 0.02 для -2%).
+            trailing_pct (float, optional): Трейлинг-стоп от максимума после входа.
+            engine (str): Движок симуляции: "vbt" (vbt.Portfolio) или "native" (core.simulator —
+                те же value(), stats() и сделки без импорта vectorbt).
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Неизвестный движок '{engine}', доступны: {', '.join(ENGINES)}")
+
         self.data = data
         self.portfolio = None
         self.position_size = position_size
+        self.indicators = DEFAULT_CACHE if indicators is None else indicators
+        self.init_cash = init_cash
+        self.tp_pct = tp_pct
+        self.sl_pct = sl_pct
+        self.trailing_pct = trailing_pct
+        self.engine = engine
+        self.stream_symbols = None
+
+    def indicator(self, name, func, inputs=("close",), **params):
+        """
+        Возвращает индикатор из кеша или считает его через func(**params).
+
+        Args:
+            name (str): Имя индикатора (например, 'sma', 'rsi').
+            func (Callable): Функция расчёта индикатора.
+            inputs (tuple): Поля данных, от которых зависит индикатор (входят в ключ кеша).
+            **params: Параметры индикатора.
+
+        Returns:
+            Any: Результат func(**params).
+        """
+        fingerprint = data_fingerprint(self.data, inputs)
+        return self.indicators.get_or_compute(name, params, fingerprint, func)
+
+    def warmup_start(self, index, start):
+        """
+        Первый бар, с которого нужно считать сигналы, чтобы сигналы на баре start
+        совпали с расчётом по всей истории (используется блочным бэктестом core.chunked).
+
+        Args:
+            index (pd.DatetimeIndex): Время всех баров.
+            start (int): Номер первого бара блока.
+
+        Returns:
+            int: Номер первого бара окна с прогревом.
+        """
+        return max(0, start - self.warmup_bars)
 
     @abstractmethod
     def generate_signals(self):
@@ -85,37 +148,118 @@ class StrategyBase(ABC):
         """
         pass
 
-    def run_backtest(self):
+    def init_stream(self, n_symbols):
         """
-        Запускает бэктест стратегии на основе сигналов.
+        Создаёт состояние инкрементального режима (скользящие суммы, EMA и т.д.).
+
+        Args:
+            n_symbols (int): Число символов в потоке.
+        """
+        raise NotImplementedError(f"{type(self).__name__} не поддерживает инкрементальный режим")
+
+    def step(self, timestamp, bars):
+        """
+        Обрабатывает один бар по всем символам.
+
+        Args:
+            timestamp (pd.Timestamp): Время бара (open_time).
+            bars (dict): Поле -> np.ndarray значений по stream_symbols (NaN — бара нет).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: entries и exits для этого бара — то же,
+                что строка generate_signals() на этом времени.
+        """
+        raise NotImplementedError(f"{type(self).__name__} не поддерживает инкрементальный режим")
+
+    def reset_stream(self, symbols=None):
+        """
+        Сбрасывает состояние инкрементального режима.
+
+        Args:
+            symbols (Iterable, optional): Символы потока (по умолчанию — символы из self.data).
+        """
+        if symbols is None:
+            symbols = self.data.xs('close', axis=1, level=0).columns
+        self.stream_symbols = pd.Index(symbols, name="symbol")
+        self.init_stream(len(self.stream_symbols))
+
+    def update(self, bar_batch):
+        """
+        Инкрементальный режим: принимает бары одной минуты и возвращает сигналы только для них.
+
+        Состояние создаётся при первом вызове: символы берутся из self.data,
+        а если данных нет — из первой пачки баров. Символы вне потока игнорируются,
+        отсутствующие в пачке считаются пропусками (как NaN в широкой матрице).
+
+        Args:
+            bar_batch (pd.DataFrame): Бары одной минуты в схеме read_archive
+                (колонки open_time, symbol, close, volume, ...).
+
+        Returns:
+            Tuple[pd.Series, pd.Series]: entries и exits по символам потока.
+        """
+        if self.stream_symbols is None:
+            self.reset_stream(None if self.data is not None else bar_batch["symbol"].unique())
+
+        positions = self.stream_symbols.get_indexer(bar_batch["symbol"])
+        known = positions >= 0
+        bars = {}
+        for field in self.stream_fields:
+            values = np.full(len(self.stream_symbols), np.nan)
+            values[positions[known]] = bar_batch[field].to_numpy(dtype=np.float64)[known]
+            bars[field] = values
+
+        entries, exits = self.step(bar_batch["open_time"].iloc[0], bars)
+        return pd.Series(entries, index=self.stream_symbols), pd.Series(exits, index=self.stream_symbols)
+
+    def prepare_signals(self):
+        """
+        Готовит цены и сигналы к симуляции: заполняет пропуски, добавляет выходы
+        по стопам (если заданы tp_pct / sl_pct / trailing_pct) и сдвигает сигналы на 1 бар.
 
-        Создаёт объект vectorbt.Portfolio и сохраняет его в self.portfolio.
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: price, entries, exits.
         """
         price = self.data.xs('close', axis=1, level=0)
         entries, exits = self.generate_signals()
-
         entries = entries.fillna(False)
         exits = exits.fillna(False)
 
+        if any(stop is not None for stop in (self.tp_pct, self.sl_pct, self.trailing_pct)):
+            # numba подгружается только когда стопы действительно нужны
+            from core.stops import apply_stops
+            exits = apply_stops(price, entries, exits, self.tp_pct, self.sl_pct, self.trailing_pct)
+
+        entries = entries.shift(1, fill_value=False)
+        exits = exits.shift(1, fill_value=False)
+        return price, entries, exits
+
+    def run_backtest(self):
+        """
+        Запускает бэктест стратегии на основе сигналов.
+
+        Создаёт портфель выбранным движком (vectorbt.Portfolio или PortfolioResult)
+        и сохраняет его в self.portfolio.
+        """
+        price, entries, exits = self.prepare_signals()
+
         if not entries.any().any() and not exits.any().any():
             print("⚠️ Нет сигналов входа/выхода. Пропускаем стратегию.")
             self.portfolio = None
             return
 
-        entries = entries.shift(1, fill_value=False)
-        exits = exits.shift(1, fill_value=False)
+        if self.engine == "native":
+            from core.simulator import simulate_from_signals
+        else:
+            import vectorbt as vbt
+            simulate_from_signals = vbt.Portfolio.from_signals
 
-        self.portfolio = vbt.Portfolio.from_signals(
+        self.portfolio = simulate_from_signals(
             price,
             entries,
             exits,
-            init_cash=10_000,
-            size_type='percent',
             size=self.position_size,
-            fees=0.001,
-            slippage=0.001,
-            freq="1min",
-            cash_sharing=True
+            **{**PORTFOLIO_KWARGS, 'init_cash': self.init_cash}
         )
 
     def get_metrics(self):
@@ -12,8 +12,9 @@ class SmaCrossoverStrategy(StrategyBase):
     def generate_signals(self):
         df = self.data.copy()
         close = df['close']
-        fast_ma = close.rolling(self.fast_window).mean()
-        slow_ma = close.rolling(self.slow_window).mean()
+        sma = lambda window: close.rolling(window).mean()
+        fast_ma = self.indicator("sma", sma, window=self.fast_window)
+        slow_ma = self.indicator("sma", sma, window=self.slow_window)
 
         entries = (fast_ma > slow_ma) & (fast_ma.shift(1) <= slow_ma.shift(1))
 
@@ -52,24 +53,49 @@ class SmaCrossoverStrategy(StrategyBase):
 
 # strategies/sma.py
 
+from core.streaming import RollingMean
 from strategies.base_strategy import StrategyBase
+import numpy as np
 import pandas as pd
 
 
 class SmaCrossoverStrategy(StrategyBase):
     name = "sma"
 
-    def __init__(self, data, fast_window=50, slow_window=200, **kwargs):
-        super().__init__(data, **kwargs)
+    def __init__(self, data, fast_window=50, slow_window=200, tp_pct=0.05, trailing_pct=0.03, **kwargs):
+        super().__init__(data, tp_pct=tp_pct, trailing_pct=trailing_pct, **kwargs)
         self.fast_window = fast_window
         self.slow_window = slow_window
 
+    @property
+    def warmup_bars(self):
+        # Сигнал на баре start сравнивает средние на start и start - 1: средней на start - 1
+        # нужны бары с start - window, поэтому окно — window баров до start плюс сам start
+        return max(self.fast_window, self.slow_window)
+
     def generate_signals(self):
         close = self.data.xs('close', axis=1, level=0)
-        fast_ma = close.rolling(self.fast_window).mean()
-        slow_ma = close.rolling(self.slow_window).mean()
+        sma = lambda window: close.rolling(window).mean()
+        fast_ma = self.indicator("sma", sma, window=self.fast_window)
+        slow_ma = self.indicator("sma", sma, window=self.slow_window)
 
         entries = (fast_ma > slow_ma) & (fast_ma.shift(1) <= slow_ma.shift(1))
         exits = (fast_ma < slow_ma) & (fast_ma.shift(1) >= slow_ma.shift(1))
 
         return entries, exits
+
+    def init_stream(self, n_symbols):
+        self._fast = RollingMean(n_symbols, self.fast_window)
+        self._slow = RollingMean(n_symbols, self.slow_window)
+        self._prev_fast = np.full(n_symbols, np.nan)
+        self._prev_slow = np.full(n_symbols, np.nan)
+
+    def step(self, timestamp, bars):
+        fast_ma = self._fast.update(bars['close'])
+        slow_ma = self._slow.update(bars['close'])
+
+        entries = (fast_ma > slow_ma) & (self._prev_fast <= self._prev_slow)
+        exits = (fast_ma < slow_ma) & (self._prev_fast >= self._prev_slow)
+
+        self._prev_fast, self._prev_slow = fast_ma, slow_ma
+        return entries, exits
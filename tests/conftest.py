@@ -0,0 +1,137 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+import pytest
+import core.data_loader_bd_vision as loader
+
+SYMBOLS = ["ETHBTC", "BNBBTC"]
+PERIODS = ["2025-01", "2025-02", "2025-03-01", "2025-03-02", "2025-03-03"]
+
+
+def make_klines(period, volume, rows=3):
+    """
+    Создаёт CSV свечей Binance: январь 2025 — время в миллисекундах (как до перехода на микросекунды), далее — в микросекундах.
+    """
+    start = pd.Timestamp(period if len(period) == 10 else f"{period}-01")
+    scale = 1000 if start.year >= 2025 and start.month > 1 else 1
+    lines = []
+    for i in range(rows):
+        open_ms = int((start + pd.Timedelta(minutes=i)).timestamp() * 1000)
+        lines.append(f"{open_ms * scale},1,2,0.5,1.5,{volume},{(open_ms + 59999) * scale},10,5,1,1,0")
+    return "\n".join(lines) + "\n"
+
+
+def url_path(symbol, period, interval="1m"):
+    return loader.archive_url(symbol, interval, period, base_url="")
+
+
+def make_zip(name, text):
+    """
+    Создаёт zip-архив в памяти с одним CSV-файлом.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr(name, text)
+    return buffer.getvalue()
+
+
+def write_store(df, interval, month, store_dir):
+    """
+    Записывает свечи в хранилище так же, как загрузчик: каждый символ — zip-архивом Binance
+    (время в миллисекундах) через write_symbol_month. Недостающие цены берутся из close, объёмы — нули.
+    """
+    store_dir = str(store_dir)
+    loader.clear_month(interval, month, store_dir)
+
+    with tempfile.TemporaryDirectory() as archive_dir:
+        for symbol, symbol_df in df.groupby("symbol", sort=False, observed=True):
+            klines = pd.DataFrame({
+                column: symbol_df[column].to_numpy() if column in symbol_df else 0
+                for column in loader.KLINE_COLUMNS
+            })
+            for column in ("open", "high", "low"):
+                if column not in symbol_df:
+                    klines[column] = klines["close"]
+            klines["open_time"] = symbol_df["open_time"].to_numpy(dtype="datetime64[ms]").astype("int64")
+            klines["close_time"] = klines["open_time"] + 59_999
+
+            name = loader.archive_name(symbol, interval, month)
+            zip_path = os.path.join(archive_dir, name)
+            with open(zip_path, "wb") as f:
+                f.write(make_zip(name.replace(".zip", ".csv"), klines.to_csv(header=False, index=False)))
+            loader.write_symbol_month([zip_path], symbol, interval, month, store_dir)
+
+
+class FakeVision(BaseHTTPRequestHandler):
+    """
+    Локальная замена data.binance.vision: отдаёт файлы из словаря files,
+    поддерживает Range и может ответить ошибкой 500 на первые запросы (failures).
+    """
+    files = {}
+    failures = {}
+    requests_log = []
+
+    def do_GET(self):
+        self.requests_log.append((self.path, self.headers.get("Range")))
+
+        if self.failures.get(self.path, 0) > 0:
+            self.failures[self.path] -= 1
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        body = self.files.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        start = 0
+        if self.headers.get("Range"):
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            if start >= len(body):
+                self.send_response(416)
+                self.end_headers()
+                return
+            self.send_response(206)
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+        self.wfile.write(body[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def vision(monkeypatch):
+    """
+    Фикстура: поднимает локальный HTTP-сервер с фейковыми архивами для двух символов.
+
+    Returns:
+        Tuple[str, type]: базовый URL и класс обработчика (для доступа к files/failures/requests_log).
+    """
+    FakeVision.files = {}
+    FakeVision.failures = {}
+    FakeVision.requests_log = []
+    for volume, symbol in enumerate(SYMBOLS, start=1):
+        for period in PERIODS:
+            name = loader.archive_name(symbol, "1m", period)
+            body = make_zip(name.replace(".zip", ".csv"), make_klines(period, volume))
+            path = url_path(symbol, period)
+            FakeVision.files[path] = body
+            FakeVision.files[path + ".CHECKSUM"] = f"{hashlib.sha256(body).hexdigest()}  {name}\n".encode()
+
+    monkeypatch.setattr(loader, "BACKOFF", 0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeVision)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", FakeVision
+    server.shutdown()
@@ -70,7 +70,7 @@ def test_save_results_creates_file(tmp_path):
     assert os.path.exists(output_file)
     os.remove(output_file)
 
-@mock.patch("core.backtester.go.Figure.write_image")
+@mock.patch("plotly.graph_objects.Figure.write_image")
 def test_plot_equity_runs(mock_write_image, dummy_df):
     """
     Тестирует, что plot_equity успешно строит график и вызывает сохранение изображения.
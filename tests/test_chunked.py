@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.chunked import run_chunked
+from core.indicator_cache import IndicatorCache
+from core.results_store import read_value
+from strategies.sma import SmaCrossoverStrategy
+from strategies.RSI import RsiBbStrategy
+from strategies.WRAP import VwapReversionStrategy
+
+
+@pytest.fixture
+def wide_data():
+    """
+    Фикстура: трое суток минутных баров по четырём символам, с пропусками и поздним листингом.
+
+    Returns:
+        pd.DataFrame: Мультиколоночный DataFrame (field, symbol).
+    """
+    rng = np.random.default_rng(3)
+    dates = pd.date_range("2025-02-01 20:00", periods=3 * 1440, freq="1min", name="open_time")
+    symbols = pd.Index(["AAABTC", "BBBBTC", "CCCBTC", "DDDBTC"], name="symbol")
+    close = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 2e-3, (len(dates), 4)), axis=0)), index=dates, columns=symbols)
+    close.iloc[500:700, 1] = np.nan
+    close.iloc[:1000, 3] = np.nan
+    volume = pd.DataFrame(rng.exponential(10, close.shape), index=dates, columns=symbols).where(close.notna())
+    return pd.concat({"close": close, "volume": volume}, axis=1, names=["field"])
+
+
+@pytest.mark.parametrize("strategy_class, params", [
+    (SmaCrossoverStrategy, {"fast_window": 10, "slow_window": 60}),
+    (SmaCrossoverStrategy, {"fast_window": 10, "slow_window": 60, "tp_pct": None, "sl_pct": 0.01}),
+    (RsiBbStrategy, {}),
+    (VwapReversionStrategy, {"threshold": 0.002}),
+    (VwapReversionStrategy, {"threshold": 0.002, "anchor": 90}),
+])
+@pytest.mark.parametrize("chunk_bars", [257, 1440])
+def test_chunked_run_matches_in_memory(wide_data, strategy_class, params, chunk_bars, tmp_path):
+    """
+    Тестирует, что блочный бэктест даёт ту же стоимость портфеля, сделки и метрики,
+    что и прогон по всей истории, и пишет стоимость в Parquet по мере расчёта.
+    """
+    reference = strategy_class(wide_data, position_size=0.2, indicators=IndicatorCache(), engine="native", **params)
+    reference.run_backtest()
+    expected = reference.portfolio
+
+    value_path = tmp_path / "value.parquet"
+    result = run_chunked(strategy_class, wide_data, chunk_bars, position_size=0.2, value_path=str(value_path), **params)
+
+    assert len(expected.trades.records_readable) > 5
+    pd.testing.assert_series_equal(result.value(), expected.value(), rtol=1e-12)
+    pd.testing.assert_frame_equal(result.trades.records_readable, expected.trades.records_readable, rtol=1e-12)
+    pd.testing.assert_series_equal(result.stats(), expected.stats(), rtol=1e-9)
+    pd.testing.assert_series_equal(read_value(str(value_path))["group"], expected.value(), rtol=1e-12, check_freq=False)
+
+
+def test_chunked_run_memory_bounded_by_window(tmp_path):
+    """
+    Тестирует, что блочный бэктест по memmap-кешу не читает в память всю историю:
+    пик аллокаций меньше половины одной матрицы close.
+    """
+    import tracemalloc
+    from core.wide_cache import load_wide, save_wide
+
+    rng = np.random.default_rng(5)
+    dates = pd.date_range("2025-02-01", periods=20 * 1440, freq="1min", name="open_time")
+    symbols = pd.Index([f"S{i:02d}BTC" for i in range(50)], name="symbol")
+    close = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 2e-3, (len(dates), len(symbols))), axis=0)),
+                         index=dates, columns=symbols)
+    save_wide(pd.concat({"close": close, "volume": close}, axis=1, names=["field"]), str(tmp_path), "test")
+    close_bytes = close.to_numpy().nbytes
+    del close
+
+    data = load_wide(str(tmp_path))
+    params = {"fast_window": 200, "slow_window": 1000}
+    run_chunked(SmaCrossoverStrategy, data.iloc[:3000], 1000, position_size=0.01, **params)
+
+    tracemalloc.start()
+    try:
+        result = run_chunked(SmaCrossoverStrategy, data, 1000, position_size=0.01, **params)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(result.value()) == len(data)
+    assert peak < close_bytes / 2
+
+
+@pytest.mark.parametrize("offset", [0, 1])
+def test_chunked_run_signal_on_chunk_boundary(wide_data, offset):
+    """
+    Тестирует сигнал SMA на первом (offset=0) и последнем (offset=1) баре блока:
+    прогрева warmup_bars хватает, чтобы он совпал с прогоном по всей истории.
+    """
+    params = {"fast_window": 10, "slow_window": 60}
+    reference = SmaCrossoverStrategy(wide_data, position_size=0.2, indicators=IndicatorCache(), engine="native", **params)
+    entries, _ = reference.generate_signals()
+    signal_bar = int(np.flatnonzero(entries.to_numpy().any(axis=1))[3])
+
+    reference.run_backtest()
+    result = run_chunked(SmaCrossoverStrategy, wide_data, signal_bar + offset, position_size=0.2, **params)
+
+    entry_bars = wide_data.index.get_indexer(result.trades.records_readable["Entry Timestamp"])
+    assert signal_bar + 1 in entry_bars
+    pd.testing.assert_frame_equal(result.trades.records_readable, reference.portfolio.trades.records_readable,
+                                  rtol=1e-12)
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+from unittest import mock
+import pandas as pd
+import pytest
+from cli import build_parser, cli
+from conftest import SYMBOLS
+
+
+def test_startup_does_not_import_heavy_modules():
+    """
+    Тестирует, что импорт CLI и main не тянет vectorbt, plotly, matplotlib и numba.
+    """
+    code = (
+        "import sys, cli, main, core.metrics, core.backtester;"
+        "print(sorted(m for m in ('vectorbt', 'plotly', 'matplotlib', 'numba') if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_unknown_engine_is_rejected():
+    """
+    Тестирует, что argparse отклоняет неизвестный движок до запуска подкоманды.
+    """
+    with pytest.raises(SystemExit):
+        cli(["backtest", "--engine", "zipline"])
+
+
+@mock.patch("plotly.graph_objects.Figure.write_image")
+def test_report_command_builds_html(mock_write_image, tmp_path):
+    """
+    Тестирует, что подкоманда report собирает отчёт из stats и cash в указанной папке.
+    """
+    pd.Series({"Total Return [%]": 1.5, "Win Rate [%]": 50.0, "Max Drawdown [%]": 3.0}).to_csv(tmp_path / "sma_stats.csv")
+    (tmp_path / "cash").mkdir()
+    value = pd.Series([10_000.0, 10_050.0, 10_150.0], index=pd.date_range("2025-02-01", periods=3, freq="1min"), name="group")
+    value.to_csv(tmp_path / "cash" / "sma_cash.csv")
+
+    cli(["report", "--results-dir", str(tmp_path)])
+
+    html = (tmp_path / "report.html").read_text(encoding="utf-8")
+    assert "SMA Strategy" in html
+    assert (tmp_path / "heatmap.png").exists()
+    assert mock_write_image.called
+
+
+def test_download_then_load_data(vision, tmp_path, monkeypatch):
+    """
+    Тестирует цепочку из README: download из корня проекта пишет хранилище туда,
+    где его читает backtest (main.DATA_PATH).
+    """
+    import main
+
+    base_url, _ = vision
+    monkeypatch.chdir(tmp_path)
+    assert build_parser().parse_args(["download"]).store_dir == main.DATA_PATH
+
+    cli(["download", "--start", "2025-02", "--end", "2025-02", "--symbols", *SYMBOLS, "--base-url", base_url])
+
+    df = main.load_data()
+    assert set(df.index.get_level_values("symbol")) == set(SYMBOLS)
+    assert df.index.get_level_values("open_time").min() == pd.Timestamp("2025-02-01")
+    assert (tmp_path / "data_download.log").exists()
@@ -0,0 +1,215 @@
+import hashlib
+import os
+from datetime import date
+import pandas as pd
+import pytest
+import core.data_loader_bd_vision as loader
+from conftest import SYMBOLS, make_klines, make_zip, url_path, write_store
+
+
+def test_download_archives_concurrently(vision, tmp_path):
+    """
+    Тестирует параллельное скачивание с проверкой контрольных сумм,
+    повтором после ошибки сервера и пропуском отсутствующего архива.
+    """
+    base_url, handler = vision
+    handler.failures[url_path("ETHBTC", "2025-02")] = 2
+
+    archives = loader.download_archives(["ETHBTC", "BNBBTC", "NOPEBTC"], "1m", ["2025-02"], base_url, tmp_path, max_workers=3)
+
+    assert set(archives) == {("ETHBTC", "2025-02"), ("BNBBTC", "2025-02")}
+    for (symbol, period), path in archives.items():
+        with open(path, "rb") as f:
+            assert f.read() == handler.files[url_path(symbol, period)]
+        assert not os.path.exists(f"{path}.part")
+
+    df = loader.read_archive(archives[("ETHBTC", "2025-02")], "ETHBTC")
+    assert df["open_time"].iloc[0] == pd.Timestamp("2025-02-01")
+
+
+def test_checksum_is_retried_and_required(vision, tmp_path):
+    """
+    Тестирует, что запрос контрольной суммы повторяется после ошибки сервера, архив без доступной
+    контрольной суммы не принимается, а отсутствующая контрольная сумма (404) проверку отключает.
+    """
+    base_url, handler = vision
+    handler.failures[url_path("ETHBTC", "2025-02") + ".CHECKSUM"] = 2
+    handler.failures[url_path("BNBBTC", "2025-02") + ".CHECKSUM"] = loader.MAX_RETRIES
+    del handler.files[url_path("ETHBTC", "2025-01") + ".CHECKSUM"]
+
+    archives = loader.download_archives(SYMBOLS, "1m", ["2025-01", "2025-02"], base_url, tmp_path, max_workers=2)
+
+    assert set(archives) == {("ETHBTC", "2025-01"), ("ETHBTC", "2025-02"), ("BNBBTC", "2025-01")}
+    assert (url_path("BNBBTC", "2025-02"), None) not in handler.requests_log
+    checksum_requests = [path for path, _ in handler.requests_log if path == url_path("ETHBTC", "2025-01") + ".CHECKSUM"]
+    assert len(checksum_requests) == 1
+
+
+def test_retries_sleep_only_between_attempts(monkeypatch):
+    """
+    Тестирует, что пауза с удвоением делается только перед следующей попыткой, а не после последней.
+    """
+    sleeps = []
+    monkeypatch.setattr(loader.time, "sleep", sleeps.append)
+    monkeypatch.setattr(loader, "BACKOFF", 1.0)
+
+    def fail():
+        raise ConnectionError("нет связи")
+
+    with pytest.raises(ConnectionError):
+        loader.with_retries("http://example", fail)
+
+    assert sleeps == [2.0 ** attempt for attempt in range(loader.MAX_RETRIES - 1)]
+
+
+def test_download_resumes_partial_file(vision, tmp_path):
+    """
+    Тестирует докачку: при наличии .part запрашивается только хвост файла.
+    """
+    base_url, handler = vision
+    path = url_path("BNBBTC", "2025-02")
+    body = handler.files[path]
+    target = tmp_path / "archive.zip"
+    with open(f"{target}.part", "wb") as f:
+        f.write(body[:10])
+
+    expected = hashlib.sha256(body).hexdigest()
+    assert loader.download_file(loader.make_session(1), base_url + path, str(target), expected)
+
+    assert target.read_bytes() == body
+    assert handler.requests_log[-1] == (path, "bytes=10-")
+
+
+def test_download_rejects_bad_checksum(vision, tmp_path, monkeypatch):
+    """
+    Тестирует, что архив с неверной контрольной суммой не сохраняется.
+    """
+    base_url, handler = vision
+    monkeypatch.setattr(loader, "MAX_RETRIES", 2)
+    target = tmp_path / "archive.zip"
+
+    assert not loader.download_file(loader.make_session(1), base_url + url_path("ETHBTC", "2025-02"), str(target), "0" * 64)
+    assert not target.exists()
+
+
+def test_download_range_is_incremental(vision, tmp_path):
+    """
+    Тестирует загрузку диапазона месяцев: завершённые месяцы не перекачиваются,
+    текущий месяц собирается из дневных архивов и дополняется новыми днями.
+    """
+    base_url, handler = vision
+    store = tmp_path / "store"
+    kwargs = dict(start="2025-01", base_url=base_url, temp_dir=str(tmp_path / "tmp"), store_dir=str(store), symbols=SYMBOLS)
+
+    loader.download_btc_data(today=date(2025, 3, 3), **kwargs)
+    df = pd.read_parquet(store, filters=[("interval", "=", "1m")])
+    assert sorted(df["month"].unique()) == ["2025-01", "2025-02", "2025-03"]
+    assert df["open_time"].min() == pd.Timestamp("2025-01-01")
+    assert df.loc[df["month"] == "2025-03", "open_time"].dt.day.max() == 2
+
+    handler.requests_log.clear()
+    loader.download_btc_data(today=date(2025, 3, 4), **kwargs)
+    requested = {path for path, _ in handler.requests_log if not path.endswith(".CHECKSUM")}
+    assert requested == {url_path(symbol, "2025-03-03") for symbol in SYMBOLS}
+
+    df = pd.read_parquet(store, filters=[("month", "=", "2025-03")])
+    assert sorted(df["open_time"].dt.day.unique()) == [1, 2, 3]
+
+
+def test_load_data_pushes_filters_down(tmp_path):
+    """
+    Тестирует чтение партиционированного хранилища с фильтрами по символам, времени и колонкам.
+    """
+    from main import load_data
+
+    dates = pd.date_range("2025-01-30", "2025-02-02 23:59", freq="1min")
+    frames = []
+    for symbol in ["ETHBTC", "BNBBTC", "XRPBTC"]:
+        frames.append(pd.DataFrame({
+            "open_time": dates, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0, "symbol": symbol
+        }))
+    df = pd.concat(frames)
+    for month, month_df in df.groupby(df["open_time"].dt.strftime("%Y-%m")):
+        write_store(month_df, "1m", month, tmp_path)
+
+    assert len(list(tmp_path.glob("interval=1m/symbol=*/month=*/data.parquet"))) == 6
+
+    result = load_data(tmp_path, symbols=["ETHBTC", "XRPBTC"], start="2025-01-31 12:00", end="2025-02-01 12:00", columns=["close"])
+
+    assert list(result.columns) == ["close"]
+    assert sorted(result.index.get_level_values("symbol").unique()) == ["ETHBTC", "XRPBTC"]
+    times = result.index.get_level_values("open_time")
+    assert times.min() == pd.Timestamp("2025-01-31 12:00")
+    assert times.max() == pd.Timestamp("2025-02-01 11:59")
+    assert len(result) == 2 * 24 * 60
+
+
+def test_compact_schema_survives_store(tmp_path):
+    """
+    Тестирует, что компактная схема применяется при разборе CSV и сохраняется после load_data.
+    """
+    from main import load_data
+
+    zip_path = tmp_path / "ETHBTC-1m-2025-02.zip"
+    zip_path.write_bytes(make_zip("ETHBTC-1m-2025-02.csv", make_klines("2025-02", volume=3, rows=5)))
+    df = loader.read_archive(str(zip_path), "ETHBTC")
+
+    assert "close_time" not in df.columns
+    assert df["close"].dtype == "float64"
+    assert df["volume"].dtype == "float32"
+    assert df["number_of_trades"].dtype == "int32"
+    assert isinstance(df["symbol"].dtype, pd.CategoricalDtype)
+
+    report = loader.memory_report(df.astype({"symbol": object}), df)
+    assert report.loc["total", "after_mb"] < report.loc["total", "before_mb"]
+
+    loader.write_symbol_month([str(zip_path)], "ETHBTC", "1m", "2025-02", str(tmp_path / "store"))
+    loaded = load_data(tmp_path / "store")
+    assert loaded["volume"].dtype == "float32"
+    assert loaded["number_of_trades"].dtype == "int32"
+    assert isinstance(loaded.index.get_level_values("symbol").dtype, pd.CategoricalDtype)
+
+
+def test_ingest_month_streams_only_top_symbols(vision, tmp_path, monkeypatch):
+    """
+    Тестирует двухпроходную загрузку: объёмы считаются по всем архивам,
+    а разбираются и записываются только архивы пар из топа (прямо из zip, без распаковки на диск).
+    """
+    base_url, _ = vision
+    monkeypatch.setattr(loader, "TOP_N", 1)
+    parsed = []
+    read_archive = loader.read_archive
+    monkeypatch.setattr(loader, "read_archive", lambda path, symbol: parsed.append(path) or read_archive(path, symbol))
+    store = tmp_path / "store"
+    periods = ["2025-03-01", "2025-03-02", "2025-03-03"]
+
+    assert loader.ingest_month(SYMBOLS, "1m", "2025-03", periods, base_url, str(tmp_path / "tmp"), str(store))
+
+    assert all("BNBBTC" in path for path in parsed) and len(parsed) == len(periods)
+    assert not list((tmp_path / "tmp").rglob("*.csv"))
+    partitions = list(store.glob("interval=1m/symbol=*/month=2025-03/data.parquet"))
+    assert [p.parent.parent.name for p in partitions] == ["symbol=BNBBTC"]
+
+    import pyarrow.parquet as pq
+    assert pq.ParquetFile(partitions[0]).metadata.num_row_groups == len(periods)
+    df = pd.read_parquet(partitions[0])
+    assert df["open_time"].is_monotonic_increasing and len(df) == 3 * len(periods)
+    assert df["volume"].dtype == "float32"
+
+
+@pytest.mark.parametrize("period", ["2025-01", "2025-02"])
+def test_read_archive_detects_time_unit(tmp_path, period):
+    """
+    Тестирует разбор CSV прямо из zip через Arrow: единица времени (мс до 2025-02, мкс после)
+    определяется по каждому файлу, схема — компактная (apply_schema).
+    """
+    zip_path = tmp_path / f"ETHBTC-1m-{period}.zip"
+    zip_path.write_bytes(make_zip(f"ETHBTC-1m-{period}.csv", make_klines(period, volume=3)))
+
+    df = loader.read_archive(str(zip_path), "ETHBTC")
+
+    assert list(df["open_time"]) == list(pd.date_range(f"{period}-01", periods=3, freq="1min"))
+    assert list(df.columns) == [c for c in loader.KLINE_COLUMNS if c not in ("ignore", "close_time")] + ["symbol"]
+    assert df["volume"].dtype == "float32" and df["number_of_trades"].dtype == "int32"
+    assert loader.archive_volume(str(zip_path)) == 9.0
+    assert loader.read_archive(str(tmp_path / "missing.zip"), "ETHBTC") is None
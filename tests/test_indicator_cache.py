@@ -0,0 +1,101 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from core.indicator_cache import IndicatorCache, data_fingerprint
+from strategies.RSI import RsiBbStrategy
+from strategies.WRAP import VwapReversionStrategy
+
+
+@pytest.fixture
+def dummy_data():
+    """
+    Фикстура: широкие данные (field, symbol) по двум символам.
+
+    Returns:
+        pd.DataFrame: Мультиколоночный DataFrame.
+    """
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2025-02-01", periods=200, freq="1min", name="open_time")
+    columns = pd.MultiIndex.from_product([["close", "volume"], ["BTCUSDT", "ETHBTC"]], names=["field", "symbol"])
+    return pd.DataFrame(rng.random((len(dates), 4)) + 1, index=dates, columns=columns)
+
+
+def test_cache_reuses_indicators_across_strategies(dummy_data, tmp_path):
+    """
+    Тестирует, что индикаторы переиспользуются между экземплярами стратегий,
+    берутся с диска новым кешем и пересчитываются при изменении данных.
+    """
+    cache = IndicatorCache(disk_dir=tmp_path)
+    first = RsiBbStrategy(dummy_data, indicators=cache).generate_signals()
+    second = RsiBbStrategy(dummy_data.copy(), indicators=cache, bb_std=3).generate_signals()
+
+    assert cache.stats()["misses"] == 3  # rsi, bbands(std=2), bbands(std=3)
+    assert cache.stats()["hits"] == 1    # rsi во втором экземпляре
+
+    fresh = IndicatorCache(disk_dir=tmp_path)
+    entries, exits = RsiBbStrategy(dummy_data, indicators=fresh).generate_signals()
+    assert fresh.stats()["disk_hits"] == 2 and fresh.stats()["misses"] == 0
+    assert entries.equals(first[0]) and exits.equals(first[1])
+
+    changed = dummy_data.copy()
+    changed.iloc[-1, 0] += 1
+    RsiBbStrategy(changed, indicators=fresh).generate_signals()
+    assert fresh.stats()["misses"] == 2
+
+
+def test_fingerprint_depends_only_on_inputs(dummy_data):
+    """
+    Тестирует, что отпечаток зависит только от указанных полей.
+    """
+    other = dummy_data.copy()
+    other[("volume", "ETHBTC")] += 1
+
+    assert data_fingerprint(dummy_data, ("close",)) == data_fingerprint(other, ("close",))
+    assert data_fingerprint(dummy_data, ("close", "volume")) != data_fingerprint(other, ("close", "volume"))
+
+    cache = IndicatorCache()
+    VwapReversionStrategy(dummy_data, indicators=cache).generate_signals()
+    VwapReversionStrategy(other, indicators=cache).generate_signals()
+    assert cache.misses == 2
+
+
+def test_memory_tier_is_bounded(dummy_data):
+    """
+    Тестирует, что LRU в памяти вытесняет старые индикаторы при превышении лимита.
+    """
+    close = dummy_data["close"]
+    cache = IndicatorCache(max_bytes=close.memory_usage(index=False).sum() * 2)
+    for window in (5, 10, 20):
+        cache.get_or_compute("sma", {"window": window}, "fp", lambda window: close.rolling(window).mean())
+
+    assert len(cache) == 2
+    cache.get_or_compute("sma", {"window": 5}, "fp", lambda window: close.rolling(window).mean())
+    assert cache.misses == 4
+
+
+def test_disk_tier_is_bounded(dummy_data, tmp_path):
+    """
+    Тестирует, что дисковый уровень вытесняет старые и давно не читанные файлы,
+    а clear_disk удаляет все.
+    """
+    close = dummy_data["close"]
+    sma = lambda window: close.rolling(window).mean()
+    cache = IndicatorCache(disk_dir=tmp_path, disk_max_age_days=1)
+    for window in (5, 10, 20):
+        cache.get_or_compute("sma", {"window": window}, "fp", sma)
+    paths = {window: cache._path(("sma", (("window", window),), "fp")) for window in (5, 10, 20)}
+
+    now = time.time()
+    for window, age in {5: 2 * 86400, 10: 200, 20: 100}.items():
+        os.utime(paths[window], (now - age, now - age))
+    # Чтение с диска освежает файл: окно 10 становится самым новым
+    IndicatorCache(disk_dir=tmp_path).get_or_compute("sma", {"window": 10}, "fp", sma)
+    cache.disk_max_bytes = os.path.getsize(paths[10])
+
+    assert sorted(cache.evict(now=time.time())) == sorted([paths[5], paths[20]])
+    assert [path for _, _, path in cache.disk_entries()] == [paths[10]]
+
+    cache.clear_disk()
+    assert cache.disk_entries() == []
@@ -0,0 +1,79 @@
+import os
+from unittest import mock
+import numpy as np
+import pandas as pd
+import core.metrics as metrics
+
+
+def write_results(results_dir, strategies, total_return=1.5):
+    (results_dir / "cash").mkdir(exist_ok=True)
+    index = pd.date_range("2025-02-01", periods=3, freq="1min")
+    for strat in strategies:
+        pd.Series({"Total Return [%]": total_return, "Win Rate [%]": 50.0, "Max Drawdown [%]": 3.0}).to_csv(
+            results_dir / f"{strat}_stats.csv"
+        )
+        pd.Series([10_000.0, 10_050.0, 10_150.0], index=index, name="group").to_csv(results_dir / "cash" / f"{strat}_cash.csv")
+
+
+def fake_write_image(self, path, **kwargs):
+    open(path, "wb").close()
+
+
+def test_report_rebuilds_only_changed_targets(tmp_path):
+    """
+    Тестирует инкрементальную сборку: повторный вызов ничего не перерисовывает,
+    а новый cash-файл одной стратегии пересобирает только её PNG и общую кривую.
+    """
+    strategies = ["sma", "rsi"]
+    write_results(tmp_path, strategies)
+
+    with mock.patch("plotly.graph_objects.Figure.write_image", autospec=True, side_effect=fake_write_image) as write_image, \
+            mock.patch.object(metrics, "render_heatmap", wraps=metrics.render_heatmap) as heatmap:
+        metrics.build_report(strategies, str(tmp_path))
+        # PNG экспортируется по одному разу на стратегию, а не на каждую итерацию цикла
+        assert write_image.call_count == 2
+        assert heatmap.call_count == 1
+
+        metrics.build_report(strategies, str(tmp_path))
+        assert write_image.call_count == 2
+        assert heatmap.call_count == 1
+
+        cash_path = tmp_path / "cash" / "rsi_cash.csv"
+        pd.read_csv(cash_path, index_col=0).mul(1.01).to_csv(cash_path)
+        os.utime(cash_path, ns=(0, os.stat(cash_path).st_mtime_ns + 1))
+        metrics.build_report(strategies, str(tmp_path))
+
+    assert write_image.call_count == 3
+    assert write_image.call_args.args[1].endswith("rsi_equity.png")
+    assert heatmap.call_count == 1
+    assert "RSI Strategy" in (tmp_path / "report.html").read_text(encoding="utf-8")
+
+
+def test_downsample_keeps_shape():
+    """
+    Тестирует, что прореживание оставляет не больше max_points точек, концы ряда и экстремумы.
+    """
+    index = pd.date_range("2025-02-01", periods=50_000, freq="1min")
+    series = pd.Series(np.random.default_rng(0).normal(0, 1, len(index)).cumsum(), index=index)
+
+    sampled = metrics.downsample(series, 1000)
+
+    assert len(sampled) <= 1000
+    assert sampled.index.is_monotonic_increasing
+    assert sampled.index[0] == index[0] and sampled.index[-1] == index[-1]
+    assert sampled.max() == series.max() and sampled.min() == series.min()
+    pd.testing.assert_series_equal(metrics.downsample(series.iloc[:10], 1000), series.iloc[:10])
+
+
+@mock.patch("plotly.graph_objects.Figure.write_image")
+def test_report_links_plotlyjs_once(mock_write_image, tmp_path):
+    """
+    Тестирует, что Plotly JS лежит рядом с отчётом, а не встраивается в страницу.
+    """
+    write_results(tmp_path, ["sma"])
+
+    metrics.build_report(["sma"], str(tmp_path))
+
+    html = (tmp_path / "report.html").read_text(encoding="utf-8")
+    assert f'<script src="{metrics.PLOTLYJS_NAME}"></script>' in html
+    assert (tmp_path / metrics.PLOTLYJS_NAME).stat().st_size > len(html)
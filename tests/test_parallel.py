@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.backtester import run_multi_strategy
+from core.parallel import merge_stats, run_parallel, share_frame, attach_frame
+from strategies.sma import SmaCrossoverStrategy
+
+
+class FastSma(SmaCrossoverStrategy):
+    """SMA с короткими окнами, чтобы на 300 барах были сделки."""
+
+    def __init__(self, data, **kwargs):
+        super().__init__(data, fast_window=5, slow_window=10, **kwargs)
+
+
+@pytest.fixture
+def dummy_df():
+    """
+    Фикстура: данные по четырём символам в формате (open_time, symbol).
+
+    Returns:
+        pd.DataFrame: Мультииндексный DataFrame.
+    """
+    dates = pd.date_range("2025-02-01", periods=300, freq="1min")
+    frames = []
+    for k, symbol in enumerate(["AAABTC", "BBBBTC", "CCCBTC", "DDDBTC"]):
+        price = 100 + np.sin(np.arange(len(dates)) / (5 + k)) * 5
+        frames.append(pd.DataFrame({"open_time": dates, "symbol": symbol, "close": price, "volume": 1000.0}))
+    return pd.concat(frames).set_index(["open_time", "symbol"]).sort_index()
+
+
+def test_share_frame_roundtrip(dummy_df, tmp_path):
+    """
+    Тестирует, что матрица, открытая через memmap, совпадает с исходной.
+    """
+    df_wide = dummy_df.unstack('symbol')
+    shared = attach_frame(share_frame(df_wide, tmp_path))
+    pd.testing.assert_frame_equal(shared, df_wide)
+
+
+def test_parallel_matches_sequential(dummy_df, tmp_path, monkeypatch):
+    """
+    Тестирует, что параллельный запуск без деления символов совпадает с run_multi_strategy,
+    а при делении на блоки сохраняет начальный капитал и все сделки блоков и помечает
+    метрики числом блоков.
+    """
+    monkeypatch.chdir(tmp_path)
+    pf = run_multi_strategy(FastSma, dummy_df)
+
+    whole = run_parallel([FastSma], dummy_df, max_workers=2)[FastSma]
+    pd.testing.assert_series_equal(whole.value(), pf.value())
+    assert len(whole.trades.records_readable) == pf.trades.count()
+    assert "Symbol Chunks" not in whole.stats().index
+
+    chunked = run_parallel([FastSma], dummy_df, max_workers=2, symbol_chunks=2)[FastSma]
+    stats = chunked.stats()
+    assert stats["Start Value"] == pytest.approx(10_000)
+    assert stats["Total Trades"] == len(chunked.trades.records_readable)
+    assert stats["Symbol Chunks"] == 2 and stats.name == "group"
+    assert chunked.value().iloc[0] == pytest.approx(pf.value().iloc[0], rel=1e-3)
+
+
+@pytest.mark.parametrize("status, pnl, expected", [
+    ([], [], np.nan),
+    (["Open"], [5.0], np.nan),
+    (["Closed", "Closed"], [5.0, 3.0], np.inf),
+    (["Closed", "Closed"], [6.0, -2.0], 3.0),
+])
+def test_merge_stats_profit_factor(status, pnl, expected):
+    """
+    Тестирует Profit Factor: NaN без закрытых сделок, inf — только при прибыльных без убыточных.
+    """
+    value = pd.Series([10_000.0, 10_005.0, 10_003.0], index=pd.date_range("2025-02-01", periods=3, freq="1min"))
+    trades = pd.DataFrame({"Status": status, "PnL": pnl, "Return": np.array(pnl) / 100,
+                           "Entry Fees": 0.0, "Exit Fees": 0.0})
+
+    np.testing.assert_equal(merge_stats(value, trades)["Profit Factor"], expected)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.metrics import load_equity, load_metrics
+from core.results_store import read_stats, read_trades, read_value, write_stats, write_trades, write_value
+
+
+@pytest.fixture
+def results():
+    """
+    Фикстура: стоимость портфеля, сделки и метрики в форматах, которые отдаёт бэктест.
+
+    Returns:
+        Tuple[pd.Series, pd.DataFrame, pd.Series]
+    """
+    index = pd.date_range("2025-02-01", periods=5, freq="1min")
+    value = pd.Series(np.linspace(10_000, 10_100, 5), index=index, name="group")
+    trades = pd.DataFrame({
+        "Exit Trade Id": [0, 1],
+        "Column": ["ETHBTC", "BNBBTC"],
+        "Entry Timestamp": index[[0, 1]],
+        "Exit Timestamp": index[[3, 4]],
+        "PnL": [1.5, -0.5],
+        "Direction": "Long",
+        "Status": ["Closed", "Open"],
+    })
+    stats = pd.Series({
+        "Start": index[0],
+        "Period": pd.Timedelta("5min"),
+        "Total Return [%]": 1.0,
+        "Total Trades": 2,
+    }, name="group")
+    return value, trades, stats
+
+
+def test_parquet_roundtrip_keeps_types(results, tmp_path):
+    """
+    Тестирует, что Parquet сохраняет время, числа и категории без разбора текста.
+    """
+    value, trades, stats = results
+
+    [value_path] = write_value(value, "sma", str(tmp_path))
+    [trades_path] = write_trades(trades, "sma", str(tmp_path))
+    [stats_path] = write_stats(stats, "sma", str(tmp_path))
+
+    pd.testing.assert_series_equal(read_value(value_path)["group"], value, check_freq=False)
+    loaded = read_trades(trades_path)
+    assert loaded["Column"].dtype == "category"
+    assert loaded["Entry Timestamp"].dtype.kind == "M"
+    pd.testing.assert_frame_equal(loaded.astype({"Column": str, "Direction": str, "Status": str}), trades)
+    assert read_stats(stats_path).to_dict() == stats.to_dict()
+
+
+def test_report_loaders_prefer_parquet(results, tmp_path):
+    """
+    Тестирует, что отчёт читает Parquet и по-прежнему понимает CSV, записанный по запросу.
+    """
+    value, _, stats = results
+    write_value(value, "sma", str(tmp_path))
+    write_stats(stats, "sma", str(tmp_path))
+    write_value(value * 2, "rsi", str(tmp_path), formats=("csv",))
+    write_stats(stats, "rsi", str(tmp_path), formats=("csv",))
+
+    pd.testing.assert_series_equal(load_equity("sma", str(tmp_path / "cash")), value, check_freq=False)
+    pd.testing.assert_series_equal(load_equity("rsi", str(tmp_path / "cash")), value * 2, check_freq=False, check_index_type=False)
+
+    metrics = load_metrics(["sma", "rsi"], str(tmp_path)).set_index("Strategy")
+    assert metrics.loc["sma", "Total Return [%]"] == metrics.loc["rsi", "Total Return [%]"] == 1.0
+
+
+def test_unknown_format_is_rejected(results, tmp_path):
+    """
+    Тестирует, что неизвестный формат результатов отклоняется.
+    """
+    with pytest.raises(ValueError):
+        write_value(results[0], "sma", str(tmp_path), formats=("feather",))
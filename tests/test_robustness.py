@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.results_store import write_trades, write_value
+from core.robustness import (
+    SAMPLE_COLUMNS, bar_returns, block_paths_nb, confidence_intervals, resample, robustness, run_robustness,
+    shuffle_paths_nb, trade_paths_nb
+)
+
+
+@pytest.fixture
+def backtest():
+    """
+    Фикстура: сделки и стоимость портфеля в форматах, которые сохраняет бэктест.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.Series]
+    """
+    rng = np.random.default_rng(7)
+    pnl = rng.normal(0.5, 10, 400)
+    trades = pd.DataFrame({
+        "Column": "ETHBTC",
+        "PnL": np.r_[pnl, 3.0],
+        "Status": ["Closed"] * len(pnl) + ["Open"],
+    })
+    index = pd.date_range("2025-02-01", periods=3000, freq="1min")
+    value = pd.Series(10_000 * np.exp(np.cumsum(rng.normal(0, 1e-4, len(index)))), index=index, name="group")
+    return trades, value
+
+
+def test_path_kernels():
+    """
+    Тестирует доходность и просадку ядер на траекториях с известным ответом (пик учитывает начальный капитал).
+    """
+    pnl = np.array([-10.0, 30.0, -60.0, 50.0])
+    expected = [[10.0, 50.0], [10.0, (1 - 60 / 130) * 100]]
+    np.testing.assert_allclose(trade_paths_nb(pnl, np.array([[0, 1, 2, 3], [1, 2, 0, 3]]), 100.0), expected)
+
+    # uniforms, дающие перестановку [1, 2, 0, 3] (обход Фишера — Йетса с конца)
+    uniforms = np.array([[0.0, 0.0, 0.0, 0.99]])
+    order = list(range(4))
+    for k in range(3, 0, -1):
+        j = int(uniforms[0, k] * (k + 1))
+        order[k], order[j] = order[j], order[k]
+    np.testing.assert_allclose(shuffle_paths_nb(pnl, uniforms, 100.0), trade_paths_nb(pnl, np.array([order]), 100.0))
+
+    returns = np.array([0.1, -0.5, 1.0])
+    np.testing.assert_allclose(block_paths_nb(returns, np.array([[1, 0]]), 2, 100.0), [[10.0, 50.0]])
+
+
+def test_resample_methods(backtest):
+    """
+    Тестирует методы: перестановка не меняет итоговую доходность, бутстреп сделок колеблется вокруг неё,
+    блочный бутстреп одним блоком на всю историю воспроизводит исходную кривую.
+    """
+    trades, value = backtest
+    pnl = trades.loc[trades["Status"] == "Closed", "PnL"].to_numpy()
+    observed = pnl.sum() / 10_000 * 100
+
+    shuffled = resample("shuffle", pnl, 500)
+    np.testing.assert_allclose(shuffled["Total Return [%]"], observed)
+    assert (shuffled["Max Drawdown [%]"] >= 0).all() and shuffled["Max Drawdown [%]"].nunique() > 1
+
+    boot = resample("trades", pnl, 2000)
+    assert boot["Total Return [%]"].std() > 0
+    assert boot["Total Return [%]"].mean() == pytest.approx(observed, abs=4 * boot["Total Return [%]"].std() / np.sqrt(2000))
+
+    whole = resample("blocks", bar_returns(value), 5, block_bars=len(value))
+    np.testing.assert_allclose(whole["Total Return [%]"], (value.iloc[-1] / 10_000 - 1) * 100)
+
+    with pytest.raises(ValueError):
+        resample("nope", pnl, 10)
+
+
+def test_batches_do_not_depend_on_workers(backtest, monkeypatch):
+    """
+    Тестирует, что пачки и их зерна не зависят от числа процессов: пул даёт те же выборки.
+    """
+    import core.robustness as robustness_module
+
+    trades, _ = backtest
+    pnl = trades["PnL"].to_numpy()
+    monkeypatch.setattr(robustness_module, "BATCH_ELEMENTS", 100 * len(pnl))
+
+    sequential = resample("trades", pnl, 350, seed=3)
+    pd.testing.assert_frame_equal(resample("trades", pnl, 350, seed=3, workers=2), sequential)
+    assert not resample("trades", pnl, 350, seed=4).equals(sequential)
+
+
+def test_run_robustness_writes_intervals(backtest, tmp_path):
+    """
+    Тестирует анализ по сохранённым результатам: выборки всех методов и таблица доверительных интервалов;
+    стратегия без закрытых сделок и без стоимости портфеля пропускается, не прерывая остальные.
+    """
+    trades, value = backtest
+    write_trades(trades, "rsi", str(tmp_path))
+    write_value(value, "rsi", str(tmp_path))
+    write_trades(trades[trades["Status"] == "Open"], "sma", str(tmp_path))
+
+    run_robustness(["sma", "rsi", "vwap"], str(tmp_path), n_iter=200, block_bars=60)
+
+    samples = pd.read_parquet(tmp_path / "robustness" / "rsi_samples.parquet")
+    assert samples.groupby("method").size().to_dict() == {"blocks": 200, "shuffle": 200, "trades": 200}
+
+    table = pd.read_csv(tmp_path / "robustness" / "rsi_ci.csv", index_col=[0, 1])
+    assert list(table.columns) == ["mean", "q5", "q50", "q95"]
+    assert (table["q5"] <= table["q50"]).all() and (table["q50"] <= table["q95"]).all()
+    pd.testing.assert_frame_equal(table, confidence_intervals(samples), check_names=False)
+    assert not (tmp_path / "robustness" / "sma_samples.parquet").exists()
+    assert list(robustness(trades.iloc[:0]).columns) == ["method", *SAMPLE_COLUMNS]
+    assert list(confidence_intervals(robustness(trades.iloc[:0])).columns) == ["mean", "q5", "q50", "q95"]
@@ -0,0 +1,127 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+import main
+from core import run_cache as run_cache_module
+from core.parallel import PortfolioResult
+from core.portfolio import PORTFOLIO_KWARGS
+from core.run_cache import RunCache, run_key
+from strategies.sma import SmaCrossoverStrategy
+
+
+@pytest.fixture
+def wide_data():
+    """
+    Фикстура: сутки минутных баров по трём символам.
+
+    Returns:
+        pd.DataFrame: Мультиколоночный DataFrame (field, symbol).
+    """
+    rng = np.random.default_rng(5)
+    dates = pd.date_range("2025-02-01", periods=1440, freq="1min", name="open_time")
+    symbols = pd.Index(["AAABTC", "BBBBTC", "CCCBTC"], name="symbol")
+    close = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 2e-3, (len(dates), 3)), axis=0)), index=dates, columns=symbols)
+    volume = pd.DataFrame(rng.exponential(10, close.shape), index=dates, columns=symbols)
+    return pd.concat({"close": close, "volume": volume}, axis=1, names=["field"])
+
+
+def test_run_key_depends_on_data_params_and_settings(wide_data):
+    """
+    Тестирует, что ключ прогона меняется вместе с данными, движком, размером позиции
+    и настройками симуляции, а для тех же входов совпадает.
+    """
+    key = run_key(SmaCrossoverStrategy, wide_data, engine="native")
+
+    assert run_key(SmaCrossoverStrategy, wide_data.copy(), engine="native") == key
+    assert run_key(SmaCrossoverStrategy, wide_data, engine="vbt") != key
+    assert run_key(SmaCrossoverStrategy, wide_data, position_size=0.02, engine="native") != key
+    assert run_key(SmaCrossoverStrategy, wide_data, engine="native",
+                   portfolio_kwargs={**PORTFOLIO_KWARGS, "fees": 0.002}) != key
+
+    changed = wide_data.copy()
+    changed.iloc[-1, 0] *= 1.01
+    assert run_key(SmaCrossoverStrategy, changed, engine="native") != key
+
+
+def test_run_key_depends_on_symbol_chunks(wide_data):
+    """
+    Тестирует, что прогон с делением символов на блоки (капитал делится между блоками)
+    не совпадает по ключу с прогоном целиком, а symbol_chunks=1 — это тот же прогон.
+    """
+    key = run_key(SmaCrossoverStrategy, wide_data, engine="native")
+
+    assert run_key(SmaCrossoverStrategy, wide_data, engine="native", symbol_chunks=1) == key
+    assert run_key(SmaCrossoverStrategy, wide_data, engine="native", symbol_chunks=2) != key
+
+
+def test_run_key_depends_on_simulation_code(wide_data, tmp_path, monkeypatch):
+    """
+    Тестирует, что правка модуля симуляции вне пакета strategies меняет ключ прогона.
+    """
+    (tmp_path / "fake_simulator.py").write_text("FEES = 0.001\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(run_cache_module, "SIMULATION_MODULES", run_cache_module.SIMULATION_MODULES + ("fake_simulator",))
+    key = run_key(SmaCrossoverStrategy, wide_data, engine="native")
+
+    (tmp_path / "fake_simulator.py").write_text("FEES = 0.002\n")
+
+    assert run_key(SmaCrossoverStrategy, wide_data, engine="native") != key
+
+
+def test_run_strategy_reuses_cached_run(wide_data, tmp_path, monkeypatch):
+    """
+    Тестирует, что ключ считается один раз на прогон, а повторный прогон берёт стоимость,
+    сделки и метрики из кеша без симуляции и сохраняет в results/ те же файлы.
+    """
+    monkeypatch.chdir(tmp_path)
+    run_cache = RunCache(str(tmp_path / "runs"))
+    keys = []
+    monkeypatch.setattr(main, "run_key", lambda *args, **kwargs: keys.append(run_key(*args, **kwargs)) or keys[-1])
+
+    main.run_strategy(SmaCrossoverStrategy, wide_data, "native", run_cache=run_cache)
+    assert len(keys) == 1
+    first = {name: pd.read_parquet(f"results/{name}") for name in ("cash/sma_cash.parquet", "trades/sma_trades.parquet")}
+    first_stats = pd.read_parquet("results/sma_stats.parquet")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("симуляция не должна запускаться")
+
+    monkeypatch.setattr(main, "run_multi_strategy", fail)
+    main.run_strategy(SmaCrossoverStrategy, wide_data, "native", run_cache=run_cache)
+
+    assert run_cache.stats()["hits"] == 1 and run_cache.stats()["entries"] == 1
+    for name, expected in first.items():
+        pd.testing.assert_frame_equal(pd.read_parquet(f"results/{name}"), expected)
+    pd.testing.assert_frame_equal(pd.read_parquet("results/sma_stats.parquet"), first_stats)
+
+
+def test_eviction_by_age_and_size(tmp_path):
+    """
+    Тестирует вытеснение: сначала записи старше max_age_days, затем давно не читанные,
+    пока суммарный объём больше max_bytes.
+    """
+    index = pd.date_range("2025-02-01", periods=100, freq="1min")
+    value = pd.Series(np.linspace(1, 2, 100), index=index, name="group")
+    trades = pd.DataFrame({"Column": ["AAABTC"], "PnL": [1.0], "Status": ["Closed"]})
+    result = PortfolioResult(value, trades, pd.Series({"Total Return [%]": 1.0}))
+
+    run_cache = RunCache(str(tmp_path / "runs"), max_bytes=10 ** 9, max_age_days=1)
+    for key in ("old", "a", "b", "c"):
+        run_cache.store(key, result)
+    now = time.time()
+    for key, age in {"old": 2 * 86400, "a": 300, "b": 200, "c": 100}.items():
+        os.utime(tmp_path / "runs" / key / "_meta.json", (now - age, now - age))
+
+    # Чтение освежает запись: "a" становится самой новой
+    assert run_cache.load("a") is not None
+    # Размеры записей могут отличаться на байт (время создания в _meta.json)
+    sizes = {os.path.basename(path): size for _, size, path in run_cache.entries()}
+    run_cache.max_bytes = sizes["a"] + sizes["c"]
+
+    removed = run_cache.evict(now=time.time())
+
+    assert sorted(os.path.basename(path) for path in removed) == ["b", "old"]
+    assert sorted(os.listdir(tmp_path / "runs")) == ["a", "c"]
+    assert run_cache.load("b") is None
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.indicator_cache import IndicatorCache
+from strategies.sma import SmaCrossoverStrategy
+from strategies.RSI import RsiBbStrategy
+from strategies.WRAP import VwapReversionStrategy
+
+STATS = ["End Value", "Total Return [%]", "Total Fees Paid", "Max Drawdown [%]", "Total Trades",
+         "Win Rate [%]", "Expectancy", "Sharpe Ratio", "Sortino Ratio"]
+
+
+@pytest.fixture
+def wide_data():
+    """
+    Фикстура: широкие данные по пяти символам с пропусками цен.
+
+    Returns:
+        pd.DataFrame: Мультиколоночный DataFrame (field, symbol).
+    """
+    rng = np.random.default_rng(1)
+    dates = pd.date_range("2025-02-01", periods=3000, freq="1min", name="open_time")
+    symbols = pd.Index(["AAABTC", "BBBBTC", "CCCBTC", "DDDBTC", "EEEBTC"], name="symbol")
+    close = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 3e-3, (len(dates), 5)), axis=0)), index=dates, columns=symbols)
+    close.iloc[100:300, 1] = np.nan
+    close.iloc[:500, 2] = np.nan
+    volume = pd.DataFrame(rng.exponential(10, close.shape), index=dates, columns=symbols)
+    return pd.concat({"close": close, "volume": volume}, axis=1, names=["field"])
+
+
+@pytest.mark.parametrize("strategy_class, params", [
+    (SmaCrossoverStrategy, {"fast_window": 10, "slow_window": 30}),
+    (RsiBbStrategy, {}),
+    (VwapReversionStrategy, {}),
+])
+def test_native_engine_matches_vectorbt(wide_data, strategy_class, params):
+    """
+    Тестирует, что лёгкий симулятор даёт ту же стоимость портфеля, сделки и метрики, что vectorbt.
+    """
+    kwargs = dict(position_size=0.2, indicators=IndicatorCache(), **params)
+    reference = strategy_class(wide_data, **kwargs)
+    reference.run_backtest()
+    native = strategy_class(wide_data, engine="native", **kwargs)
+    native.run_backtest()
+
+    expected, result = reference.portfolio, native.portfolio
+    pd.testing.assert_series_equal(result.value(), expected.value(), rtol=1e-9)
+
+    trades = expected.trades.records_readable
+    assert len(trades) > 10
+    pd.testing.assert_frame_equal(result.trades.records_readable, trades, check_dtype=False, rtol=1e-9)
+
+    expected_stats, stats = expected.stats(), result.stats()
+    for key in STATS:
+        assert stats[key] == pytest.approx(expected_stats[key], rel=1e-6), key
+    assert native.get_metrics()["Total Trades"] == reference.get_metrics()["Total Trades"]
+
+
+def test_unknown_engine_is_rejected(wide_data):
+    """
+    Тестирует, что неизвестный движок отклоняется сразу при создании стратегии.
+    """
+    with pytest.raises(ValueError):
+        SmaCrossoverStrategy(wide_data, engine="zipline")
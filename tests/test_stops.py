@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from core.stops import apply_stops
+from strategies.sma import SmaCrossoverStrategy
+
+
+def reference_stops(close, entries, exits, tp_pct, sl_pct, trailing_pct, slippage):
+    """
+    Эталон: тот же автомат на чистом Python по одной колонке.
+    """
+    out = exits.copy()
+    in_position, entry_price = False, None
+    for i in range(len(close)):
+        price = close[i]
+        if in_position and entry_price is None:
+            if np.isnan(price):
+                in_position = False
+            else:
+                entry_price, peak = price * (1 + slippage), price
+        if not in_position:
+            if entries[i] and not exits[i]:
+                in_position, entry_price = True, None
+            continue
+        if exits[i] and not entries[i]:
+            in_position = False
+            continue
+        if np.isnan(price):
+            continue
+        peak = max(peak, price)
+        hit = price >= entry_price * (1 + tp_pct) or price <= entry_price * (1 - sl_pct) or price <= peak * (1 - trailing_pct)
+        if hit and not entries[i]:
+            out[i] = True
+            in_position = False
+    return out
+
+
+def test_stops_match_reference_loop():
+    """
+    Тестирует, что ядро numba совпадает с поколоночным циклом и не трогает колонки без входов.
+    """
+    rng = np.random.default_rng(5)
+    close = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 5e-3, (2000, 4)), axis=0)))
+    close.iloc[300:320, 1] = np.nan
+    entries = pd.DataFrame(rng.random(close.shape) < 0.01)
+    exits = pd.DataFrame(rng.random(close.shape) < 0.002)
+    entries[3] = False
+
+    result = apply_stops(close, entries, exits, tp_pct=0.03, sl_pct=0.02, trailing_pct=0.015, slippage=0.001)
+
+    for col in close.columns:
+        expected = reference_stops(close[col].to_numpy(), entries[col].to_numpy(), exits[col].to_numpy(),
+                                   0.03, 0.02, 0.015, 0.001)
+        assert np.array_equal(result[col].to_numpy(), expected)
+    assert result.sum().sum() > exits.sum().sum()
+    assert result[3].equals(exits[3])
+
+    unchanged = apply_stops(close, entries, exits)
+    assert unchanged.equals(exits)
+
+
+def test_stops_follow_engine_fills():
+    """
+    Тестирует, что вход исполняется на следующем баре с проскальзыванием, а бар с входом
+    и выходом одновременно (движки его игнорируют) позицию не закрывает.
+    """
+    close = pd.DataFrame({0: [100.0, 110.0, 111.0, 112.0, 90.0]})
+    entries = pd.DataFrame({0: [True, False, True, False, False]})
+    exits = pd.DataFrame({0: [False, False, True, False, False]})
+
+    # Цена входа — 110 * 1.001, а не 100: +5% к ней ещё не достигнуто, стоп-лосс -10% срабатывает на 90
+    result = apply_stops(close, entries, exits, tp_pct=0.05, sl_pct=0.1, slippage=0.001)
+    assert result[0].tolist() == [False, False, True, False, True]
+
+    # Вход, попавший на бар без цены, пропадает
+    close.iloc[1, 0] = np.nan
+    entries.iloc[2, 0] = exits.iloc[2, 0] = False
+    assert not apply_stops(close, entries, exits, sl_pct=0.1).any().any()
+
+
+def test_strategy_applies_stops_before_shift():
+    """
+    Тестирует, что стопы стратегии добавляют выходы в prepare_signals.
+    """
+    rng = np.random.default_rng(2)
+    dates = pd.date_range("2025-02-01", periods=3000, freq="1min", name="open_time")
+    columns = pd.MultiIndex.from_product([["close"], ["BTCUSDT", "ETHBTC"]], names=["field", "symbol"])
+    data = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 2e-3, (len(dates), 2)), axis=0)), index=dates, columns=columns)
+
+    _, _, plain_exits = SmaCrossoverStrategy(data, 10, 50, tp_pct=None, trailing_pct=None).prepare_signals()
+    _, entries, exits = SmaCrossoverStrategy(data, 10, 50, sl_pct=0.005).prepare_signals()
+
+    assert exits.sum().sum() > plain_exits.sum().sum()
+    assert (exits | ~plain_exits).all().all()
+    assert not exits.iloc[0].any()
@@ -73,3 +73,60 @@ def test_vwap_signals(dummy_data):
     assert entries.dtypes.unique().tolist() == [bool]
     assert exits.dtypes.unique().tolist() == [bool]
 
+
+
+def test_rsi_signals_match_ta(dummy_data):
+    """
+    Тестирует, что векторизованные RSI и Bollinger Bands совпадают с расчётом через ta.
+
+    Проверяет:
+        - Значения индикаторов по каждому символу совпадают с ta.
+        - Сигналы стратегии совпадают с прежним поколоночным расчётом.
+    """
+    from ta.momentum import RSIIndicator
+    from ta.volatility import BollingerBands
+    from core.indicators import rsi, bollinger_bands
+
+    close = dummy_data.xs('close', level=0, axis=1)
+    rsi_values = rsi(close, window=14)
+    _, hband, lband = bollinger_bands(close, window=20, window_dev=2)
+
+    strategy = RsiBbStrategy(dummy_data)
+    entries, exits = strategy.generate_signals()
+
+    for symbol in close.columns:
+        expected_rsi = RSIIndicator(close=close[symbol], window=14).rsi()
+        bb = BollingerBands(close=close[symbol], window=20, window_dev=2)
+
+        np.testing.assert_allclose(rsi_values[symbol], expected_rsi, equal_nan=True)
+        np.testing.assert_allclose(hband[symbol], bb.bollinger_hband(), equal_nan=True)
+        np.testing.assert_allclose(lband[symbol], bb.bollinger_lband(), equal_nan=True)
+
+        expected_entries = (expected_rsi < 30) & (close[symbol] < bb.bollinger_lband())
+        expected_exits = (expected_rsi > 70) & (close[symbol] > bb.bollinger_hband())
+        assert entries[symbol].equals(expected_entries.rename(symbol))
+        assert exits[symbol].equals(expected_exits.rename(symbol))
+
+
+def test_vwap_matches_per_symbol_groupby(dummy_data):
+    """
+    Тестирует, что матричный VWAP совпадает с прежним поколоночным расчётом по дням
+    и что якоря сессии сбрасывают накопление в нужный момент.
+    """
+    from core.indicators import vwap
+
+    close = dummy_data.xs('close', level=0, axis=1)
+    volume = dummy_data.xs('volume', level=0, axis=1)
+
+    result = vwap(close, volume)
+    for symbol in close.columns:
+        day_index = close.index.normalize()
+        expected = (close[symbol] * volume[symbol]).groupby(day_index).cumsum() / volume[symbol].groupby(day_index).cumsum()
+        np.testing.assert_allclose(result[symbol], expected)
+
+    # Сессия с 00:30: первый бар новой сессии равен своей цене закрытия
+    session = vwap(close, volume, anchor="00:30")
+    np.testing.assert_allclose(session.loc["2025-02-01 00:30"], close.loc["2025-02-01 00:30"])
+
+    # Скользящий VWAP на 1 бар — это просто цена закрытия
+    np.testing.assert_allclose(vwap(close, volume, anchor=1), close)
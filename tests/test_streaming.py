@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.indicator_cache import IndicatorCache
+from core.streaming import replay_signals
+from strategies.sma import SmaCrossoverStrategy
+from strategies.RSI import RsiBbStrategy
+from strategies.WRAP import VwapReversionStrategy
+
+
+@pytest.fixture
+def stream_data():
+    """
+    Фикстура: широкие данные (close, volume) по трём символам через границу суток,
+    с пропусками посреди истории и поздним началом торгов одного символа.
+
+    Returns:
+        pd.DataFrame: Мультиколоночный DataFrame (field, symbol).
+    """
+    rng = np.random.default_rng(1)
+    dates = pd.date_range("2025-02-01 20:00", periods=1500, freq="1min", name="open_time")
+    symbols = ["BTCUSDT", "ETHBTC", "XRPBTC"]
+    close = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 3e-3, (len(dates), 3)), axis=0)), index=dates, columns=symbols)
+    volume = pd.DataFrame(rng.exponential(10, (len(dates), 3)), index=dates, columns=symbols)
+    close.iloc[100:130, 1] = np.nan
+    volume.iloc[100:130, 1] = np.nan
+    close.iloc[:50, 2] = np.nan
+    volume.iloc[:50, 2] = np.nan
+
+    df = pd.concat({"close": close, "volume": volume}, axis=1)
+    df.columns.names = ["field", "symbol"]
+    return df
+
+
+@pytest.mark.parametrize("strategy_class, params", [
+    (SmaCrossoverStrategy, {"fast_window": 10, "slow_window": 30}),
+    (RsiBbStrategy, {}),
+    (VwapReversionStrategy, {}),
+    (VwapReversionStrategy, {"anchor": "08:00"}),
+    (VwapReversionStrategy, {"anchor": 60}),
+])
+def test_replay_matches_batch_signals(stream_data, strategy_class, params):
+    """
+    Тестирует, что инкрементальный режим бар за баром даёт те же сигналы, что generate_signals.
+    """
+    strategy = strategy_class(stream_data, indicators=IndicatorCache(), **params)
+    entries, exits = strategy.generate_signals()
+
+    stream_entries, stream_exits = replay_signals(strategy, stream_data)
+
+    assert stream_entries.equals(entries.fillna(False).astype(bool))
+    assert stream_exits.equals(exits.fillna(False).astype(bool))
+    assert entries.to_numpy().any() and exits.to_numpy().any()
+
+
+def test_update_accepts_long_bar_batches(stream_data):
+    """
+    Тестирует update() на пачках баров в схеме read_archive: пропущенный в пачке символ
+    считается пропуском, а сигналы совпадают с пакетным расчётом.
+    """
+    strategy = VwapReversionStrategy(stream_data, indicators=IndicatorCache())
+    entries, exits = strategy.generate_signals()
+
+    long = stream_data.stack("symbol", future_stack=True).dropna().reset_index()
+    for timestamp, batch in long.groupby("open_time"):
+        bar_entries, bar_exits = strategy.update(batch)
+        assert bar_entries.equals(entries.loc[timestamp].astype(bool))
+        assert bar_exits.equals(exits.loc[timestamp].astype(bool))
+
+    assert list(bar_entries.index) == ["BTCUSDT", "ETHBTC", "XRPBTC"]
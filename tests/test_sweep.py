@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.backtester import run_multi_strategy
+from core.indicator_cache import IndicatorCache
+from core.sweep import run_sweep
+from strategies.sma import SmaCrossoverStrategy
+
+
+@pytest.fixture
+def dummy_df():
+    """
+    Фикстура: данные по двум символам с колеблющимися ценами в формате (open_time, symbol).
+
+    Returns:
+        pd.DataFrame: Мультииндексный DataFrame.
+    """
+    dates = pd.date_range("2025-02-01", periods=300, freq="1min")
+    frames = []
+    for k, symbol in enumerate(["BTCUSDT", "ETHBTC"]):
+        price = 100 + np.sin(np.arange(len(dates)) / (5 + k)) * 5
+        frames.append(pd.DataFrame({
+            "open_time": dates, "symbol": symbol,
+            "open": price, "high": price + 0.5, "low": price - 0.5, "close": price, "volume": 1000.0
+        }))
+    return pd.concat(frames).set_index(["open_time", "symbol"]).sort_index()
+
+
+def test_sweep_matches_single_run(dummy_df, tmp_path, monkeypatch):
+    """
+    Тестирует, что перебор даёт по строке на (параметры, символ),
+    считает каждое окно SMA один раз и совпадает с одиночным прогоном.
+    """
+    monkeypatch.chdir(tmp_path)
+    indicators = IndicatorCache()
+    grid = {"fast_window": [5, 10], "slow_window": [20, 30]}
+    table = run_sweep(SmaCrossoverStrategy, dummy_df, grid, chunk_size=3, indicators=indicators)
+
+    assert len(table) == 4 * 2
+    assert set(table.columns) >= {"fast_window", "slow_window", "symbol", "Total Trades", "Portfolio Return [%]"}
+    assert indicators.misses == 4
+    assert indicators.hits == 4
+
+    pf = run_multi_strategy(
+        lambda data, position_size: SmaCrossoverStrategy(
+            data, fast_window=10, slow_window=20, position_size=position_size
+        ),
+        dummy_df
+    )
+    row = table[(table.fast_window == 10) & (table.slow_window == 20)]
+    assert row["Portfolio Return [%]"].iloc[0] == pytest.approx(pf.total_return() * 100)
+    assert row["Total Trades"].sum() == pf.trades.count()
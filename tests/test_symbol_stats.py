@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.indicator_cache import IndicatorCache
+from core.symbol_stats import pnl_matrix, symbol_stats
+from strategies.sma import SmaCrossoverStrategy
+
+
+@pytest.fixture
+def wide_data():
+    """
+    Фикстура: широкие данные по четырём символам, один из них появляется позже.
+
+    Returns:
+        pd.DataFrame: Мультиколоночный DataFrame (field, symbol).
+    """
+    rng = np.random.default_rng(7)
+    dates = pd.date_range("2025-02-01", periods=2000, freq="1min", name="open_time")
+    symbols = pd.Index(["AAABTC", "BBBBTC", "CCCBTC", "DDDBTC"], name="symbol")
+    close = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 3e-3, (len(dates), 4)), axis=0)), index=dates, columns=symbols)
+    close.iloc[:400, 3] = np.nan
+    return pd.concat({"close": close}, axis=1, names=["field"])
+
+
+@pytest.mark.parametrize("engine", ["vbt", "native"])
+def test_symbol_pnl_adds_up_to_portfolio_value(wide_data, engine):
+    """
+    Тестирует, что init_cash плюс PnL всех символов совпадает со стоимостью портфеля.
+    """
+    strategy = SmaCrossoverStrategy(
+        wide_data, fast_window=10, slow_window=30, position_size=0.2, indicators=IndicatorCache(), engine=engine
+    )
+    strategy.run_backtest()
+    pf = strategy.portfolio
+    close = wide_data["close"]
+
+    total = strategy.init_cash + pnl_matrix(close, pf.trades.records_readable).sum(axis=1)
+    np.testing.assert_allclose(total, pf.value().to_numpy(), rtol=1e-9)
+
+
+def test_symbol_stats_match_trade_groupby(wide_data):
+    """
+    Тестирует метрики сделок по символам против groupby по records_readable;
+    у символа без сделок (постоянная цена) Profit Factor — NaN, а не inf.
+    """
+    wide_data = wide_data.copy()
+    wide_data[("close", "EEEBTC")] = 1.0
+    strategy = SmaCrossoverStrategy(
+        wide_data, fast_window=10, slow_window=30, position_size=0.2, indicators=IndicatorCache(), engine="native"
+    )
+    strategy.run_backtest()
+    trades = strategy.portfolio.trades.records_readable
+    table = symbol_stats(wide_data["close"], trades, strategy.init_cash)
+
+    closed = trades[trades["Status"] == "Closed"]
+    by_symbol = closed.groupby("Column")["PnL"]
+    np.testing.assert_array_equal(table["Total Trades"], trades.groupby("Column").size().reindex(table.index, fill_value=0))
+    np.testing.assert_allclose(table["Win Rate [%]"], by_symbol.apply(lambda p: (p > 0).mean() * 100).reindex(table.index))
+    profit_factor = by_symbol.apply(lambda p: p[p > 0].sum() / -p[p < 0].sum()).reindex(table.index)
+    np.testing.assert_allclose(table["Profit Factor"], profit_factor)
+    assert table.loc["EEEBTC", "Total Trades"] == 0 and np.isnan(table.loc["EEEBTC", "Profit Factor"])
+    np.testing.assert_allclose(table["PnL"].sum() + strategy.init_cash, strategy.portfolio.value().iloc[-1])
+    assert (table["Max Drawdown [%]"] >= 0).all()
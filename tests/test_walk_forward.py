@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.indicator_cache import IndicatorCache
+from core.portfolio import PORTFOLIO_KWARGS
+from core.simulator import simulate_from_signals
+from core.walk_forward import liquidation_cost, walk_forward, walk_forward_folds
+from strategies.sma import SmaCrossoverStrategy
+
+GRID = {"fast_window": [5, 10], "slow_window": [30, 60]}
+
+
+@pytest.fixture
+def wide_data():
+    """
+    Фикстура: двое суток минутных баров по трём символам.
+
+    Returns:
+        pd.DataFrame: Мультиколоночный DataFrame (field, symbol).
+    """
+    rng = np.random.default_rng(11)
+    dates = pd.date_range("2025-02-01", periods=2 * 1440, freq="1min", name="open_time")
+    symbols = pd.Index(["AAABTC", "BBBBTC", "CCCBTC"], name="symbol")
+    close = pd.DataFrame(np.exp(np.cumsum(rng.normal(0, 2e-3, (len(dates), 3)), axis=0)), index=dates, columns=symbols)
+    volume = pd.DataFrame(rng.exponential(10, close.shape), index=dates, columns=symbols)
+    return pd.concat({"close": close, "volume": volume}, axis=1, names=["field"])
+
+
+def test_folds_rolling_and_anchored():
+    """
+    Тестирует границы фолдов: тестовые окна идут подряд, обучающее скользит или растёт от начала.
+    """
+    assert walk_forward_folds(10, train_bars=4, test_bars=3) == [(0, 4, 4, 7), (3, 7, 7, 10)]
+    assert walk_forward_folds(11, train_bars=4, test_bars=3, anchored=True) == [
+        (0, 4, 4, 7), (0, 7, 7, 10), (0, 10, 10, 11)
+    ]
+    assert walk_forward_folds(3, train_bars=4, test_bars=3) == []
+
+
+def test_liquidation_cost_charges_open_positions_only():
+    """
+    Тестирует, что на границе фолда открытые позиции продаются с проскальзыванием и комиссией,
+    а закрытые сделки не учитываются.
+    """
+    trades = pd.DataFrame({"Size": [2.0, 5.0], "Avg Exit Price": [10.0, 10.0], "Status": ["Open", "Closed"]})
+
+    assert liquidation_cost(trades, fees=0.001, slippage=0.002) == pytest.approx(20 * (1 - 0.998 * 0.999))
+    assert liquidation_cost(trades.iloc[1:]) == 0
+
+
+def test_walk_forward_picks_best_train_params(wide_data):
+    """
+    Тестирует, что на каждом фолде выбрана комбинация с лучшим Sharpe на обучающем окне,
+    а первый фолд на тесте совпадает с прямой симуляцией выбранных параметров.
+    """
+    train_bars, test_bars = 1440, 480
+    equity, folds = walk_forward(SmaCrossoverStrategy, wide_data, GRID, train_bars, test_bars, max_workers=1,
+                                 indicators=IndicatorCache())
+
+    assert len(folds) == 3
+    assert equity.index.equals(wide_data.index[train_bars:])
+
+    first = folds.iloc[0]
+    scores = {}
+    for fast in GRID["fast_window"]:
+        for slow in GRID["slow_window"]:
+            strategy = SmaCrossoverStrategy(wide_data.iloc[:train_bars], fast_window=fast, slow_window=slow,
+                                            indicators=IndicatorCache())
+            price, entries, exits = strategy.prepare_signals()
+            pf = simulate_from_signals(price, entries, exits, size=0.01, **PORTFOLIO_KWARGS)
+            scores[(fast, slow)] = pf.stats()["Sharpe Ratio"]
+    best = max(scores, key=scores.get)
+    assert (first["fast_window"], first["slow_window"]) == best
+    assert first["Train Sharpe Ratio"] == pytest.approx(scores[best], rel=1e-9)
+
+    # Капитал переносится между фолдами: доходности тестовых окон складываются в итоговую
+    total = np.prod(1 + folds["Test Return [%]"] / 100)
+    assert equity.iloc[-1] / PORTFOLIO_KWARGS["init_cash"] == pytest.approx(total, rel=1e-12)
+
+
+def test_walk_forward_reuses_indicators_and_runs_in_parallel(wide_data):
+    """
+    Тестирует, что индикаторы считаются один раз на комбинацию независимо от числа фолдов,
+    а параллельный запуск фолдов даёт тот же результат, что и последовательный.
+    """
+    few_cache, many_cache = IndicatorCache(), IndicatorCache()
+    walk_forward(SmaCrossoverStrategy, wide_data, GRID, 1440, 1440, max_workers=1, indicators=few_cache)
+    equity, folds = walk_forward(SmaCrossoverStrategy, wide_data, GRID, 1440, 240, max_workers=1, indicators=many_cache)
+
+    assert many_cache.misses == few_cache.misses > 0
+
+    parallel_equity, parallel_folds = walk_forward(SmaCrossoverStrategy, wide_data, GRID, 1440, 240, max_workers=2,
+                                                   indicators=IndicatorCache())
+    pd.testing.assert_series_equal(parallel_equity, equity)
+    pd.testing.assert_frame_equal(parallel_folds, folds)
@@ -0,0 +1,96 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import main
+from conftest import write_store
+from core.wide_cache import dataset_fingerprint, load_wide
+
+
+@pytest.fixture
+def store(tmp_path):
+    """
+    Фикстура: партиционированное хранилище с двумя символами за сутки.
+
+    Returns:
+        pathlib.Path: Корень хранилища.
+    """
+    dates = pd.date_range("2025-02-01", periods=1440, freq="1min")
+    frames = []
+    for k, symbol in enumerate(["ETHBTC", "BNBBTC"]):
+        close = 1 + np.sin(np.arange(len(dates)) / (7 + k)) * 0.1
+        frames.append(pd.DataFrame({
+            "open_time": dates, "open": close, "high": close, "low": close, "close": close,
+            "volume": np.float32(10 + k), "symbol": symbol
+        }))
+    write_store(pd.concat(frames), "1m", "2025-02", tmp_path / "store")
+    return tmp_path / "store"
+
+
+def test_wide_cache_skips_parquet_and_unstack(store, tmp_path, monkeypatch):
+    """
+    Тестирует, что повторная загрузка берёт широкие матрицы из кеша,
+    совпадает с unstack исходных данных и сбрасывается при изменении файлов.
+    """
+    cache_dir = tmp_path / "wide"
+    expected = main.load_data(store).unstack("symbol")
+
+    first = main.load_wide_data(store, cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(first, expected, check_like=True, check_dtype=False, check_column_type=False,
+                                  check_index_type=False)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("load_data не должен вызываться при валидном кеше")
+
+    monkeypatch.setattr(main, "load_data", fail)
+    cached = main.load_wide_data(store, cache_dir=cache_dir, fields=["close"])
+    assert list(cached.columns.get_level_values(0).unique()) == ["close"]
+    np.testing.assert_array_equal(cached["close"].to_numpy(), expected["close"].to_numpy())
+
+    old = dataset_fingerprint(store, interval="1m")
+    parquet = next(store.rglob("*.parquet"))
+    os.utime(parquet, ns=(0, 0))
+    assert dataset_fingerprint(store, interval="1m") != old
+    assert load_wide(cache_dir / "1m", dataset_fingerprint(store, interval="1m")) is None
+
+
+def source_memmap(array):
+    """
+    Находит memmap, на который ссылается массив (по цепочке .base).
+    """
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array
+
+
+def test_wide_cache_fields_share_memmap(store, tmp_path):
+    """
+    Тестирует, что поля из кеша остаются view на memmap values.npy, а не копией в памяти.
+    """
+    cache_dir = tmp_path / "wide"
+    main.load_wide_data(store, cache_dir=cache_dir)
+    values_path = str(cache_dir / "1m" / "values.npy")
+
+    loaded = main.load_wide_data(store, cache_dir=cache_dir)
+    for close in (loaded["close"].to_numpy(), loaded.xs("close", axis=1, level=0).to_numpy(),
+                  main.load_wide_data(store, cache_dir=cache_dir, fields=["close"]).to_numpy()):
+        values = source_memmap(close)
+        assert values is not None and os.path.samefile(values.filename, values_path)
+        assert np.shares_memory(close, values)
+
+
+def test_run_multi_strategy_accepts_wide_cache(store, tmp_path, monkeypatch):
+    """
+    Тестирует, что run_multi_strategy даёт одинаковый результат на длинном формате и на кеше.
+    """
+    monkeypatch.chdir(tmp_path)
+    from core.backtester import run_multi_strategy
+    from strategies.sma import SmaCrossoverStrategy
+
+    factory = lambda data, position_size: SmaCrossoverStrategy(
+        data, fast_window=5, slow_window=20, position_size=position_size
+    )
+    long_pf = run_multi_strategy(factory, main.load_data(store))
+    wide_pf = run_multi_strategy(factory, main.load_wide_data(store, cache_dir=tmp_path / "wide"))
+
+    np.testing.assert_allclose(wide_pf.value().to_numpy(), long_pf.value().to_numpy())